@@ -0,0 +1,154 @@
+import json
+import os
+import re
+from typing import Dict, Any, List, Optional
+
+# Thresholds mirror the LOGIC RULES in prompts/executive_decider.txt.
+# Override any of them with a JSON file pointed to by DECISION_RULES_PATH.
+DEFAULT_RULES = {
+    "brand_safety_min": 70,          # below -> HIGH risk, NO-GO (hard stop)
+    "fake_follower_max": 30,         # above (%) -> HIGH risk, NO-GO (hard stop)
+    "controversy_high": 25,          # above (%) -> HIGH risk
+    "brand_safety_medium": 80,       # below -> MEDIUM risk
+    "fake_follower_medium": 20,      # above (%) -> MEDIUM risk
+    "controversy_medium": 10,        # above (%) -> MEDIUM risk
+    "go_roi_min": 2.0,               # lower ROI bound needed for GO
+    "go_fit_min": 70,                # audience_brand_fit (%) needed for GO
+    "avg_order_value": 50,           # $ per promo redemption (same assumption as DataGenerator)
+    "borderline_margin": 3,          # metric within this many points of a threshold -> ask the LLM
+    "borderline_roi_margin": 0.25,   # ROI within this of go_roi_min -> ask the LLM
+}
+
+
+def _load_rules() -> Dict[str, float]:
+    rules = dict(DEFAULT_RULES)
+    path = os.environ.get("DECISION_RULES_PATH")
+    if path:
+        with open(path, "r") as f:
+            rules.update(json.load(f))
+    return rules
+
+
+def kpi_number(value: Any) -> Optional[float]:
+    """Leading number of a KPI value: 85, "12%", "80/100" -> 85.0, 12.0, 80.0."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    match = re.match(r"\s*(-?\d+(?:\.\d+)?)", str(value))
+    return float(match.group(1)) if match else None
+
+
+class DecisionRulesEngine:
+    """
+    Deterministic executive decision from the three analyst reports.
+    Clear-cut cases are resolved locally; cases near a threshold (or missing inputs)
+    are reported as borderline so the caller can fall back to the LLM executive.
+    """
+
+    def __init__(self, rules: Optional[Dict[str, float]] = None):
+        self.rules = rules or _load_rules()
+        self.stats = {"local": 0, "llm": 0}
+
+    def _near(self, value: float, threshold: float, margin: float) -> bool:
+        return abs(value - threshold) < margin
+
+    def risk_level(self, safety: float, fake: float, controversy: float, rules: Optional[Dict[str, float]] = None) -> str:
+        r = rules or self.rules
+        if safety < r["brand_safety_min"] or fake > r["fake_follower_max"] or controversy > r["controversy_high"]:
+            return "HIGH"
+        if safety < r["brand_safety_medium"] or fake > r["fake_follower_medium"] or controversy > r["controversy_medium"]:
+            return "MEDIUM"
+        return "LOW"
+
+    def roi_range(self, analyst_kpis: List[Dict[str, Any]], detailed_metrics: Dict[str, Any],
+                  rules: Optional[Dict[str, float]] = None) -> Optional[Dict[str, float]]:
+        """
+        roi_prediction on the executive prompt's basis: the analysts' promo redemptions x order value
+        over the cost of a post, widened by their confidence. None without redemptions or est_cost.
+        Shared by the rules and the mock executive, so every decision source reports one scale.
+        """
+        r = rules or self.rules
+        redemptions = next((k for k in analyst_kpis if k.get("kpi_id") == "promo_code_redemptions"), None)
+        value = kpi_number(redemptions.get("value")) if redemptions else None
+        est_cost = detailed_metrics.get("roi_forecasting", {}).get("est_cost")
+        if value is None or not est_cost:
+            return None
+        confidence = round(redemptions.get("confidence_score", 0.8), 2)
+        roi_mid = value * r["avg_order_value"] / est_cost
+        spread = 1 - confidence
+        return {"min": round(roi_mid * (1 - spread), 1), "max": round(roi_mid * (1 + spread), 1), "confidence": confidence}
+
+    def decide(self, analyst_kpis: List[Dict[str, Any]], context: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Returns an ExecutiveResponse-shaped dict, or None if the case is borderline.
+        """
+        r = self.rules
+        kpis = {k["kpi_id"]: k for k in analyst_kpis}
+        values = {kpi_id: kpi_number(k.get("value")) for kpi_id, k in kpis.items()}
+
+        safety = values.get("brand_safety_score")
+        fake = values.get("fake_follower_probability")
+        controversy = values.get("controversy_probability")
+        fit = values.get("audience_brand_fit")
+        roi = self.roi_range(analyst_kpis, context.get("detailed_metrics", {}))
+
+        if None in (safety, fake, controversy, fit, roi):
+            return None
+
+        margin = r["borderline_margin"]
+        flags = []
+
+        # 1. Risk level
+        risk = self.risk_level(safety, fake, controversy)
+
+        if self._near(safety, r["brand_safety_min"], margin) or self._near(fake, r["fake_follower_max"], margin) \
+                or self._near(controversy, r["controversy_high"], margin):
+            return None
+
+        if safety < r["brand_safety_min"]:
+            flags.append(f"Brand safety {safety:.0f} is below the {r['brand_safety_min']} hard floor.")
+        if fake > r["fake_follower_max"]:
+            flags.append(f"Fake follower probability {fake:.0f}% exceeds {r['fake_follower_max']}%.")
+        if controversy > r["controversy_high"]:
+            flags.append(f"Controversy probability {controversy:.0f}% is elevated.")
+
+        # 2. ROI range: redemption revenue vs. cost per post, widened by the analysts' confidence
+        roi_min, roi_max = roi["min"], roi["max"]
+
+        # 3. Decision
+        if risk == "HIGH":
+            decision = "NO-GO"
+        else:
+            if self._near(roi_min, r["go_roi_min"], r["borderline_roi_margin"]) or self._near(fit, r["go_fit_min"], margin):
+                return None
+            if roi_min >= r["go_roi_min"] and risk == "LOW" and fit >= r["go_fit_min"]:
+                decision = "GO"
+            else:
+                decision = "TEST"
+
+        flags.append(f"ROI projected at {roi_min}x - {roi_max}x.")
+        flags.append(f"Audience fit is {fit:.0f}% ({'meets' if fit >= r['go_fit_min'] else 'below'} the {r['go_fit_min']}% target).")
+        if risk != "HIGH":
+            flags.append(f"Risk analysis indicates {risk} concern.")
+
+        return {
+            "decision": decision,
+            "roi_prediction": roi,
+            "risk_level": risk,
+            "executive_summary": f"Based on a {roi_min}x-{roi_max}x ROI projection and {risk} risk profile, we recommend a {decision}.",
+            "top_flags": flags[:3],
+            "decision_source": "rules"
+        }
+
+    def record(self, source: str):
+        self.stats[source] = self.stats.get(source, 0) + 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = sum(self.stats.values())
+        return {
+            **self.stats,
+            "total": total,
+            "local_share": round(self.stats["local"] / total, 3) if total else 0.0,
+        }
+
+# Global instance
+decision_rules = DecisionRulesEngine()
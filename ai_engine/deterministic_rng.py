@@ -0,0 +1,140 @@
+import hashlib
+import os
+import random
+import struct
+from itertools import chain, count
+from typing import Union
+
+# 1 = legacy: MD5 -> int -> Mersenne Twister (profiles additionally folded to seed % 1e6).
+#     Reproduces historical outputs exactly.
+# 2 = counter-based: SHA-256 stream key, BLAKE2b(key || counter) blocks, no MT state setup.
+RNG_VERSION = int(os.environ.get("DETERMINISTIC_RNG_VERSION", 2))
+
+# A block is 3 BLAKE2b digests (192 bytes) -> 24 doubles in [1, 2): keep 52 mantissa bits, force the
+# exponent of 1.0. Done as one big-int AND/OR per block so no Python code runs per value.
+# 24 values covers a whole generate_influencer call with a single block.
+_DIGESTS_PER_BLOCK = 3
+_BLOCK_BYTES = 64 * _DIGESTS_PER_BLOCK
+_VALUES_PER_BLOCK = _BLOCK_BYTES // 8
+_DOUBLES = struct.Struct(f"<{_VALUES_PER_BLOCK}d")
+_MANTISSA = int.from_bytes(b"\xff\xff\xff\xff\xff\xff\x0f\x00" * (_BLOCK_BYTES // 8), "little")
+_ONE = int.from_bytes(b"\x00\x00\x00\x00\x00\x00\xf0\x3f" * (_BLOCK_BYTES // 8), "little")
+_TWO_52 = float(1 << 52)
+
+
+class CounterRNG(random.Random):
+    """
+    Counter-based deterministic RNG: digest j of a stream is BLAKE2b(key || j); blocks of 3 digests are read as 24 doubles.
+
+    Subclasses random.Random, so choice / randint / sample / expovariate / shuffle work as usual.
+    Construction only stores the key; Mersenne Twister seeding initialises a 624-word state for
+    every new instance, which is most of the RNG cost when each profile gets its own generator.
+    The state is (key, values drawn so far, gauss_next): getstate/setstate and pickling resume the
+    stream at the same position.
+    """
+
+    def __init__(self, key: bytes):
+        # Deliberately skip random.Random.__init__ -> seed(): no MT state to set up
+        self.gauss_next = None
+        self._start(key)
+
+    def _start(self, key: bytes, position: int = 0):
+        self._key = key
+        first, skip = divmod(position, _VALUES_PER_BLOCK)
+        self._blocks = first
+        self._values = iter(())
+        # C-level iterator over [1, 2) doubles; blocks are hashed on demand
+        self._next = chain.from_iterable(map(self._block, count(first))).__next__
+        for _ in range(skip):
+            self._next()
+
+    def _block(self, i: int):
+        key, c = self._key, i * _DIGESTS_PER_BLOCK
+        data = (hashlib.blake2b(key + c.to_bytes(8, "little")).digest()
+                + hashlib.blake2b(key + (c + 1).to_bytes(8, "little")).digest()
+                + hashlib.blake2b(key + (c + 2).to_bytes(8, "little")).digest())
+        bits = (int.from_bytes(data, "little") & _MANTISSA) | _ONE
+        # chain() consumes this very iterator, so its length hint tells how far into the block we are
+        self._blocks = i + 1
+        self._values = iter(_DOUBLES.unpack(bits.to_bytes(_BLOCK_BYTES, "little")))
+        return self._values
+
+    def seed(self, a=None, version=2):
+        if a is None:
+            raise TypeError("CounterRNG needs an explicit key")
+        self._start(stream_key(a if isinstance(a, bytes) else str(a)))
+
+    def random(self) -> float:
+        return self._next() - 1.0
+
+    def uniform(self, a: float, b: float) -> float:
+        return a + (b - a) * (self._next() - 1.0)
+
+    def _randbelow(self, n: int) -> int:
+        # One draw instead of random.Random's getrandbits rejection loop.
+        # Bias is at most n / 2**52, irrelevant for choice/randint/sample over small ranges.
+        return int((self._next() - 1.0) * n)
+
+    def getrandbits(self, k: int) -> int:
+        bits, filled = 0, 0
+        while filled < k:
+            bits |= int((self._next() - 1.0) * _TWO_52) << filled
+            filled += 52
+        return bits & ((1 << k) - 1)
+
+    def getstate(self):
+        position = self._blocks * _VALUES_PER_BLOCK - self._values.__length_hint__()
+        return self._key, position, self.gauss_next
+
+    def setstate(self, state):
+        key, position, gauss_next = state
+        self._start(key, position)
+        self.gauss_next = gauss_next
+
+    def __reduce__(self):
+        return self.__class__, (self._key,), self.getstate()
+
+
+def stream_key(*parts: Union[str, bytes]) -> bytes:
+    """
+    SHA-256 of (namespace, id, ...) -> 32-byte stream key. Parts are length-prefixed so ("ab","c") != ("a","bc").
+    SHA-256 rather than BLAKE2b here because mock payloads are a few KB and SHA-256 is hardware-accelerated on x86/ARM.
+    """
+    h = hashlib.sha256()
+    for part in parts:
+        data = part if isinstance(part, bytes) else part.encode("utf-8")
+        h.update(len(data).to_bytes(4, "little"))
+        h.update(data)
+    return h.digest()
+
+
+def profile_rng(influencer_id: str) -> random.Random:
+    """RNG for DataGenerator.generate_influencer."""
+    if RNG_VERSION == 1:
+        seed_int = int(hashlib.md5(influencer_id.encode('utf-8')).hexdigest(), 16)
+        return random.Random(seed_int % 1000000)
+    return CounterRNG(stream_key("profile", influencer_id))
+
+
+def payload_rng(*parts: str) -> random.Random:
+    """RNG seeded from arbitrary text (e.g. system prompt + serialized data) for MockLLMClient."""
+    if RNG_VERSION == 1:
+        seed_hash = hashlib.md5("".join(parts).encode('utf-8')).hexdigest()
+        return random.Random(int(seed_hash, 16))
+    return CounterRNG(stream_key("mock", *parts))
+
+
+def history_rng(influencer_id: str) -> random.Random:
+    """RNG for an influencer's daily metric history (backend/services/timeseries.py)."""
+    if RNG_VERSION == 1:
+        seed_int = int(hashlib.md5(f"history:{influencer_id}".encode('utf-8')).hexdigest(), 16)
+        return random.Random(seed_int)
+    return CounterRNG(stream_key("history", influencer_id))
+
+
+def risk_events_rng(influencer_id: str) -> random.Random:
+    """RNG for the bot-purchase / engagement-spike episodes injected into generated event streams."""
+    if RNG_VERSION == 1:
+        seed_int = int(hashlib.md5(f"risk-events:{influencer_id}".encode('utf-8')).hexdigest(), 16)
+        return random.Random(seed_int)
+    return CounterRNG(stream_key("risk-events", influencer_id))
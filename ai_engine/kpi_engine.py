@@ -0,0 +1,581 @@
+import json
+import math
+import os
+import string
+from typing import Dict, Any, List, Optional, Tuple
+
+# Optional vectorized path. Without numpy every KPI is evaluated row by row with the same formulas.
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Smaller batches run row by row: numpy's per-call overhead outweighs the vectorized pass
+VECTORIZE_MIN_BATCH = 32
+
+KPI_DEFINITIONS_PATH = os.environ.get(
+    "KPI_DEFINITIONS_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "kpi_definitions.json")
+)
+
+# Same assumptions as the DataGenerator's ROI forecast
+DEFAULT_AOV = 50.0
+DEFAULT_BUDGET = 5000
+# Revenue band used for roi_confidence_range, and the confidence quoted for it
+ROI_BAND = 0.4
+ROI_CONFIDENCE = 80
+
+CONTENT_TYPE_LIFT = {"short": 1.15, "long": 0.9, "all": 1.0}
+PLATFORM_ALGORITHM_FACTOR = {"TikTok": 1.2, "Instagram": 1.0, "YouTube": 0.9}
+PLATFORM_POLICY_RISK = {"TikTok": 30, "Instagram": 20, "YouTube": 10}
+NICHE_POLARITY = {"Gaming": 15, "Tech": 8, "Beauty": 6, "Fashion": 6, "Fitness": 5, "Travel": 4, "Food": 3}
+GOAL_CONVERSION_RATES = {"Conversion": 0.03, "Awareness": 0.015, "Content Creation": 0.01}
+
+# Output ids are namespaced: brand_safety_score, controversy_probability and fake_follower_probability
+# share names with the analysts' audit KPIs but are different formulas over different inputs
+KPI_ID_PREFIX = "engine."
+
+
+def _metric(group: str, key: str):
+    return lambda p: p["detailed_metrics"][group][key]
+
+
+def _inverse(group: str, key: str):
+    return lambda p: 100 - p["detailed_metrics"][group][key]
+
+
+def _neutral(value: float):
+    return lambda p: value
+
+
+def _from_history(read, fallback):
+    """Reads the rolling history summary attached to the profile as "history", else the fallback."""
+    def feature(p):
+        history = p.get("history")
+        value = read(history) if history else None
+        return fallback(p) if value is None else value
+    return feature
+
+
+# Daily sentiment std (points, 90 days) -> 0-100 volatility: a 5-point std is mid-scale
+SENTIMENT_VOLATILITY_SCALE = 10.0
+
+# Declared input feature -> value read from an influencer profile.
+# Few of the names in kpi_definitions.json exist verbatim in the generated profiles; the others
+# read the closest profile signal (e.g. engagement_rate_variance -> inverse of consistency_score).
+# Sponsored ratio, ad engagement decay and sentiment volatility come from the influencer's daily
+# history (backend/services/timeseries.py) when the profile carries its summary.
+# Inputs with no related signal take a neutral constant rather than borrowing an unrelated field.
+INFLUENCER_FEATURES = {
+    "follower_growth_rate": _metric("audience_credibility", "follower_growth_rate"),
+    "engagement_rate_variance": _inverse("consistency_loyalty", "consistency_score"),
+    "comment_sentiment_diversity": _metric("engagement_quality", "comment_sentiment_quality"),
+    "comment_length_avg": _neutral(50.0),  # No comment text in profiles or histories: mid-scale
+    "reply_ratio": _metric("engagement_quality", "comment_to_view_ratio"),
+    "emoji_only_percentage": _inverse("audience_credibility", "audience_quality_score"),
+    "audience_interests": lambda p: p["niche"],
+    "audience_demographics": lambda p: p["platform"],
+    "past_violations": _inverse("brand_readiness", "brand_safety_score"),
+    "content_flags": _inverse("brand_readiness", "overall_sentiment_score"),
+    "platform_policy_changes": lambda p: p["platform"],
+    "sponsored_post_ratio_30d": _from_history(lambda h: h["sponsored_ratio_30d"],
+                                              _metric("brand_readiness", "brand_collaboration_ratio")),
+    "engagement_decay_on_ads": _from_history(lambda h: h["engagement_decay_on_ads_pct"],
+                                             _inverse("consistency_loyalty", "retention_score")),
+    "posting_frequency": _metric("consistency_loyalty", "consistency_score"),
+    "avg_impressions_last_10_posts": lambda p: p["detailed_metrics"]["growth_momentum"]["predicted_views_next_3"] / 3,
+    "content_type": lambda p: p.get("content_type_context", "all"),
+    "network_algorithm_factor": lambda p: p["platform"],
+    "engagement_rate_avg": lambda p: sum(p["detailed_metrics"]["engagement_quality"][k] for k in ("like_to_view_ratio", "comment_to_view_ratio", "share_ratio")),
+    "ctr_benchmark": _metric("intent_conversion", "ctr_estimated"),
+    "keyword_analysis": _metric("brand_readiness", "brand_safety_score"),
+    "image_recognition_safety": _metric("brand_readiness", "overall_sentiment_score"),
+    "past_associations": _metric("brand_readiness", "brand_collaboration_ratio"),
+    "sentiment_volatility": _from_history(lambda h: min(h["sentiment"]["std_90d"] * SENTIMENT_VOLATILITY_SCALE, 100.0),
+                                          _neutral(50.0)),  # No history: mid-scale
+    "news_mention_sentiment": _metric("brand_readiness", "overall_sentiment_score"),
+    "topic_polarity": lambda p: p["niche"],
+    "follower_creation_dates": _metric("audience_credibility", "follower_growth_rate"),
+    "no_photo_profiles_ratio": _inverse("audience_credibility", "audience_quality_score"),
+    "geo_anomaly_score": _neutral(25.0),  # No audience geography in profiles or histories: no anomaly
+}
+
+# Declared input feature -> value read from the campaign brief (one scalar per pass)
+CAMPAIGN_FEATURES = {
+    "brand_category": lambda c: c.get("category"),
+    "brand_target_demographics": lambda c: list(c.get("platform_preference") or []),
+    "posting_time": lambda c: 1.0,  # No schedule data yet: neutral multiplier
+    "conversion_rate_benchmark": lambda c: GOAL_CONVERSION_RATES.get(c.get("goal"), 0.02),
+    "product_price_point": lambda c: c.get("average_order_value", DEFAULT_AOV),
+    "average_order_value": lambda c: c.get("average_order_value", DEFAULT_AOV),
+    "campaign_budget": lambda c: c.get("budget", DEFAULT_BUDGET),
+}
+
+# Declared input feature -> (KPI it is derived from, transform)
+DERIVED_FEATURES = {
+    "content_relevance_score": ("audience_brand_fit", lambda v: v),
+    "predicted_revenue_min": ("predicted_revenue", lambda v: v * (1 - ROI_BAND)),
+    "predicted_revenue_max": ("predicted_revenue", lambda v: v * (1 + ROI_BAND)),
+}
+
+
+def _platform_risk_parts(x, o) -> Dict[str, Any]:
+    return {
+        "past guideline violations": 0.8 * x["past_violations"],
+        "flagged content": 0.4 * x["content_flags"],
+        "platform policy changes": o.lookup(x["platform_policy_changes"], PLATFORM_POLICY_RISK, 20),
+    }
+
+
+# KPI id -> formula over its declared inputs. `x` holds whole columns (numpy) or one row (fallback),
+# `o` the matching ops, so the same expression serves both paths.
+FORMULAS = {
+    "authenticity_score": lambda x, o: (
+        0.5 * x["comment_sentiment_diversity"] + 0.3 * (100 - x["engagement_rate_variance"])
+        + 20 * (1 - o.clip(o.abs(x["follower_growth_rate"] - 5) / 10, 0, 1))
+    ),
+    "engagement_quality": lambda x, o: (
+        0.5 * x["comment_length_avg"] + 30 * o.clip(x["reply_ratio"] / 0.75, 0, 1) + 0.2 * (100 - x["emoji_only_percentage"])
+    ),
+    "audience_brand_fit": lambda x, o: (
+        20 + 50 * (x["audience_interests"] == x["brand_category"])
+        + 30 * o.isin(x["audience_demographics"], x["brand_target_demographics"])
+    ),
+    "platform_risk_score": lambda x, o: sum(_platform_risk_parts(x, o).values()),
+    "fatigue_index": lambda x, o: (
+        3 * x["sponsored_post_ratio_30d"] + 0.3 * x["engagement_decay_on_ads"] + 0.2 * (x["posting_frequency"] - 50)
+    ),
+    "predicted_impressions": lambda x, o: (
+        x["avg_impressions_last_10_posts"] * o.lookup(x["content_type"], CONTENT_TYPE_LIFT, 1.0)
+        * x["posting_time"] * o.lookup(x["network_algorithm_factor"], PLATFORM_ALGORITHM_FACTOR, 1.0)
+    ),
+    "predicted_engagements": lambda x, o: (
+        x["predicted_impressions"] * x["engagement_rate_avg"] / 100 * (0.5 + x["content_relevance_score"] / 200)
+    ),
+    "predicted_conversions": lambda x, o: (
+        x["predicted_impressions"] * x["ctr_benchmark"] / 100 * x["conversion_rate_benchmark"]
+        * o.clip((DEFAULT_AOV / x["product_price_point"]) ** 0.5, 0.25, 2)
+    ),
+    "predicted_revenue": lambda x, o: x["predicted_conversions"] * x["average_order_value"],
+    "predicted_cpa": lambda x, o: x["campaign_budget"] / o.maximum(x["predicted_conversions"], 1),
+    "roi_confidence_range": lambda x, o: (
+        x["predicted_revenue_min"] / o.maximum(x["campaign_budget"], 1),
+        x["predicted_revenue_max"] / o.maximum(x["campaign_budget"], 1),
+    ),
+    "brand_safety_score": lambda x, o: (
+        0.75 * x["keyword_analysis"] + 0.25 * x["image_recognition_safety"] - 0.5 * x["past_associations"]
+    ),
+    "controversy_probability": lambda x, o: (
+        0.4 * x["sentiment_volatility"] + 0.3 * (100 - x["news_mention_sentiment"])
+        + o.lookup(x["topic_polarity"], NICHE_POLARITY, 5)
+    ),
+    "fake_follower_probability": lambda x, o: (
+        0.5 * x["no_photo_profiles_ratio"] + 2 * o.maximum(x["follower_creation_dates"] - 8, 0)
+        + 0.5 * o.maximum(25 - x["geo_anomaly_score"], 0)
+    ),
+}
+
+# 0-100 KPIs where a high value is bad; their score_normalized is inverted
+LOWER_IS_BETTER = {"platform_risk_score", "fatigue_index", "controversy_probability", "fake_follower_probability"}
+
+# score_normalized (0-100) for KPIs that aren't already on a 0-100 scale (log scales for counts/currency)
+SCORES = {
+    "predicted_impressions": lambda v, o: o.clip((o.log10(1 + v) - 3) * 25, 0, 100),   # 1k -> 0, 10M -> 100
+    "predicted_engagements": lambda v, o: o.clip((o.log10(1 + v) - 2) * 25, 0, 100),   # 100 -> 0, 1M -> 100
+    "predicted_conversions": lambda v, o: o.clip(o.log10(1 + v) * 25, 0, 100),         # 10k -> 100
+    "predicted_revenue": lambda v, o: o.clip((o.log10(1 + v) - 2) * 25, 0, 100),       # $100 -> 0, $1M -> 100
+    "predicted_cpa": lambda v, o: o.clip(100 - o.log10(1 + v) * 25, 0, 100),           # $10k per conversion -> 0
+    "roi_confidence_range": lambda v, o: o.clip((v[0] + v[1]) * 25, 0, 100),           # 2x mean ROI -> 100
+}
+
+
+def _level(value: float, labels: Tuple[str, ...]) -> str:
+    return labels[min(len(labels) - 1, max(0, int(value * len(labels) / 100)))]
+
+
+# KPI id -> values for its explanation_template placeholders ({value} is always available).
+# Evaluated per row on plain Python values, and only for the placeholders the template uses.
+FIELDS = {
+    "authenticity_score": {
+        "reasoning": lambda r: "steady organic follower growth" if 0 <= r["follower_growth_rate"] <= 10 else "irregular follower growth",
+        "details": lambda r: f"comment sentiment {r['comment_sentiment_diversity']:.0f}/100, posting consistency {100 - r['engagement_rate_variance']:.0f}/100",
+    },
+    "engagement_quality": {
+        "quality_level": lambda r: _level(r["value"], ("shallow", "mixed", "substantive")),
+        "detail": lambda r: f"a {r['reply_ratio']:.2f}% comment-to-view ratio",
+    },
+    "audience_brand_fit": {
+        "top_interests": lambda r: r["audience_interests"],
+        "weak_areas": lambda r: (
+            "platform preference" if r["audience_demographics"] not in r["brand_target_demographics"]
+            else "brand category" if r["audience_interests"] != r["brand_category"] else "secondary demographics"
+        ),
+    },
+    "platform_risk_score": {
+        "primary_reason": lambda r: max((v, k) for k, v in _platform_risk_parts(r, _ScalarOps).items())[1],
+    },
+    "fatigue_index": {
+        "saturation_level": lambda r: _level(r["value"], ("low", "moderate", "high")),
+    },
+    "predicted_impressions": {
+        "avg_views": lambda r: f"{int(r['avg_impressions_last_10_posts']):,}",
+        "lift_factor": lambda r: f"{CONTENT_TYPE_LIFT.get(r['content_type'], 1.0)}x",
+    },
+    "predicted_engagements": {
+        "engagement_rate": lambda r: f"{r['engagement_rate_avg']:.1f}",
+    },
+    "predicted_conversions": {
+        "ctr": lambda r: f"{r['ctr_benchmark']:.2f}",
+        "cvr": lambda r: f"{r['conversion_rate_benchmark'] * 100:.1f}",
+    },
+    "predicted_revenue": {
+        "conversions": lambda r: f"{int(r['predicted_conversions']):,}",
+        "aov": lambda r: f"{r['average_order_value']:,.2f}",
+    },
+    "predicted_cpa": {
+        "budget": lambda r: f"{r['campaign_budget']:,.0f}",
+        "conversions": lambda r: f"{int(r['predicted_conversions']):,}",
+    },
+    "roi_confidence_range": {
+        "min": lambda r: f"{r['value']['min']:.2f}",
+        "max": lambda r: f"{r['value']['max']:.2f}",
+        "confidence_level": lambda r: ROI_CONFIDENCE,
+    },
+    "brand_safety_score": {
+        "risk_level": lambda r: _level(100 - r["value"], ("low", "moderate", "high")),
+    },
+    "fake_follower_probability": {
+        "anomaly_count": lambda r: (r["no_photo_profiles_ratio"] > 30) + (r["follower_creation_dates"] > 8) + (r["geo_anomaly_score"] < 15),
+    },
+}
+
+
+class _ScalarOps:
+    """Row-at-a-time ops (fallback without numpy)."""
+    abs = staticmethod(abs)
+    log10 = staticmethod(math.log10)
+
+    @staticmethod
+    def clip(x, lo, hi):
+        return min(max(x, lo), hi)
+
+    @staticmethod
+    def maximum(x, y):
+        return max(x, y)
+
+    @staticmethod
+    def isin(x, values):
+        return x in values
+
+    @staticmethod
+    def lookup(x, table, default):
+        return table.get(x, default)
+
+
+class _VectorOps:
+    """Column-at-a-time ops (numpy)."""
+
+    @staticmethod
+    def abs(x):
+        return np.abs(x)
+
+    @staticmethod
+    def log10(x):
+        return np.log10(x)
+
+    @staticmethod
+    def clip(x, lo, hi):
+        return np.clip(x, lo, hi)
+
+    @staticmethod
+    def maximum(x, y):
+        return np.maximum(x, y)
+
+    @staticmethod
+    def isin(x, values):
+        return np.isin(x, values)
+
+    @staticmethod
+    def lookup(x, table, default):
+        out = np.full(len(x), default, dtype=float)
+        for key, value in table.items():
+            out[x == key] = value
+        return out
+
+
+def _parse_output_range(spec: str) -> Tuple[str, Any]:
+    """output_range string -> (kind, labels/bounds)."""
+    compact = spec.replace(" ", "")
+    lo, sep, rest = compact.partition("-")
+    if sep and lo.isdigit() and rest.rstrip("%").isdigit():
+        return ("percent" if rest.endswith("%") else "score"), (float(lo), float(rest.rstrip("%")))
+    if compact.startswith("Integer"):
+        return "count", None
+    if compact.startswith("Currency"):
+        return "currency", None
+    if compact.startswith("min:"):
+        return "range", None
+    if "/" in compact:
+        return "level", tuple(compact.split("/"))
+    raise ValueError(f"Unsupported output_range '{spec}'")
+
+
+def _compile_template(template: str):
+    """Pre-parses an explanation_template into (literal, field, format_spec) pieces."""
+    pieces = [(literal, field, spec or "") for literal, field, spec, _ in string.Formatter().parse(template)]
+
+    def render(values: Dict[str, Any]) -> str:
+        return "".join([literal if field is None else literal + format(values[field], spec) for literal, field, spec in pieces])
+
+    return render, [field for _, field, _ in pieces if field]
+
+
+class CompiledKPI:
+    def __init__(self, definition: Dict[str, Any], category: str):
+        kpi_id = definition["id"]
+        self.id = kpi_id
+        self.name = definition.get("name", kpi_id)
+        self.category = category
+        self.inputs: List[str] = definition["input_features"]
+        self.kind, self.bounds = _parse_output_range(definition["output_range"])
+        self.formula = FORMULAS[kpi_id]
+        self.score = SCORES.get(kpi_id)
+        if self.score is None and self.kind not in ("score", "percent", "level"):
+            raise ValueError(f"KPI '{kpi_id}' has output_range '{definition['output_range']}' but no score mapping")
+        self.inverted = kpi_id in LOWER_IS_BETTER
+
+        self.render, self.template_fields = _compile_template(definition.get("explanation_template", ""))
+        fields = FIELDS.get(kpi_id, {})
+        missing = [f for f in self.template_fields if f != "value" and f not in fields]
+        if missing:
+            raise ValueError(f"KPI '{kpi_id}': no value for template placeholder(s) {missing}")
+        self.field_fns = [(f, fields[f]) for f in self.template_fields if f != "value"]
+
+    def normalize(self, value, o):
+        """score_normalized column for a value column."""
+        if self.score is not None:
+            return self.score(value, o)
+        lo, hi = self.bounds if self.kind != "level" else (0.0, 100.0)
+        clipped = o.clip(value, lo, hi)
+        return (hi - clipped) if self.inverted else clipped
+
+    def present(self, value) -> Any:
+        """JSON value of one raw value (clamped / rounded / labelled per output_range)."""
+        if self.kind in ("score", "percent"):
+            lo, hi = self.bounds
+            return int(round(min(max(value, lo), hi)))
+        if self.kind == "count":
+            return max(0, int(value))
+        if self.kind == "currency":
+            return round(max(0.0, value), 2)
+        if self.kind == "level":
+            return _level(value, self.bounds)
+        return {"min": round(value[0], 2), "max": round(value[1], 2)}
+
+    def present_column(self, column, n: int) -> List[Any]:
+        """present() over a whole value column; numpy columns are clamped and rounded in one pass."""
+        if self.kind == "range":
+            return [self.present(pair) for pair in zip(_to_list(column[0], n), _to_list(column[1], n))]
+        if not (NUMPY_AVAILABLE and isinstance(column, np.ndarray) and column.ndim):
+            return [self.present(v) for v in _to_list(column, n)]
+        if self.kind in ("score", "percent"):
+            return np.rint(np.clip(column, *self.bounds)).astype(int).tolist()
+        if self.kind == "count":
+            return np.maximum(column, 0).astype(int).tolist()
+        if self.kind == "currency":
+            # Python's round() (correctly rounded), so both paths agree to the cent
+            return [round(v, 2) for v in np.maximum(column, 0.0).tolist()]
+        idx = np.clip((column * len(self.bounds) / 100).astype(int), 0, len(self.bounds) - 1)
+        return [self.bounds[i] for i in idx.tolist()]
+
+    def display(self, value) -> str:
+        """{value} placeholder text for a presented value."""
+        if self.kind == "count":
+            return f"{value:,}"
+        if self.kind == "currency":
+            return f"{value:,.2f}"
+        if self.kind == "range":
+            return f"{value['min']}x-{value['max']}x"
+        return str(value)
+
+
+def _to_list(column, n: int) -> List[Any]:
+    """Column (numpy array, list, or a scalar broadcast to n rows) as a Python list."""
+    if NUMPY_AVAILABLE and isinstance(column, np.ndarray):
+        return column.tolist() if column.ndim else [column.item()] * n
+    return list(column) if isinstance(column, (list, tuple)) else [column] * n
+
+
+class KPIEngine:
+    """
+    Computes the numeric KPIs declared in kpi_definitions.json locally, without the LLM.
+    Definitions are loaded and compiled once: input features resolved to profile/campaign fields
+    (or to other KPIs, evaluated in dependency order), output ranges to clamps and score mappings,
+    explanation templates to pre-parsed formatters. One compute() call evaluates every KPI over
+    whole feature columns for a batch of influencers.
+    These are a separate, non-authoritative screening estimate: the evaluation's KPIs and decision
+    come from the analysts (LLM or mock) and never read these values. Ids are returned under
+    KPI_ID_PREFIX so the two can't be confused.
+    """
+
+    def __init__(self, path: str = KPI_DEFINITIONS_PATH, vectorized: bool = NUMPY_AVAILABLE):
+        self.path = path
+        self.vectorized = vectorized and NUMPY_AVAILABLE
+        self.kpis: List[CompiledKPI] = []
+        self.uncompiled: List[str] = []
+        self.stats = {"calls": 0, "influencers": 0}
+        self._compile()
+
+    def _compile(self):
+        with open(self.path, "r") as f:
+            definitions = json.load(f)["kpis"]
+
+        compiled: Dict[str, CompiledKPI] = {}
+        for category, items in definitions.items():
+            for definition in items:
+                if definition["id"] in FORMULAS:
+                    compiled[definition["id"]] = CompiledKPI(definition, category)
+                else:
+                    self.uncompiled.append(definition["id"])
+
+        # 1. Resolve every declared input, collecting KPI -> KPI dependencies
+        deps: Dict[str, set] = {}
+        influencer_inputs, campaign_inputs = set(), set()
+        for kpi in compiled.values():
+            deps[kpi.id] = set()
+            for name in kpi.inputs:
+                if name in INFLUENCER_FEATURES:
+                    influencer_inputs.add(name)
+                elif name in CAMPAIGN_FEATURES:
+                    campaign_inputs.add(name)
+                elif name in compiled:
+                    deps[kpi.id].add(name)
+                elif name in DERIVED_FEATURES and DERIVED_FEATURES[name][0] in compiled:
+                    deps[kpi.id].add(DERIVED_FEATURES[name][0])
+                else:
+                    raise ValueError(f"KPI '{kpi.id}': unknown input feature '{name}'")
+        self._influencer_inputs = sorted(influencer_inputs)
+        self._campaign_inputs = sorted(campaign_inputs)
+
+        # 2. Dependency order (depth-first, rejecting cycles)
+        state: Dict[str, str] = {}
+
+        def visit(kpi_id: str):
+            if state.get(kpi_id) == "done":
+                return
+            if state.get(kpi_id) == "visiting":
+                raise ValueError(f"Cyclic KPI dependency through '{kpi_id}'")
+            state[kpi_id] = "visiting"
+            for dep in sorted(deps[kpi_id]):
+                visit(dep)
+            state[kpi_id] = "done"
+            self.kpis.append(compiled[kpi_id])
+
+        for kpi_id in compiled:
+            visit(kpi_id)
+
+        # 3. Derived features to materialize right after the KPI they come from
+        needed = {name for kpi in self.kpis for name in kpi.inputs}
+        self._derived_after: Dict[str, List[Tuple[str, Any]]] = {}
+        for name, (source, fn) in DERIVED_FEATURES.items():
+            if name in needed and source in compiled:
+                self._derived_after.setdefault(source, []).append((name, fn))
+
+    def _evaluate(self, env: Dict[str, Any], o) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Runs every KPI in dependency order over env (columns or a single row)."""
+        values, scores = {}, {}
+        for kpi in self.kpis:
+            value = kpi.formula({name: env[name] for name in kpi.inputs}, o)
+            values[kpi.id] = env[kpi.id] = value
+            scores[kpi.id] = kpi.normalize(value, o)
+            for name, fn in self._derived_after.get(kpi.id, ()):
+                env[name] = fn(value)
+        return values, scores
+
+    def _features(self, influencers: List[Dict[str, Any]], campaign: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, List[Any]]]:
+        """Campaign inputs (scalars) and influencer input columns (lists), extracted once per pass."""
+        scalars = {name: CAMPAIGN_FEATURES[name](campaign) for name in self._campaign_inputs}
+        columns = {name: [INFLUENCER_FEATURES[name](p) for p in influencers] for name in self._influencer_inputs}
+        return scalars, columns
+
+    def _run(self, scalars: Dict[str, Any], columns: Dict[str, List[Any]], n: int) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        self.stats["calls"] += 1
+        self.stats["influencers"] += n
+        if self.vectorized and n >= VECTORIZE_MIN_BATCH:
+            return self._evaluate({**scalars, **{name: np.asarray(column) for name, column in columns.items()}}, _VectorOps)
+
+        values = {kpi.id: [] for kpi in self.kpis}
+        scores = {kpi.id: [] for kpi in self.kpis}
+        for i in range(n):
+            row_values, row_scores = self._evaluate({**scalars, **{name: column[i] for name, column in columns.items()}}, _ScalarOps)
+            for kpi_id in values:
+                values[kpi_id].append(row_values[kpi_id])
+                scores[kpi_id].append(row_scores[kpi_id])
+        for kpi in self.kpis:
+            if kpi.kind == "range":
+                values[kpi.id] = tuple(zip(*values[kpi.id])) or ([], [])
+        return values, scores
+
+    def compute_columns(self, influencers: List[Dict[str, Any]], campaign: Optional[Dict[str, Any]] = None) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Raw value and score_normalized columns per KPI id (numpy arrays, or lists without numpy).
+        roi_confidence_range's value is a (min, max) pair of columns.
+        """
+        scalars, columns = self._features(influencers, campaign or {})
+        return self._run(scalars, columns, len(influencers))
+
+    def compute(self, influencers: List[Dict[str, Any]], campaign: Optional[Dict[str, Any]] = None,
+                explain: bool = True) -> List[List[Dict[str, Any]]]:
+        """KPI dicts (kpi_id "engine.<id>", name, category, value, score_normalized[, explanation]) per influencer."""
+        n = len(influencers)
+        scalars, columns = self._features(influencers, campaign or {})
+        values, scores = self._run(scalars, columns, n)
+
+        results: List[List[Dict[str, Any]]] = [[] for _ in range(n)]
+        for kpi in self.kpis:
+            presented = kpi.present_column(values[kpi.id], n)
+            score = scores[kpi.id]
+            if NUMPY_AVAILABLE and isinstance(score, np.ndarray) and score.ndim:
+                score = np.rint(score).astype(int).tolist()
+            else:
+                score = [int(round(v)) for v in _to_list(score, n)]
+
+            if not explain:
+                for i in range(n):
+                    results[i].append({"kpi_id": KPI_ID_PREFIX + kpi.id, "name": kpi.name, "category": kpi.category,
+                                       "value": presented[i], "score_normalized": score[i]})
+                continue
+
+            # Explanation placeholders read the KPI's own inputs as plain Python values
+            inputs = {}
+            if kpi.field_fns:
+                for name in kpi.inputs:
+                    if name in columns:
+                        inputs[name] = columns[name]
+                    elif name in scalars:
+                        inputs[name] = [scalars[name]] * n
+                    elif name in values:
+                        inputs[name] = _to_list(values[name], n)
+                    else:
+                        source, fn = DERIVED_FEATURES[name]
+                        inputs[name] = [fn(v) for v in _to_list(values[source], n)]
+
+            for i in range(n):
+                fields = {"value": kpi.display(presented[i])}
+                if inputs:
+                    row = {name: column[i] for name, column in inputs.items()}
+                    row["value"] = presented[i]
+                    for field, fn in kpi.field_fns:
+                        fields[field] = fn(row)
+                results[i].append({"kpi_id": KPI_ID_PREFIX + kpi.id, "name": kpi.name, "category": kpi.category,
+                                   "value": presented[i], "score_normalized": score[i],
+                                   "explanation": kpi.render(fields)})
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "vectorized": self.vectorized, "compiled": [k.id for k in self.kpis],
+                "uncompiled": self.uncompiled}
+
+
+kpi_engine = KPIEngine()
@@ -1,7 +1,27 @@
 import json
-import hashlib
+import os
 import random
-from typing import Dict, List, Any
+import re
+import time
+from typing import Dict, List, Any, Iterator
+
+from ai_engine.decision_rules import decision_rules
+from ai_engine.deterministic_rng import payload_rng
+from ai_engine.profiling import profiler
+
+ROLE_MARKERS = {
+    "You are the Performance Analyst": "performance_analyst",
+    "You are the Risk Analyst": "risk_analyst",
+    "You are the Audience Strategist": "audience_strategist",
+    "You are the Executive Decision Engine": "executive_decider",
+}
+
+def detect_role(system_prompt: str) -> str:
+    """Maps a system prompt to its analyst role name (prompt file stem)."""
+    for marker, role in ROLE_MARKERS.items():
+        if marker in system_prompt:
+            return role
+    return "unknown"
 
 class MockLLMClient:
     """
@@ -9,14 +29,14 @@ class MockLLMClient:
     Generates deterministic, schema-compliant JSON responses based on input hashes.
     This allows the system to work immediately without API keys or costs.
     """
+    model = "mock"
 
+    @profiler.staged("llm.generate")
     def generate(self, system_prompt: str, user_data: Dict[str, Any]) -> Any:
         # Create a stable seed from the input data
         # We assume user_data is JSON serializable
         data_str = json.dumps(user_data, sort_keys=True)
-        seed_hash = hashlib.md5((system_prompt + data_str).encode('utf-8')).hexdigest()
-        seed_int = int(seed_hash, 16)
-        rng = random.Random(seed_int)
+        rng = payload_rng(system_prompt, data_str)
 
         # Detect which role we are simulating based on system prompt content
         if "You are the Performance Analyst" in system_prompt:
@@ -30,7 +50,21 @@ class MockLLMClient:
         else:
             return {}
 
-    def _generate_analysis_report(self, role: str, kpis: List[Dict], rng: random.Random) -> Dict:
+    def _baseline_score(self, data: Dict, metric: str, value: float, fallback: float, percentiles: List[float]) -> float:
+        """
+        Percentile (0-100) of value among niche x platform x content_type peers.
+        Falls back to the fixed scaling when there is no baseline for the metric.
+        """
+        from backend.services.baselines import baselines, ANY # Lazy import, same as context_enricher
+        inf = data.get("influencer", {})
+        pct = baselines.percentile(inf.get("niche", ANY), inf.get("platform", ANY), data.get("content_type", "all"), metric, value)
+        if pct is None:
+            return fallback
+        percentiles.append(pct)
+        return int(round(pct))
+
+    def _generate_analysis_report(self, role: str, kpis: List[Dict], rng: random.Random, percentiles: List[float] = None,
+                                  trend: Dict = None) -> Dict:
         """
         Generates a structured TikTok-style PM analysis report.
         """
@@ -43,10 +77,20 @@ class MockLLMClient:
         ]
         headline = rng.choice(headlines)
 
-        # 2. Magnitude (Delta)
-        delta = rng.randint(-15, 25)
-        sign = "+" if delta > 0 else ""
-        magnitude = f"{sign}{delta}% vs 30d baseline"
+        # 2. Magnitude (Delta): mean KPI percentile vs the peer median (50th percentile)
+        if percentiles:
+            delta = int(round(sum(percentiles) / len(percentiles) - 50))
+            sign = "+" if delta > 0 else ""
+            magnitude = f"{sign}{delta} pts vs peer median"
+        elif trend and trend.get("vs_30d_pct") is not None:
+            # Last day of the role's headline series vs its 30-day rolling mean (backend/services/timeseries.py)
+            delta = int(round(trend["vs_30d_pct"]))
+            sign = "+" if delta > 0 else ""
+            magnitude = f"{sign}{delta}% vs 30d baseline"
+        else:
+            delta = rng.randint(-15, 25)
+            sign = "+" if delta > 0 else ""
+            magnitude = f"{sign}{delta}% vs 30d baseline"
 
         # 3. Drivers (Segments)
         segments = ["Gen Z (18-24)", "Tier 1 Cities", "Android Users", "New Followers", "Loyalists"]
@@ -103,18 +147,22 @@ class MockLLMClient:
         conversions = int(impressions * (rng.uniform(0.005, 0.02)))
         promo_redemptions = int(conversions * rng.uniform(0.4, 0.8))
 
+        # Scores are peer percentiles (see backend/services/baselines.py)
+        percentiles: List[float] = []
+
         # 1. Growth Momentum
         # Base value on predicted growth
         growth_val = int(growth_metrics.get("predicted_growth_6m", 0) / 1000) # Simple scaling
-        growth_score = min(99, int(rng.uniform(60, 95))) # Mock score for now, or derive from growth rate
+        growth_score = min(99, self._baseline_score(data, "predicted_growth_6m", growth_metrics.get("predicted_growth_6m", 0),
+                                                    int(rng.uniform(60, 95)), percentiles))
         
         growth_explanation = "Viral peaks indicate strong short-term momentum."
         if c_type == "long":
             growth_explanation = "Consistent channel growth suggests long-term stability."
 
         # 2. Intent Strength
-        intent_score = min(99, int(intent_metrics.get("promo_redemption_rate", 0) * 2000)) # Scale up
-        intent_score = max(40, intent_score)
+        intent_score = self._baseline_score(data, "promo_redemption_rate", intent_metrics.get("promo_redemption_rate", 0),
+                                            max(40, min(99, int(intent_metrics.get("promo_redemption_rate", 0) * 2000))), percentiles)
         
         intent_explanation = "High share ratio indicates content stops the scroll."
         if c_type == "long":
@@ -141,14 +189,14 @@ class MockLLMClient:
             {
                 "kpi_id": "predicted_impressions",
                 "value": impressions,
-                "score_normalized": min(100, impressions / 10000),
+                "score_normalized": self._baseline_score(data, "expected_impressions", impressions, min(100, impressions / 10000), percentiles),
                 "explanation": f"Based on {followers:,} followers and historical reach patterns.",
                 "confidence_score": 0.85
             },
             {
                 "kpi_id": "avg_percentage_viewed",
                 "value": f"{int(completion_rate*100)}%",
-                "score_normalized": int(completion_rate * 200),
+                "score_normalized": self._baseline_score(data, "completion_rate", completion_rate * 100, int(completion_rate * 200), percentiles),
                 "explanation": "High retention indicates strong hook effectiveness.",
                 "confidence_score": 0.8
             },
@@ -162,14 +210,14 @@ class MockLLMClient:
             {
                 "kpi_id": "predicted_saves",
                 "value": saves,
-                "score_normalized": min(100, saves / 100),
+                "score_normalized": self._baseline_score(data, "expected_saves", saves, min(100, saves / 100), percentiles),
                 "explanation": "High intent signal for product interest.",
                 "confidence_score": 0.7
             },
             {
                 "kpi_id": "promo_code_redemptions",
                 "value": promo_redemptions,
-                "score_normalized": min(100, promo_redemptions / 20),
+                "score_normalized": self._baseline_score(data, "expected_redemptions", promo_redemptions, min(100, promo_redemptions / 20), percentiles),
                 "explanation": "Direct revenue attribution estimate.",
                 "confidence_score": 0.6
             }
@@ -178,7 +226,8 @@ class MockLLMClient:
         return {
             "role": "Performance Analyst",
             "kpis": kpis,
-            "analysis": self._generate_analysis_report("Performance Analyst", kpis, rng)
+            "analysis": self._generate_analysis_report("Performance Analyst", kpis, rng, percentiles,
+                                                    (data.get("history") or {}).get("views"))
         }
 
     def _mock_risk_analyst(self, data: Dict, rng: random.Random) -> Dict:
@@ -187,7 +236,29 @@ class MockLLMClient:
         c_type = data.get("content_type", "all")
 
         safety_score = brand_metrics.get("brand_safety_score", 85)
+        percentiles: List[float] = []
+        safety_pct = self._baseline_score(data, "brand_safety_score", safety_score, safety_score, percentiles)
         
+        # Bot / spike probabilities from the streaming detectors (backend/services/risk_signals.py)
+        signals = data.get("risk_signals") or {}
+        if signals.get("fake_follower_probability") is not None:
+            controversy = int(round(signals["controversy_probability"]))
+            controversy_score = 100 - controversy  # lower is better, as in kpi_engine
+            controversy_explanation = (f"{signals['engagement_spikes']} engagement spike(s), {signals['controversial_spikes']} with a "
+                                       f"sentiment drop, {signals['sentiment_shifts']} sentiment shift(s) in {signals['events']} days.")
+            fake = int(round(signals["fake_follower_probability"]))
+            fake_score = 100 - fake
+            fake_explanation = (f"{signals['follower_jumps']} follower jump(s) without matching engagement and "
+                                f"{signals['drip_alerts']} drip-fed growth alert(s) in {signals['events']} days.")
+        else:
+            # Same orientation as the signal path: the score is the complement of the probability
+            controversy = rng.randint(1, 20)
+            controversy_score = 100 - controversy
+            controversy_explanation = "Low volatility in sentiment history."
+            fake = rng.randint(5, 30)
+            fake_score = 100 - fake
+            fake_explanation = "Some engagement anomalies detected."
+
         # Contextual explanation
         explanation = "Content aligns with brand safety guidelines."
         if c_type == "short":
@@ -200,7 +271,7 @@ class MockLLMClient:
             {
                 "kpi_id": "brand_readiness",
                 "value": f"{safety_score}/100",
-                "score_normalized": safety_score,
+                "score_normalized": safety_pct,
                 "explanation": explanation,
                 "confidence_score": 0.95
             },
@@ -209,29 +280,30 @@ class MockLLMClient:
             {
                 "kpi_id": "brand_safety_score",
                 "value": safety_score, # Re-using the raw score
-                "score_normalized": safety_score, 
+                "score_normalized": safety_pct,
                 "explanation": "Content analysis shows mostly safe topics.",
                 "confidence_score": 0.95
             },
             {
                 "kpi_id": "controversy_probability",
-                "value": f"{rng.randint(1, 20)}%",
-                "score_normalized": rng.randint(1, 20),
-                "explanation": "Low volatility in sentiment history.",
+                "value": f"{controversy}%",
+                "score_normalized": controversy_score,
+                "explanation": controversy_explanation,
                 "confidence_score": 0.8
             },
             {
                 "kpi_id": "fake_follower_probability",
-                "value": f"{rng.randint(5, 30)}%",
-                "score_normalized": 100 - rng.randint(5, 30),
-                "explanation": "Some engagement anomalies detected.",
+                "value": f"{fake}%",
+                "score_normalized": fake_score,
+                "explanation": fake_explanation,
                 "confidence_score": 0.85
             }
         ]
         return {
             "role": "Risk Analyst",
             "kpis": kpis,
-            "analysis": self._generate_analysis_report("Risk Analyst", kpis, rng)
+            "analysis": self._generate_analysis_report("Risk Analyst", kpis, rng, percentiles,
+                                                    (data.get("history") or {}).get("sentiment"))
         }
 
     def _mock_audience_strategist(self, data: Dict, rng: random.Random) -> Dict:
@@ -246,7 +318,9 @@ class MockLLMClient:
         comp = eng_metrics.get("completion_rate", 50) 
         # comp is 0-100 from DataGenerator? No, it's 0.3-0.8 * 100 in dict?
         # In generator: round(completion_rate * 100, 1) -> so it's 0-100.
+        percentiles: List[float] = []
         eng_score = int(comp)
+        eng_pct = self._baseline_score(data, "completion_rate", comp, eng_score, percentiles)
         
         eng_explanation = "High completion rates indicate strong hook."
         if c_type == "long":
@@ -257,7 +331,7 @@ class MockLLMClient:
              {
                 "kpi_id": "engagement_quality",
                 "value": f"{eng_score}/100",
-                "score_normalized": eng_score, 
+                "score_normalized": eng_pct,
                 "explanation": eng_explanation,
                 "confidence_score": 0.9
             }
@@ -270,7 +344,7 @@ class MockLLMClient:
             kpis.append({
                 "kpi_id": "audience_loyalty",
                 "value": f"{retention}/100",
-                "score_normalized": retention,
+                "score_normalized": self._baseline_score(data, "retention_score", retention, retention, percentiles),
                 "explanation": "Consistent viewership across long-form content.",
                 "confidence_score": 0.88
             })
@@ -280,34 +354,48 @@ class MockLLMClient:
             kpis.append({
                 "kpi_id": "audience_credibility",
                 "value": f"{qual}/100",
-                "score_normalized": qual,
+                "score_normalized": self._baseline_score(data, "audience_quality_score", qual, qual, percentiles),
                 "explanation": "Audience appears authentic with low bot probability.",
                 "confidence_score": 0.88
             })
             
         # --- Granular Execution Metrics (Restored) ---
+        sentiment = eng_metrics.get("comment_sentiment_quality", 85)
+        brand_fit, brand_fit_score = rng.randint(30, 95), rng.randint(30, 95)
+
+        # Fatigue from the last 30 days of history: share of sponsored posts and their engagement decay
+        history = data.get("history") or {}
+        decay = history.get("engagement_decay_on_ads_pct")
+        if decay is not None:
+            ad_ratio = history.get("sponsored_ratio_30d", 0)
+            fatigue = int(min(max(2 * ad_ratio + decay, 0), 100))
+            fatigue_score = 100 - fatigue
+            fatigue_explanation = (f"{ad_ratio:g}% of the last 30 days were sponsored; sponsored posts engage "
+                                   f"{abs(decay):g}% {'less' if decay >= 0 else 'more'} than organic ones.")
+        else:
+            fatigue, fatigue_score = rng.randint(0, 60), 100 - rng.randint(0, 60)
+            fatigue_explanation = "Posting frequency is healthy."
+
         kpis.extend([
             {
                 "kpi_id": "comment_sentiment_quality",
-                "value": f"{detailed.get('engagement_quality', {}).get('comment_sentiment_quality', 85)}/100",
-                "score_normalized": 85,
+                "value": f"{sentiment}/100",
+                "score_normalized": self._baseline_score(data, "comment_sentiment_quality", sentiment, 85, percentiles),
                 "explanation": "High volume of product-specific questions vs generic emojis.",
                 "confidence_score": 0.85
             },
             {
                 "kpi_id": "audience_brand_fit",
-                "value": f"{rng.randint(30, 95)}%",
-                "score_normalized": rng.randint(30, 95),
+                "value": f"{brand_fit}%",
+                "score_normalized": brand_fit_score,
                 "explanation": "Demographics align well with target.",
                 "confidence_score": 0.85
             },
             {
-                "kpi_id": "avg_view_duration", # Moved from performance sometimes?? No, keep logical separation. 
-                # Actually, let's just restore what was there.
                 "kpi_id": "fatigue_index",
-                "value": rng.randint(0, 60),
-                "score_normalized": 100 - rng.randint(0, 60),
-                "explanation": "Posting frequency is healthy.",
+                "value": fatigue,
+                "score_normalized": fatigue_score,
+                "explanation": fatigue_explanation,
                 "confidence_score": 0.9
             }
         ])
@@ -315,16 +403,18 @@ class MockLLMClient:
         return {
             "role": "Audience Strategist",
             "kpis": kpis,
-            "analysis": self._generate_analysis_report("Audience Strategist", kpis, rng)
+            "analysis": self._generate_analysis_report("Audience Strategist", kpis, rng, percentiles,
+                                                    (data.get("history") or {}).get("engagement_rate"))
         }
 
+    @profiler.staged("llm.chat")
     def chat(self, query: str, context: Dict) -> str:
         """
         Simulates a RAG chat response using the structured category-based context.
         Now uses ContextEnricher to return structured JSON explanations for specific metrics.
         Returns JSON strings for ALL responses to ensure UI consistency.
         """
-        from backend.services.context_enrichment import context_enricher # Lazy import to avoid circular dependency if any
+        from backend.services.chat_context_builder import category_card, consultant_card # Lazy import to avoid circular dependency if any
         import json
 
         query_lower = query.lower()
@@ -338,39 +428,15 @@ class MockLLMClient:
             
             # Find matching metric
             for m in all_metrics:
-                m_id = m['kpi_id']
                 # fuzzy match
-                if any(k in m_id for k in keyword_list):
-                    enriched = context_enricher.enrich_metric(
-                        metric_key=m_id,
-                        value=m['value'],
-                        score_normalized=m['score_normalized'] if 'score_normalized' in m else 75, # Fallback if score missing
-                        category=context.get("niche", "General"),
-                        goal=context.get("goal", "Awareness")
-                    )
-                    # Add type for frontend usage if needed, though frontend detects by 'metric_name' existence
-                    enriched["type"] = "consultant_card" 
-                    return json.dumps(enriched)
+                if any(k in m['kpi_id'] for k in keyword_list):
+                    return json.dumps(consultant_card(context, m))
             return None
 
         # 0. Helper to format category analysis as JSON
         def format_category_card(category_name, title):
-            cat = context.get("categories", {}).get(category_name)
-            if not cat: return ""
-            
-            # Extract verdict from conclusion (simple heuristic or passed context)
-            verdict = "Neutral"
-            if "Strong" in cat['conclusion'] or "High" in cat['conclusion']: verdict = "Positive"
-            if "Low" in cat['conclusion'] or "fail" in cat['conclusion'] or "Risk" in cat['conclusion']: verdict = "Concern"
-            
-            card = {
-                "type": "analysis_card",
-                "title": title,
-                "verdict": verdict,
-                "content": cat['conclusion'],
-                "metrics": [{"label": m['kpi_id'].replace('_', ' ').title(), "value": str(m['value'])} for m in cat["metrics"]]
-            }
-            return json.dumps(card)
+            card = category_card(context, category_name, title)
+            return json.dumps(card) if card else ""
 
         # --- Metric Specific Queries ---
 
@@ -473,6 +539,20 @@ class MockLLMClient:
         
         return json.dumps(fallback_card)
 
+    # Per-token delay for the simulated stream, so streaming paths show realistic timing offline
+    STREAM_TOKEN_DELAY_S = float(os.environ.get("MOCK_STREAM_TOKEN_DELAY_MS", 0)) / 1000
+
+    def chat_stream(self, query: str, context: Dict) -> Iterator[str]:
+        """
+        Simulates a token stream for the chat answer.
+        Concatenating the yielded chunks gives exactly the chat() response.
+        """
+        full = self.chat(query, context)
+        for token in re.findall(r"\S+\s*|\s+", full):
+            if self.STREAM_TOKEN_DELAY_S:
+                time.sleep(self.STREAM_TOKEN_DELAY_S)
+            yield token
+
     def _mock_executive(self, data: Dict, rng: random.Random) -> Dict:
         # Simple synthesize logic
         risk_score = 0
@@ -488,13 +568,15 @@ class MockLLMClient:
         if risk == "HIGH":
             decision = "NO-GO"
             
+        # Same basis as the rules engine and the prompt's ROI rule; re-rolled only without the inputs
+        roi = decision_rules.roi_range((data.get("analyst_reports") or {}).get("performance", []),
+                                       data.get("detailed_metrics", {}))
+        if roi is None:
+            roi = {"min": round(rng.uniform(1.0, 2.5), 1), "max": round(rng.uniform(2.6, 5.0), 1), "confidence": 0.85}
+
         return {
             "decision": decision,
-            "roi_prediction": {
-                "min": round(rng.uniform(1.0, 2.5), 1),
-                "max": round(rng.uniform(2.6, 5.0), 1),
-                "confidence": 0.85
-            },
+            "roi_prediction": roi,
             "risk_level": risk,
             "executive_summary": f"Based on the Strong ROI potential and {risk} risk profile, we recommend a {decision}.",
             "top_flags": [
@@ -504,27 +586,43 @@ class MockLLMClient:
             ]
         }
 
-import os
+from ai_engine.resilience import ResilientCaller
 try:
     from openai import OpenAI
     OPENAI_AVAILABLE = True
 except ImportError:
     OPENAI_AVAILABLE = False
 
+class StreamInterrupted(Exception):
+    """The provider failed after part of a streamed answer was already sent: the answer is incomplete."""
+
 class RealLLMClient:
     """
     Real integration with OpenAI GPT-4o-mini (or similar).
     Uses the same interface as MockLLMClient.
+    Calls go through ResilientCaller (deadlines, hedging, circuit breaker). When the provider
+    is unavailable the deterministic mock output is served and marked "degraded": True.
     """
     def __init__(self, api_key):
-        self.client = OpenAI(api_key=api_key)
+        self.resilience = ResilientCaller()
+        # Retries/timeouts are owned by ResilientCaller; OPENAI_BASE_URL can point at a local stand-in server
+        self.client = OpenAI(
+            api_key=api_key,
+            base_url=os.environ.get("OPENAI_BASE_URL") or None,
+            max_retries=0,
+            timeout=max(self.resilience.deadlines_s.values())
+        )
         self.model = "gpt-4o-mini" # Cost effective and fast
+        # Optional ai_engine.llm_replay.LLMRecorder capturing every completion attempt (LLM_RECORD_PATH)
+        self.recorder = None
 
-    def generate(self, system_prompt: str, user_data: Dict[str, Any]) -> Any:
+    @profiler.staged("llm.complete")
+    def _complete(self, system_prompt: str, user_data: Dict[str, Any]) -> Any:
+        # Prepare the user message with the data context (compact: indentation only costs tokens)
+        user_content = f"Here is the data context:\n{json.dumps(user_data, separators=(',', ':'))}"
+        
+        t0 = time.perf_counter()
         try:
-            # Prepare the user message with the data context
-            user_content = f"Here is the data context:\n{json.dumps(user_data, indent=2)}"
-            
             response = self.client.chat.completions.create(
                 model=self.model,
                 messages=[
@@ -534,24 +632,130 @@ class RealLLMClient:
                 response_format={"type": "json_object"},
                 temperature=0.7
             )
-            
-            content = response.choices[0].message.content
-            return json.loads(content)
         except Exception as e:
+            if self.recorder:
+                self.recorder.record(system_prompt, user_data, time.perf_counter() - t0, error=type(e).__name__)
+            raise
+        
+        content = response.choices[0].message.content
+        if self.recorder:
+            self.recorder.record(system_prompt, user_data, time.perf_counter() - t0, content, getattr(response, "usage", None))
+        return json.loads(content)
+
+    @profiler.staged("llm.generate")
+    def generate(self, system_prompt: str, user_data: Dict[str, Any]) -> Any:
+        role = detect_role(system_prompt)
+        try:
+            return self.resilience.call(role, lambda: self._complete(system_prompt, user_data))
+        except Exception as e:
+            # Declared degraded mode rather than a silent fallback
+            print(f"LLM Error ({role}): {type(e).__name__}: {e}")
+            result = MockLLMClient().generate(system_prompt, user_data)
+            if isinstance(result, dict):
+                result["degraded"] = True
+            return result
+
+    def _chat_messages(self, query: str, context: Dict) -> List[Dict[str, str]]:
+        history = context.get("history", [])
+        data = {k: v for k, v in context.items() if k not in ("history", "history_summary")}
+
+        messages = [{"role": "system", "content": CHAT_SYSTEM_PROMPT}]
+        messages.append({"role": "system", "content": f"Audit data:{json.dumps(data, separators=(',', ':'))}"})
+        if context.get("history_summary"):
+            messages.append({"role": "system", "content": f"Earlier in this conversation: {context['history_summary']}"})
+        messages.extend(history)
+        messages.append({"role": "user", "content": query})
+        return messages
+
+    @profiler.staged("llm.chat")
+    def chat(self, query: str, context: Dict) -> str:
+        """
+        RAG chat turn. The context is already trimmed by the session store:
+        relevant categories only, plus a budgeted history and a rolling summary of older turns.
+        """
+        def complete():
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=self._chat_messages(query, context),
+                response_format={"type": "json_object"},
+                temperature=0.3
+            )
+            return response.choices[0].message.content
+
+        try:
+            return self.resilience.call("chat", complete)
+        except Exception as e:
+            print(f"LLM Error (chat): {type(e).__name__}: {e}")
+            return MockLLMClient().chat(query, context)
+
+    def chat_stream(self, query: str, context: Dict) -> Iterator[str]:
+        """
+        Streams the chat answer as the model produces it.
+        A failure before the first delta falls back to the mock answer; after it, raises StreamInterrupted
+        (the client already has part of the real answer, a mock one can't be appended to it).
+        """
+        # Streams aren't hedged, but they still respect the breaker
+        breaker = self.resilience.breaker
+        if not breaker.allow():
+            yield from MockLLMClient().chat_stream(query, context)
+            return
+        yielded = False
+        ok = None  # stays None if the consumer stops reading (client disconnect): no verdict on the provider
+        try:
+            stream = self.client.chat.completions.create(
+                model=self.model,
+                messages=self._chat_messages(query, context),
+                response_format={"type": "json_object"},
+                temperature=0.3,
+                stream=True
+            )
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    yielded = True
+                    yield delta
+            ok = True
+        except Exception as e:
+            ok = False
             print(f"LLM Error: {e}")
-            # Fallback to mock on error? Or just raise? 
-            # For reliability in this hybrid setup, getting SOMETHING is better.
+            if yielded:
+                raise StreamInterrupted(str(e)) from e
+        finally:
+            if ok is True:
+                breaker.record_success()
+            elif ok is False:
+                breaker.record_failure()
+            else:
+                breaker.release()
+        if not ok:
             print("Falling back to Mock Client due to error.")
-            return MockLLMClient().generate(system_prompt, user_data)
+            yield from MockLLMClient().chat_stream(query, context)
+
+CHAT_SYSTEM_PROMPT = (
+    "You are an influencer marketing consultant. Answer ONLY from the audit data provided. "
+    "Reply with a single JSON analysis card: "
+    '{"type": "analysis_card", "title": str, "verdict": str, "content": str, "metrics": [{"label": str, "value": str}]}'
+)
 
 # ... (MockLLMClient remains as is, but we will instantiate based on env)
 
 # Selector Logic
 api_key = os.environ.get("OPENAI_API_KEY")
-
-if api_key and OPENAI_AVAILABLE:
+# LLM_REPLAY_PATH serves a recording offline; LLM_RECORD_PATH records the real client's traffic
+replay_path = os.environ.get("LLM_REPLAY_PATH")
+record_path = os.environ.get("LLM_RECORD_PATH")
+
+if replay_path:
+    from ai_engine.llm_replay import ReplayLLMClient # Lazy: llm_replay builds on the classes above
+    print(f"⏯️  Using Replay LLM Client ({replay_path})")
+    llm_client = ReplayLLMClient(replay_path)
+elif api_key and OPENAI_AVAILABLE:
     print("🚀 Using Real LLM Client (OpenAI)")
     llm_client = RealLLMClient(api_key)
+    if record_path:
+        from ai_engine.llm_replay import LLMRecorder
+        print(f"   Recording LLM traffic to {record_path}")
+        llm_client.recorder = LLMRecorder(record_path)
 else:
     print("🤖 Using Mock LLM Client (Deterministic)")
     if api_key and not OPENAI_AVAILABLE:
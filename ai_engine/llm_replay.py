@@ -0,0 +1,184 @@
+import gzip
+import json
+import os
+import random
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple, Iterator
+
+from ai_engine.deterministic_rng import stream_key
+from ai_engine.llm_client import RealLLMClient, MockLLMClient, detect_role
+from ai_engine.profiling import profiler
+from ai_engine.resilience import ResilientCaller
+
+# Replay timing: "role" draws from the role's recorded latency distribution (tails included),
+# "recorded" reuses each request's own recorded latencies, "none" answers immediately
+REPLAY_LATENCY = os.environ.get("LLM_REPLAY_LATENCY", "role")
+# Multiplier on replayed latencies (0.1 = ten times faster than production)
+REPLAY_TIME_SCALE = float(os.environ.get("LLM_REPLAY_TIME_SCALE", 1.0))
+# Requests missing from the recording: "mock" (MockLLMClient output at replayed latency) or "error"
+REPLAY_ON_MISS = os.environ.get("LLM_REPLAY_ON_MISS", "mock")
+REPLAY_SEED = int(os.environ.get("LLM_REPLAY_SEED", 7))
+
+LATENCY_MODES = ("role", "recorded", "none")
+
+
+def request_key(system_prompt: str, user_data: Dict[str, Any]) -> str:
+    """Canonical key of a generate() request: hash of the prompt and the key-sorted data."""
+    data = json.dumps(user_data, sort_keys=True, separators=(",", ":"))
+    return stream_key("llm", system_prompt, data).hex()[:32]
+
+
+def _open(path: str, mode: str):
+    # .gz recordings are gzip members appended one per session; gzip.open reads them back as one stream
+    return gzip.open(path, mode + "t", encoding="utf-8") if path.endswith(".gz") else open(path, mode, encoding="utf-8")
+
+
+def read_recording(path: str) -> Iterator[Dict[str, Any]]:
+    with _open(path, "r") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class LLMRecorder:
+    """
+    Appends one JSON line per RealLLMClient completion attempt:
+        {"key", "role", "latency_ms", "prompt_tokens", "completion_tokens", "response" | "error"}
+    The response text is stored only the first time a key is seen, so repeated prompts cost a few bytes.
+    Hedged duplicates and failed attempts are recorded too (they are part of the latency/error profile).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._keys = {r["key"] for r in read_recording(path) if "response" in r} if os.path.exists(path) else set()
+        self._file = _open(path, "a")
+        self._lock = threading.Lock()
+        self.recorded = 0
+
+    def record(self, system_prompt: str, user_data: Dict[str, Any], latency_s: float,
+               response: Optional[str] = None, usage: Any = None, error: Optional[str] = None):
+        entry = {
+            "key": request_key(system_prompt, user_data),
+            "role": detect_role(system_prompt),
+            "latency_ms": round(latency_s * 1000, 1),
+            "prompt_tokens": getattr(usage, "prompt_tokens", None),
+            "completion_tokens": getattr(usage, "completion_tokens", None),
+        }
+        with self._lock:
+            if error is not None:
+                entry["error"] = error
+            elif entry["key"] not in self._keys:
+                self._keys.add(entry["key"])
+                entry["response"] = response
+            self._file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            self._file.flush()
+            self.recorded += 1
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class ReplayedError(Exception):
+    """A provider failure replayed from the recording."""
+
+
+class ReplayLLMClient(RealLLMClient):
+    """
+    Offline stand-in for RealLLMClient built from an LLMRecorder file.
+    Recorded responses are returned for matching requests after a replayed latency, and recorded
+    failures are replayed at their observed rate. Calls still go through ResilientCaller, so
+    hedging, deadlines and the breaker behave as they would against the provider. No network needed.
+    """
+
+    def __init__(self, path: str, latency: str = REPLAY_LATENCY, time_scale: float = REPLAY_TIME_SCALE,
+                 on_miss: str = REPLAY_ON_MISS, seed: int = REPLAY_SEED):
+        if latency not in LATENCY_MODES:
+            raise ValueError(f"latency must be one of {LATENCY_MODES}")
+        self.resilience = ResilientCaller()
+        self.client = None
+        self.model = "replay"
+        self.recorder = None
+        self.path = path
+        self.latency = latency
+        self.time_scale = time_scale
+        self.on_miss = on_miss
+        self._mock = MockLLMClient()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+        # key -> response text; key / role -> [(latency_s, error)] samples; key -> (prompt, completion) tokens
+        self.responses: Dict[str, str] = {}
+        self.samples: Dict[str, List[Tuple[float, Optional[str]]]] = {}
+        self.role_samples: Dict[str, List[Tuple[float, Optional[str]]]] = {}
+        self.tokens: Dict[str, Tuple[int, int]] = {}
+        self._cursor: Dict[str, int] = {}
+        for r in read_recording(path):
+            sample = (r["latency_ms"] / 1000, r.get("error"))
+            self.samples.setdefault(r["key"], []).append(sample)
+            self.role_samples.setdefault(r["role"], []).append(sample)
+            if "response" in r:
+                self.responses[r["key"]] = r["response"]
+            if r.get("prompt_tokens") is not None and r.get("error") is None:
+                self.tokens[r["key"]] = (r["prompt_tokens"], r.get("completion_tokens") or 0)
+        self._all_samples = [s for samples in self.role_samples.values() for s in samples]
+        self.stats = {"hits": 0, "misses": 0, "replayed_errors": 0, "replayed_latency_s": 0.0,
+                      "prompt_tokens": 0, "completion_tokens": 0}
+
+    def _draw(self, key: str, role: str) -> Tuple[float, Optional[str]]:
+        """(latency_s, error) for one call."""
+        if self.latency == "none":
+            return 0.0, None
+        with self._lock:
+            own = self.samples.get(key)
+            if self.latency == "recorded" and own:
+                i = self._cursor.get(key, 0)
+                self._cursor[key] = i + 1
+                return own[i % len(own)]
+            pool = self.role_samples.get(role) or self._all_samples
+            return self._rng.choice(pool) if pool else (0.0, None)
+
+    @profiler.staged("llm.complete")
+    def _complete(self, system_prompt: str, user_data: Dict[str, Any]) -> Any:
+        key = request_key(system_prompt, user_data)
+        role = detect_role(system_prompt)
+        latency_s, error = self._draw(key, role)
+        if latency_s:
+            time.sleep(latency_s * self.time_scale)
+        self.stats["replayed_latency_s"] += latency_s * self.time_scale
+        if error is not None:
+            self.stats["replayed_errors"] += 1
+            raise ReplayedError(f"replayed {error}")
+
+        response = self.responses.get(key)
+        if response is None:
+            self.stats["misses"] += 1
+            if self.on_miss == "error":
+                raise KeyError(f"No recorded response for {role} request {key}")
+            return self._mock.generate(system_prompt, user_data)
+
+        self.stats["hits"] += 1
+        prompt_tokens, completion_tokens = self.tokens.get(key, (0, 0))
+        self.stats["prompt_tokens"] += prompt_tokens
+        self.stats["completion_tokens"] += completion_tokens
+        # Parsed per call, like a live response (callers mutate the result)
+        return json.loads(response)
+
+    def chat(self, query: str, context: Dict) -> str:
+        # Chat traffic isn't recorded
+        return self._mock.chat(query, context)
+
+    def chat_stream(self, query: str, context: Dict) -> Iterator[str]:
+        return self._mock.chat_stream(query, context)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "replayed_latency_s": round(self.stats["replayed_latency_s"], 3),
+            "recorded_requests": len(self.responses),
+            "recorded_samples": len(self._all_samples),
+            "latency_mode": self.latency,
+            "time_scale": self.time_scale,
+            "resilience": self.resilience.get_stats(),
+        }
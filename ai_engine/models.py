@@ -1,16 +1,17 @@
 from pydantic import BaseModel, Field
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Union, Literal
 
 class EvaluationRequest(BaseModel):
     influencer: Dict[str, Any]
     campaign: Dict[str, Any]
 
+# Constraints mirror shared-schemas/KPIResult.json and DecisionSummary.json
 class KPIOutput(BaseModel):
     kpi_id: str
-    value: Any
-    score_normalized: float
+    value: Union[int, float, str]
+    score_normalized: float = Field(..., ge=0, le=100)
     explanation: str
-    confidence_score: float
+    confidence_score: float = Field(..., ge=0, le=1)
 
 class AnalysisReport(BaseModel):
     headline: str
@@ -22,12 +23,17 @@ class AnalysisReport(BaseModel):
 
 class AnalystResponse(BaseModel):
     role: str
-    kpis: List[KPIOutput]
+    kpis: List[KPIOutput] = Field(..., min_length=1)
     analysis: AnalysisReport
 
+class ROIPrediction(BaseModel):
+    min: float
+    max: float
+    confidence: Optional[float] = None
+
 class ExecutiveResponse(BaseModel):
-    decision: str
-    roi_prediction: Dict[str, float]
-    risk_level: str
+    decision: Literal["GO", "NO-GO", "TEST"]
+    roi_prediction: ROIPrediction
+    risk_level: Literal["LOW", "MEDIUM", "HIGH"]
     executive_summary: str
-    top_flags: List[str]
+    top_flags: List[str] = []
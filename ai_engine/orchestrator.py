@@ -1,22 +1,98 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
+import hashlib
 import os
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
 from ai_engine.models import KPIOutput, AnalystResponse, ExecutiveResponse
-from ai_engine.llm_client import llm_client
+from ai_engine.llm_client import llm_client, MockLLMClient
+from ai_engine.prompt_context import parse_prompt, project, serialize, count_tokens
+from ai_engine.decision_rules import decision_rules
+from ai_engine.output_validation import output_validator
+from ai_engine.profiling import profiler
+
+# When the rules engine settles a decision, optionally still ask the LLM for the narrative summary
+EXEC_NARRATIVE_VIA_LLM = os.environ.get("EXEC_NARRATIVE_VIA_LLM", "0") == "1"
+# Concurrent LLM calls per batch in evaluate_matrix (remote client only; the mock is CPU-bound)
+MATRIX_MAX_WORKERS = int(os.environ.get("MATRIX_MAX_WORKERS", 8))
+# HISTORY_CONTEXT=0 leaves the rolling history aggregates out of the analysts' context
+HISTORY_CONTEXT = os.environ.get("HISTORY_CONTEXT", "1") != "0"
+# RISK_SIGNAL_CONTEXT=0 leaves the streaming bot / spike detector scores out of the risk analyst's context
+RISK_SIGNAL_CONTEXT = os.environ.get("RISK_SIGNAL_CONTEXT", "1") != "0"
+# Directory of the role prompts (<role>.txt); reload_prompts() picks up edits without a restart
+PROMPT_DIR = os.environ.get("PROMPT_DIR") or os.path.join(os.path.dirname(__file__), "prompts")
+
+ANALYST_ROLES = ["performance_analyst", "risk_analyst", "audience_strategist"]
 
 class Orchestrator:
-    def __init__(self):
-        self.prompts = self._load_prompts()
+    def __init__(self, project_context: bool = True, prompt_dir: str = PROMPT_DIR):
+        # project_context=False sends every role the full context (pre-projection behaviour, kept for benchmarks)
+        self.project_context = project_context
+        self.prompt_dir = prompt_dir
+        self._load_prompts()
+        self.token_stats: Dict[str, Dict[str, int]] = {}
 
-    def _load_prompts(self) -> Dict[str, str]:
-        prompts = {}
-        prompt_dir = os.path.join(os.path.dirname(__file__), "prompts")
-        for filename in os.listdir(prompt_dir):
+    def _load_prompts(self):
+        prompts, fields, digests = {}, {}, {}
+        for filename in sorted(os.listdir(self.prompt_dir)):
             if filename.endswith(".txt"):
                 name = filename.replace(".txt", "")
-                with open(os.path.join(prompt_dir, filename), "r") as f:
-                    prompts[name] = f.read()
-        return prompts
+                with open(os.path.join(self.prompt_dir, filename), "r") as f:
+                    text = f.read()
+                # Each prompt declares the context fields it reads (CONTEXT_FIELDS line)
+                prompts[name], fields[name] = parse_prompt(text)
+                digests[name] = hashlib.sha256(text.encode()).hexdigest()[:12]
+        self.prompts, self.prompt_fields, self.prompt_digests = prompts, fields, digests
+        self.prompt_tokens = {name: count_tokens(text) for name, text in prompts.items()}
+        # Analysts whose projection has no campaign.* field: evaluate_matrix runs them once per influencer
+        self.shared_roles = [role for role in ANALYST_ROLES if role in prompts and not self.campaign_dependent(role)]
+        # Everything every evaluation depends on: the model and the prompts always sent (the analysts').
+        # The executive decider prompt is only read for some evaluations: recorded per result instead
+        self.cache_version = hashlib.sha256(
+            "|".join([getattr(llm_client, "model", "mock")] + [digests.get(role, "") for role in ANALYST_ROLES]).encode()
+        ).hexdigest()[:12]
+
+    def reload_prompts(self) -> List[str]:
+        """Re-reads the prompt files; returns the roles whose prompt changed (or was added / removed)."""
+        old = self.prompt_digests
+        self._load_prompts()
+        return sorted(role for role in old.keys() | self.prompt_digests.keys() if old.get(role) != self.prompt_digests.get(role))
+
+    def is_current(self, result: Dict[str, Any]) -> bool:
+        """True if every prompt the result was produced with is still the loaded version."""
+        versions = result.get("prompt_versions") if isinstance(result, dict) else None
+        return isinstance(versions, dict) and all(self.prompt_digests.get(role) == d for role, d in versions.items())
+
+    def _project(self, role: str, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Projects the context down to the fields the role's prompt declares."""
+        return project(context, self.prompt_fields.get(role, [])) if self.project_context else context
+
+    def _record_tokens(self, role: str, role_context: Dict[str, Any]):
+        tokens = self.prompt_tokens[role] + count_tokens(serialize(role_context))
+        stats = self.token_stats.setdefault(role, {"calls": 0, "total_input_tokens": 0, "last_input_tokens": 0})
+        stats["calls"] += 1
+        stats["total_input_tokens"] += tokens
+        stats["last_input_tokens"] = tokens
+
+    def _role_context(self, role: str, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Projects the context for a role and records its input size."""
+        role_context = self._project(role, context)
+        self._record_tokens(role, role_context)
+        return role_context
+
+    def campaign_dependent(self, role: str) -> bool:
+        """A role's output depends on the campaign iff its prompt reads campaign fields (or it gets the full context)."""
+        if not self.project_context:
+            return True
+        return any(f == "campaign" or f.startswith("campaign.") for f in self.prompt_fields.get(role, []))
+
+    def get_token_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Estimated LLM input tokens (system prompt + serialized context) per role."""
+        return {
+            role: {**stats, "avg_input_tokens": round(stats["total_input_tokens"] / stats["calls"], 1)}
+            for role, stats in self.token_stats.items() if stats["calls"]
+        }
 
+    @profiler.staged("orchestrator.evaluate")
     def evaluate(self, influencer: Dict[str, Any], campaign: Dict[str, Any]) -> Dict[str, Any]:
         """
         Main entry point. 
@@ -25,31 +101,102 @@ class Orchestrator:
         3. Calls Executive Decider.
         4. Returns combined response.
         """
+        digests = self.prompt_digests  # versions in effect when the evaluation starts
+        with profiler.stage("context"):
+            context = self._build_context(influencer, campaign)
+
+        # 1. Analyst Phase (In a real system, these would be async/parallel)
+        # Each analyst only receives the fields its prompt declares; outputs are schema-checked
+        perf_data = self._generate("performance_analyst", self._role_context("performance_analyst", context))
+        risk_data = self._generate("risk_analyst", self._role_context("risk_analyst", context))
+        aud_data = self._generate("audience_strategist", self._role_context("audience_strategist", context))
+
+        # 2. Aggregation
+        all_kpis, exec_context = self._aggregate(context, perf_data, risk_data, aud_data)
+
+        # 3. Executive Phase
+        # Clear-cut cases are decided locally by the rules engine; only borderline ones need the LLM
+        with profiler.stage("decision_rules"):
+            decision = decision_rules.decide(all_kpis, context)
+        roles = list(ANALYST_ROLES)
+        if decision is None:
+            decision_rules.record("llm")
+            roles.append("executive_decider")
+            decision = self._generate("executive_decider", self._role_context("executive_decider", exec_context))
+            if isinstance(decision, dict):
+                decision["decision_source"] = "llm"
+        else:
+            decision_rules.record("local")
+            if EXEC_NARRATIVE_VIA_LLM:
+                roles.append("executive_decider")
+                narrative = self._generate("executive_decider", self._role_context("executive_decider", exec_context))
+                if isinstance(narrative, dict) and narrative.get("executive_summary"):
+                    decision["executive_summary"] = narrative["executive_summary"]
+
+        # 4. Final Package
+        output_validator.record_evaluations()
+        return self._package(influencer, campaign, context, all_kpis, [perf_data, risk_data, aud_data], decision,
+                             {role: digests.get(role) for role in roles})
+
+    def _generate(self, role: str, role_context: Dict[str, Any]) -> Any:
+        """One LLM call, validated against the role's output schema."""
+        with profiler.stage(role):
+            output = llm_client.generate(self.prompts[role], role_context)
+            with profiler.stage("validate"):
+                errors = output_validator.errors(role, output)
+            return self._resolve(role, role_context, output, errors) if errors else output
+
+    def _resolve(self, role: str, role_context: Dict[str, Any], output: Any, errors: List[str]) -> Any:
+        """Repairs or re-asks only the failing role; the deterministic mock is the last resort (flagged degraded)."""
+        def fallback():
+            result = MockLLMClient().generate(self.prompts[role], role_context)
+            if isinstance(result, dict):
+                result["degraded"] = True
+            return result
+
+        return output_validator.resolve(
+            role, output, errors,
+            reask=lambda feedback: llm_client.generate(self.prompts[role] + feedback, role_context),
+            fallback=fallback
+        )
+
+    def _build_context(self, influencer: Dict[str, Any], campaign: Dict[str, Any]) -> Dict[str, Any]:
         # Content Type is critical for the new 5-signal matrix
         # We prefer the context stored in the influencer object as it is passed from the router/generator
-        c_type = influencer.get("content_type_context", "all") 
-        
-        context = {
+        return {
             "influencer": influencer,
             "campaign": campaign,
             "detailed_metrics": influencer.get("detailed_metrics", {}),
-            "content_type": c_type
+            "content_type": influencer.get("content_type_context", "all"),
+            "history": self._history(influencer),
+            "risk_signals": self._risk_signals(influencer)
         }
 
-        # 1. Analyst Phase (In a real system, these would be async/parallel)
-        perf_data = llm_client.generate(self.prompts["performance_analyst"], context)
-        risk_data = llm_client.generate(self.prompts["risk_analyst"], context)
-        aud_data = llm_client.generate(self.prompts["audience_strategist"], context)
+    def _history(self, influencer: Dict[str, Any]) -> Any:
+        """30d/90d rolling aggregates of the influencer's daily history (None for profiles without metrics)."""
+        if not HISTORY_CONTEXT or not influencer.get("id"):
+            return None
+        from backend.services.timeseries import history_store # Lazy import, same as the mock's baselines
+        try:
+            return history_store.summary(influencer)
+        except (KeyError, TypeError):
+            return None
 
-        # 2. Aggregation
-        # Extract KPIs from the new structured response
+    def _risk_signals(self, influencer: Dict[str, Any]) -> Any:
+        """Bot-inflation / spike scores of the influencer's event stream (None for profiles without metrics)."""
+        if not RISK_SIGNAL_CONTEXT or not influencer.get("id"):
+            return None
+        from backend.services.risk_signals import risk_monitor # Lazy import, same as the mock's baselines
+        try:
+            return risk_monitor.profile_scores(influencer)
+        except (KeyError, TypeError):
+            return None
+
+    def _aggregate(self, context: Dict[str, Any], perf_data: Dict, risk_data: Dict, aud_data: Dict) -> Tuple[List[Dict], Dict[str, Any]]:
+        """All KPIs plus the executive's input context."""
         perf_kpis = perf_data.get("kpis", [])
         risk_kpis = risk_data.get("kpis", [])
         aud_kpis = aud_data.get("kpis", [])
-        
-        all_kpis = perf_kpis + risk_kpis + aud_kpis
-
-        # 3. Executive Phase
         exec_context = {
             "analyst_reports": {
                 "performance": perf_kpis,
@@ -58,18 +205,112 @@ class Orchestrator:
             },
             **context
         }
-        
-        decision = llm_client.generate(self.prompts["executive_decider"], exec_context)
+        return perf_kpis + risk_kpis + aud_kpis, exec_context
 
-        # 4. Final Package
+    def _package(self, influencer: Dict[str, Any], campaign: Dict[str, Any], context: Dict[str, Any],
+                 all_kpis: List[Dict], reports: List[Dict], decision: Dict[str, Any],
+                 prompt_versions: Dict[str, str]) -> Dict[str, Any]:
+        perf_data, risk_data, aud_data = reports
         return {
             "decision_summary": decision,
             "kpis": all_kpis,
-            "analyst_reports": [perf_data, risk_data, aud_data],
+            "analyst_reports": reports,
             "influencer_id": influencer.get("id"),
             "campaign_id": campaign.get("id"),
+            "content_type": context["content_type"],
             "niche": influencer.get("niche", "General"),
-            "goal": campaign.get("objective", "Awareness") # changed from 'goal' to 'objective' based on common Campaign schema
+            "goal": campaign.get("objective", "Awareness"), # changed from 'goal' to 'objective' based on common Campaign schema
+            # True if any stage was served by the degraded-mode fallback instead of the LLM
+            "degraded": any(isinstance(d, dict) and d.get("degraded") for d in (perf_data, risk_data, aud_data, decision)),
+            # Digest of every prompt the result was produced with (targeted cache invalidation on prompt edits)
+            "prompt_versions": prompt_versions
+        }
+
+    def _run_calls(self, calls: List[Tuple[str, Dict[str, Any]]]) -> List[Any]:
+        """
+        One batch of (role, role_context) LLM calls. Concurrent for a remote client, inline for the mock.
+        The whole batch is validated in one pass; only failing calls are repaired or re-asked.
+        """
+        for role, role_context in calls:
+            self._record_tokens(role, role_context)
+        run = lambda call: llm_client.generate(self.prompts[call[0]], call[1])
+        if isinstance(llm_client, MockLLMClient) or len(calls) < 2:
+            outputs = [run(call) for call in calls]
+        else:
+            with ThreadPoolExecutor(max_workers=min(MATRIX_MAX_WORKERS, len(calls))) as pool:
+                # Each call runs in a copy of this context (request profiling stages)
+                futures = [pool.submit(copy_context().run, run, call) for call in calls]
+                outputs = [future.result() for future in futures]
+
+        failures = output_validator.errors_many([role for role, _ in calls], outputs)
+        for i, errors in failures.items():
+            role, role_context = calls[i]
+            outputs[i] = self._resolve(role, role_context, outputs[i], errors)
+        return outputs
+
+    @profiler.staged("orchestrator.evaluate_matrix")
+    def evaluate_matrix(self, influencers: List[Dict[str, Any]], campaigns: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Evaluates every influencer x campaign pair (same per-pair result as evaluate()).
+        Roles whose prompt reads no campaign fields run once per influencer rather than once per pair;
+        each stage is sent as one batch of LLM calls.
+        """
+        digests = self.prompt_digests
+        pairs = [(i, j) for i in range(len(influencers)) for j in range(len(campaigns))]
+        contexts = {(i, j): self._build_context(influencers[i], campaigns[j]) for i, j in pairs}
+        shared_roles = self.shared_roles
+        slot_key = lambda role, i, j: (role, i, None if role in shared_roles else j)
+
+        # 1. Analyst Phase: one batch for all pairs and roles
+        calls, slots = [], {}
+        for i, j in pairs:
+            for role in ANALYST_ROLES:
+                key = slot_key(role, i, j)
+                if key not in slots:
+                    slots[key] = len(calls)
+                    calls.append((role, self._project(role, contexts[(i, j)])))
+        with profiler.stage("analysts"):
+            outputs = self._run_calls(calls)
+        reports = {(i, j): [outputs[slots[slot_key(role, i, j)]] for role in ANALYST_ROLES] for i, j in pairs}
+
+        # 2. Aggregation + local decisions
+        aggregated = {pair: self._aggregate(contexts[pair], *reports[pair]) for pair in pairs}
+        decisions = {}
+        for pair in pairs:
+            decisions[pair] = decision_rules.decide(aggregated[pair][0], contexts[pair])
+            decision_rules.record("llm" if decisions[pair] is None else "local")
+
+        # 3. Executive Phase: one batch for the borderline pairs (and narratives, if enabled)
+        exec_pairs = [pair for pair in pairs if decisions[pair] is None or EXEC_NARRATIVE_VIA_LLM]
+        with profiler.stage("executive_decider"):
+            exec_outputs = self._run_calls([("executive_decider", self._project("executive_decider", aggregated[pair][1])) for pair in exec_pairs])
+        for pair, output in zip(exec_pairs, exec_outputs):
+            if decisions[pair] is None:
+                decisions[pair] = dict(output) if isinstance(output, dict) else output
+                if isinstance(decisions[pair], dict):
+                    decisions[pair]["decision_source"] = "llm"
+            elif isinstance(output, dict) and output.get("executive_summary"):
+                decisions[pair]["executive_summary"] = output["executive_summary"]
+
+        # 4. Final Package
+        output_validator.record_evaluations(len(pairs))
+        results = [[None] * len(campaigns) for _ in influencers]
+        exec_set = set(exec_pairs)
+        for i, j in pairs:
+            all_kpis = aggregated[(i, j)][0]
+            roles = ANALYST_ROLES + (["executive_decider"] if (i, j) in exec_set else [])
+            results[i][j] = self._package(influencers[i], campaigns[j], contexts[(i, j)], all_kpis,
+                                          list(reports[(i, j)]), decisions[(i, j)],
+                                          {role: digests.get(role) for role in roles})
+        return {
+            "results": results,
+            # Dense views: mean normalized KPI score and the executive decision per pair
+            "scores": [[round(sum(k.get("score_normalized", 0) for k in r["kpis"]) / max(1, len(r["kpis"])), 1) for r in row] for row in results],
+            "decisions": [[r["decision_summary"].get("decision") if isinstance(r["decision_summary"], dict) else None for r in row] for row in results],
+            "shared_roles": shared_roles,
+            "llm_calls": len(calls) + len(exec_pairs),
+            # What N x M independent evaluate() calls would have made
+            "unbatched_llm_calls": len(pairs) * len(ANALYST_ROLES) + len(exec_pairs),
         }
 
 # Global instance
@@ -0,0 +1,210 @@
+import os
+import re
+import threading
+import time
+from typing import Dict, Any, List, Optional, Callable
+
+from pydantic import TypeAdapter, ValidationError
+
+from ai_engine.models import AnalystResponse, ExecutiveResponse
+
+# Re-asks of a failing role (with the validation errors appended to its prompt) before falling back
+VALIDATION_REASKS = int(os.environ.get("LLM_VALIDATION_REASKS", 1))
+# Target validation cost per evaluation (reported by get_stats, not enforced)
+VALIDATION_BUDGET_US = float(os.environ.get("VALIDATION_BUDGET_US", 200))
+# Errors quoted back to the model on a re-ask
+MAX_REPORTED_ERRORS = 5
+
+EXECUTIVE_ROLE = "executive_decider"
+
+# Built once: pydantic compiles each adapter's validator up front
+_ANALYST = TypeAdapter(AnalystResponse)
+_EXECUTIVE = TypeAdapter(ExecutiveResponse)
+
+# KPI values that downstream code parses (chat context builder, decision rules)
+PERCENT_VALUE = re.compile(r"\d+(\.\d+)?%")
+KPI_VALUE_RULES = {
+    "avg_percentage_viewed": "percent",
+    "controversy_probability": "percent",
+    "fake_follower_probability": "percent",
+    "audience_brand_fit": "percent",
+    "predicted_impressions": "number",
+    "predicted_saves": "number",
+    "promo_code_redemptions": "number",
+    "brand_safety_score": "number",
+}
+
+DECISION_ALIASES = {"NOGO": "NO-GO", "NO_GO": "NO-GO", "NO GO": "NO-GO"}
+RISK_ALIASES = {"MED": "MEDIUM", "MODERATE": "MEDIUM"}
+
+
+def _format_errors(e: ValidationError) -> List[str]:
+    return [f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()]
+
+
+def _value_errors(output: Dict[str, Any]) -> List[str]:
+    errors = []
+    for i, kpi in enumerate(output.get("kpis", [])):
+        rule = KPI_VALUE_RULES.get(kpi.get("kpi_id"))
+        value = kpi.get("value")
+        if rule == "percent" and not (isinstance(value, str) and PERCENT_VALUE.fullmatch(value)):
+            errors.append(f"kpis.{i}.value: {kpi['kpi_id']} must be a percentage string like '42%'")
+        elif rule == "number" and (isinstance(value, bool) or not isinstance(value, (int, float))):
+            errors.append(f"kpis.{i}.value: {kpi['kpi_id']} must be a number")
+    return errors
+
+
+def _number(value: Any) -> Optional[float]:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    try:
+        return float(str(value).replace(",", "").rstrip("%").strip())
+    except ValueError:
+        return None
+
+
+def _clamp(value: Any, lo: float, hi: float) -> Any:
+    number = _number(value)
+    return value if number is None else min(max(number, lo), hi)
+
+
+def repair_analyst(output: Any) -> Optional[Dict[str, Any]]:
+    """Local fixes for common near-misses (numbers as strings, out-of-range scores, bare percentages)."""
+    if not isinstance(output, dict) or not isinstance(output.get("kpis"), list):
+        return None
+    kpis = []
+    for kpi in output["kpis"]:
+        if not isinstance(kpi, dict) or not kpi.get("kpi_id"):
+            continue  # unusable entry; the rest of the report is kept
+        kpi = dict(kpi)
+        kpi["score_normalized"] = _clamp(kpi.get("score_normalized"), 0, 100)
+        confidence = _number(kpi.get("confidence_score"))
+        if confidence is not None:
+            kpi["confidence_score"] = min(max(confidence / 100 if confidence > 1 else confidence, 0), 1)
+        kpi.setdefault("explanation", "")
+        rule = KPI_VALUE_RULES.get(kpi["kpi_id"])
+        number = _number(kpi.get("value"))
+        if rule == "percent" and number is not None:
+            # A bare fraction (0.42) is read as a ratio, anything else as percentage points
+            if isinstance(kpi.get("value"), float) and 0 < number < 1:
+                number = round(number * 100, 1)
+            kpi["value"] = f"{number:g}%"
+        elif rule == "number" and number is not None:
+            kpi["value"] = int(number) if float(number).is_integer() else number
+        kpis.append(kpi)
+    return {**output, "kpis": kpis}
+
+
+def repair_executive(output: Any) -> Optional[Dict[str, Any]]:
+    """Normalizes enum spelling and numeric strings in an executive decision."""
+    if not isinstance(output, dict):
+        return None
+    output = dict(output)
+    if isinstance(output.get("decision"), str):
+        decision = output["decision"].strip().upper()
+        output["decision"] = DECISION_ALIASES.get(decision, decision)
+    if isinstance(output.get("risk_level"), str):
+        risk = output["risk_level"].strip().upper()
+        output["risk_level"] = RISK_ALIASES.get(risk, risk)
+    if isinstance(output.get("roi_prediction"), dict):
+        output["roi_prediction"] = {k: _number(v) if _number(v) is not None else v for k, v in output["roi_prediction"].items()}
+    if output.get("top_flags") is None:
+        output["top_flags"] = []
+    return output
+
+
+class OutputValidator:
+    """
+    Schema checks on analyst and executive outputs at the orchestrator boundary.
+    A failing output is repaired locally if possible, otherwise only that role is re-asked
+    (VALIDATION_REASKS times) and finally served by the degraded-mode fallback.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stats = {"checked": 0, "invalid": 0, "repaired": 0, "reasked": 0, "fallback": 0,
+                      "evaluations": 0, "validation_s": 0.0}
+        self.invalid_by_role: Dict[str, int] = {}
+
+    def _timed(self, seconds: float, checked: int):
+        with self._lock:
+            self.stats["validation_s"] += seconds
+            self.stats["checked"] += checked
+
+    def errors(self, role: str, output: Any) -> List[str]:
+        """Validation errors of one role output (empty if valid)."""
+        t0 = time.perf_counter()
+        errors = self._errors(role, output)
+        self._timed(time.perf_counter() - t0, 1)
+        return errors
+
+    def _errors(self, role: str, output: Any) -> List[str]:
+        if not isinstance(output, dict):
+            return ["output is not a JSON object"]
+        try:
+            (_EXECUTIVE if role == EXECUTIVE_ROLE else _ANALYST).validate_python(output)
+        except ValidationError as e:
+            return _format_errors(e)
+        return [] if role == EXECUTIVE_ROLE else _value_errors(output)
+
+    def errors_many(self, roles: List[str], outputs: List[Any]) -> Dict[int, List[str]]:
+        """
+        Bulk path for batches: one pass over the batch with one timing/stats update, returning
+        {index: errors} for the failures only. Outputs are validated one by one against the
+        precompiled adapters; validating the batch as a single List[...] was measured slower
+        (every model instance stays alive until the whole list is built).
+        """
+        t0 = time.perf_counter()
+        failures = {}
+        for i, (role, output) in enumerate(zip(roles, outputs)):
+            errors = self._errors(role, output)
+            if errors:
+                failures[i] = errors
+        self._timed(time.perf_counter() - t0, len(outputs))
+        return failures
+
+    def resolve(self, role: str, output: Any, errors: List[str],
+                reask: Callable[[str], Any], fallback: Callable[[], Any]) -> Any:
+        """Turns an invalid output into a valid one: local repair, then re-ask this role, then fallback."""
+        with self._lock:
+            self.stats["invalid"] += 1
+            self.invalid_by_role[role] = self.invalid_by_role.get(role, 0) + 1
+
+        # 1. Local repair
+        repaired = repair_executive(output) if role == EXECUTIVE_ROLE else repair_analyst(output)
+        if repaired is not None and not self.errors(role, repaired):
+            self.stats["repaired"] += 1
+            return repaired
+
+        # 2. Re-ask only the failing role, quoting what was wrong
+        for _ in range(VALIDATION_REASKS):
+            self.stats["reasked"] += 1
+            feedback = ("\n\nYour previous reply failed validation:\n- " + "\n- ".join(errors[:MAX_REPORTED_ERRORS])
+                        + "\nReply again with a single JSON object that satisfies the required format.")
+            output = reask(feedback)
+            errors = self.errors(role, output)
+            if not errors:
+                return output
+
+        # 3. Degraded-mode fallback (flagged "degraded", like provider failures)
+        self.stats["fallback"] += 1
+        print(f"Invalid {role} output after {VALIDATION_REASKS} re-ask(s): {errors[:MAX_REPORTED_ERRORS]}")
+        return fallback()
+
+    def record_evaluations(self, count: int = 1):
+        with self._lock:
+            self.stats["evaluations"] += count
+
+    def get_stats(self) -> Dict[str, Any]:
+        evaluations = self.stats["evaluations"]
+        per_evaluation_us = self.stats["validation_s"] / evaluations * 1e6 if evaluations else 0.0
+        return {
+            **{k: v for k, v in self.stats.items() if k != "validation_s"},
+            "invalid_by_role": self.invalid_by_role,
+            "avg_validation_us_per_evaluation": round(per_evaluation_us, 1),
+            "budget_us_per_evaluation": VALIDATION_BUDGET_US,
+            "within_budget": per_evaluation_us <= VALIDATION_BUDGET_US,
+        }
+
+
+output_validator = OutputValidator()
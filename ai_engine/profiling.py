@@ -0,0 +1,235 @@
+import functools
+import itertools
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import nullcontext
+from contextvars import ContextVar
+from typing import Dict, Any, List, Optional, Tuple
+
+# Opt-in: PROFILING=1 enables request tracking, sampling and slow-request capture
+PROFILING_ENABLED = os.environ.get("PROFILING", "0") == "1"
+# Fraction of requests profiled from their start (X-Profile: 1 forces it for one request)
+PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", 0.01))
+# Requests slower than this are kept; unsampled ones still running past it are sampled from then on
+PROFILE_SLOW_MS = float(os.environ.get("PROFILE_SLOW_MS", 500))
+PROFILE_INTERVAL_MS = float(os.environ.get("PROFILE_INTERVAL_MS", 5))
+# Slow-request profiles kept (oldest dropped first)
+PROFILE_RING_SIZE = int(os.environ.get("PROFILE_RING_SIZE", 50))
+STACK_DEPTH = 64
+TOP_STACKS = 20
+MAX_TIMELINE = 500
+
+_current: ContextVar[Optional["RequestProfile"]] = ContextVar("request_profile", default=None)
+_NO_STAGE = nullcontext()
+
+
+class RequestProfile:
+    """Stage timeline and sampled stacks of one tracked request."""
+
+    def __init__(self, profile_id: int, method: str, path: str, trigger: Optional[str]):
+        self.id = profile_id
+        self.method = method
+        self.path = path
+        self.trigger = trigger  # "header" | "rate" | "slow" (attached late) | None (not sampled)
+        self.sampling = trigger is not None
+        self.started = time.perf_counter()
+        self.attached_after_ms: Optional[float] = None
+        self.timeline: List[Tuple[str, float, float]] = []
+        self.samples: Counter = Counter()  # (stage path, stack) -> samples
+        self.duration_ms = 0.0
+        self.status = 0
+
+    def summary(self, interval_ms: float) -> Dict[str, Any]:
+        by_stage: Counter = Counter()
+        for (stage, _), n in self.samples.items():
+            by_stage[stage] += n
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "status": self.status,
+            "duration_ms": round(self.duration_ms, 1),
+            "trigger": self.trigger,
+            "attached_after_ms": self.attached_after_ms,
+            "interval_ms": interval_ms,
+            "samples": sum(self.samples.values()),
+            "stages": [{"stage": s, "start_ms": round(t0, 2), "duration_ms": round(d, 2)} for s, t0, d in sorted(self.timeline, key=lambda t: t[1])],
+            "samples_by_stage": dict(by_stage.most_common()),
+            "top_stacks": [{"stage": s, "stack": list(stack), "samples": n} for (s, stack), n in self.samples.most_common(TOP_STACKS)],
+        }
+
+    def collapsed(self) -> str:
+        """Folded stacks ("stage;frame;...;frame count" per line) for flame graph tools."""
+        return "\n".join(f"{';'.join((stage, *stack))} {n}" for (stage, stack), n in self.samples.items())
+
+
+class _Stage:
+    """Annotated pipeline step of a tracked request: timed, and sampled stacks are attributed to it."""
+    __slots__ = ("profiler", "profile", "name", "thread", "t0")
+
+    def __init__(self, profiler: "Profiler", profile: RequestProfile, name: str):
+        self.profiler = profiler
+        self.profile = profile
+        self.name = name
+
+    def __enter__(self):
+        self.thread = threading.get_ident()
+        stack = self.profiler._threads.setdefault(self.thread, [])
+        outer = stack[-1][1] if stack and stack[-1][0] is self.profile else None
+        stack.append((self.profile, f"{outer}>{self.name}" if outer else self.name))
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        t1 = time.perf_counter()
+        stack = self.profiler._threads[self.thread]
+        _, path = stack.pop()
+        if not stack:
+            del self.profiler._threads[self.thread]
+        if len(self.profile.timeline) < MAX_TIMELINE:
+            self.profile.timeline.append((path, (self.t0 - self.profile.started) * 1000, (t1 - self.t0) * 1000))
+        return False
+
+
+class Profiler:
+    """
+    Opt-in statistical profiler for requests. One sampler thread snapshots the stacks of threads
+    currently inside an annotated stage of a sampled request (sys._current_frames, every interval),
+    so unsampled requests only pay for stage bookkeeping. Requests slower than slow_ms are kept in a
+    ring buffer; unsampled ones are sampled from the moment they cross the threshold.
+    """
+
+    def __init__(self, enabled: bool = PROFILING_ENABLED, sample_rate: float = PROFILE_SAMPLE_RATE,
+                 slow_ms: float = PROFILE_SLOW_MS, interval_ms: float = PROFILE_INTERVAL_MS,
+                 ring_size: int = PROFILE_RING_SIZE):
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self.interval_ms = interval_ms
+        self.slow: deque = deque(maxlen=ring_size)
+        self._ids = itertools.count(1)
+        self._inflight: Dict[int, RequestProfile] = {}
+        self._threads: Dict[int, List[Tuple[RequestProfile, str]]] = {}
+        self._labels: Dict[Any, str] = {}
+        self._sampler: Optional[threading.Thread] = None
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self.stats = {"tracked": 0, "sampled": 0, "attached_slow": 0, "captured": 0, "samples": 0, "sampler_ms": 0.0}
+
+    def stage(self, name: str):
+        """Context manager marking a pipeline step; a no-op outside tracked requests."""
+        profile = _current.get()
+        return _NO_STAGE if profile is None else _Stage(self, profile, name)
+
+    def staged(self, name: str):
+        """Decorator form of stage()."""
+        def decorate(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.stage(name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def begin(self, method: str, path: str, forced: bool = False) -> RequestProfile:
+        trigger = "header" if forced else "rate" if random.random() < self.sample_rate else None
+        profile = RequestProfile(next(self._ids), method, path, trigger)
+        self._inflight[profile.id] = profile
+        self.stats["tracked"] += 1
+        self.stats["sampled"] += profile.sampling
+        if profile.sampling:
+            self._wake.set()
+        if self._sampler is None:
+            with self._lock:
+                if self._sampler is None:
+                    self._sampler = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+                    self._sampler.start()
+        return profile
+
+    def activate(self, profile: RequestProfile):
+        """Makes profile the current request for stages in this context (and contexts copied from it)."""
+        return _current.set(profile)
+
+    def deactivate(self, token):
+        _current.reset(token)
+
+    def end(self, profile: RequestProfile, status: int):
+        profile.duration_ms = (time.perf_counter() - profile.started) * 1000
+        profile.status = status
+        profile.sampling = False  # e.g. a losing hedged LLM attempt still running
+        self._inflight.pop(profile.id, None)
+        if profile.trigger == "header" or profile.duration_ms >= self.slow_ms:
+            self.slow.append(profile)
+            self.stats["captured"] += 1
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = f"{code.co_name} ({os.path.basename(code.co_filename)})"
+        return label
+
+    def _sample(self):
+        frames = sys._current_frames()
+        for thread, stack in list(self._threads.items()):
+            if not stack:
+                continue
+            profile, path = stack[-1]
+            frame = frames.get(thread)
+            if not profile.sampling or frame is None:
+                continue
+            labels = []
+            while frame is not None and len(labels) < STACK_DEPTH:
+                labels.append(self._label(frame.f_code))
+                frame = frame.f_back
+            profile.samples[(path, tuple(reversed(labels)))] += 1
+            self.stats["samples"] += 1
+
+    def _run(self):
+        while True:
+            t0 = time.perf_counter()
+            sampling = False
+            for profile in list(self._inflight.values()):
+                if not profile.sampling and (t0 - profile.started) * 1000 >= self.slow_ms:
+                    profile.sampling, profile.trigger = True, "slow"
+                    profile.attached_after_ms = round((t0 - profile.started) * 1000, 1)
+                    self.stats["attached_slow"] += 1
+                sampling = sampling or profile.sampling
+            if sampling:
+                self._sample()
+                self.stats["sampler_ms"] += (time.perf_counter() - t0) * 1000
+                time.sleep(self.interval_ms / 1000)
+            else:
+                # Idle: watch for requests crossing the slow threshold, wake up for sampled ones
+                self._wake.wait(max(self.interval_ms, self.slow_ms / 10) / 1000)
+                self._wake.clear()
+
+    def get(self, profile_id: int) -> Optional[RequestProfile]:
+        return next((p for p in self.slow if p.id == profile_id), None)
+
+    def list_slow(self) -> List[Dict[str, Any]]:
+        """Newest first, without stacks."""
+        return [{"id": p.id, "method": p.method, "path": p.path, "status": p.status, "duration_ms": round(p.duration_ms, 1),
+                 "trigger": p.trigger, "samples": sum(p.samples.values())} for p in reversed(self.slow)]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "sampler_ms": round(self.stats["sampler_ms"], 1),
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "slow_ms": self.slow_ms,
+            "interval_ms": self.interval_ms,
+            "in_flight": len(self._inflight),
+            "kept": len(self.slow),
+            "ring_size": self.slow.maxlen,
+        }
+
+    def clear(self):
+        self.slow.clear()
+
+# Global instance
+profiler = Profiler()
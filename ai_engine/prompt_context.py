@@ -0,0 +1,62 @@
+import json
+import math
+from typing import Dict, Any, List, Tuple
+
+# Optional exact tokenizer; otherwise we fall back to a chars/4 estimate
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("o200k_base")
+except Exception:
+    _ENCODING = None
+
+FIELDS_DIRECTIVE = "CONTEXT_FIELDS:"
+
+
+def parse_prompt(text: str) -> Tuple[str, List[str]]:
+    """
+    Splits a prompt file into (prompt text sent to the model, declared context fields).
+    Fields are dotted paths into the evaluation context, e.g. "detailed_metrics.brand_readiness".
+    A prompt without a CONTEXT_FIELDS line gets the full context (empty field list).
+    """
+    lines, fields = [], []
+    for line in text.splitlines():
+        if line.startswith(FIELDS_DIRECTIVE):
+            fields.extend(f.strip() for f in line[len(FIELDS_DIRECTIVE):].split(",") if f.strip())
+        else:
+            lines.append(line)
+    return "\n".join(lines).rstrip() + "\n", fields
+
+
+def project(context: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
+    """Copies only the declared dotted paths out of the context. Missing paths are skipped."""
+    if not fields:
+        return context
+
+    projected: Dict[str, Any] = {}
+    for path in fields:
+        keys = path.split(".")
+        source = context
+        for key in keys:
+            if not isinstance(source, dict) or key not in source:
+                source = None
+                break
+            source = source[key]
+        if source is None:
+            continue
+
+        target = projected
+        for key in keys[:-1]:
+            target = target.setdefault(key, {})
+        target[keys[-1]] = source
+    return projected
+
+
+def serialize(data: Any) -> str:
+    """Compact JSON for prompts: no indentation or padding whitespace."""
+    return json.dumps(data, separators=(",", ":"), default=str)
+
+
+def count_tokens(text: str) -> int:
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text))
+    return math.ceil(len(text) / 4)
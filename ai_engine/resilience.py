@@ -0,0 +1,179 @@
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from contextvars import copy_context
+from typing import Any, Callable, Dict, Optional
+
+from ai_engine.profiling import profiler
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the provider while the breaker is open."""
+
+
+class DeadlineExceeded(Exception):
+    """Raised when neither the primary nor the hedged request finished before the role deadline."""
+
+
+class LatencyTracker:
+    """Rolling window of observed call latencies (seconds) per role."""
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._samples: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def record(self, role: str, seconds: float):
+        with self._lock:
+            self._samples.setdefault(role, deque(maxlen=self.window)).append(seconds)
+
+    def percentile(self, role: str, pct: float) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples.get(role, ()))
+        if len(samples) < 10:
+            return None  # not enough data to trust a tail estimate yet
+        return samples[min(len(samples) - 1, int(pct / 100 * len(samples)))]
+
+
+class CircuitBreaker:
+    """
+    closed -> open after `failure_threshold` consecutive failures.
+    open -> half_open after `cooldown_s`; the next call is a recovery probe.
+    half_open -> closed on probe success, back to open on probe failure.
+    """
+
+    def __init__(self, failure_threshold: int = 5, cooldown_s: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.cooldown_s = cooldown_s
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.trips = 0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.cooldown_s:
+                self.state = "half_open"
+            if self.state == "half_open" and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def release(self):
+        """Ends a call without a verdict (e.g. its consumer stopped reading a stream); frees the probe slot."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+                if self.state != "open":
+                    self.trips += 1
+                self.state = "open"
+                self.opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+
+class ResilientCaller:
+    """
+    Tail-latency controls around a blocking provider call:
+    - per-role deadlines
+    - a hedged duplicate request once the primary is slower than the role's observed p<hedge_percentile>
+    - a shared circuit breaker
+    Late or losing attempts are abandoned (their threads finish in the background).
+    """
+
+    DEFAULT_DEADLINES_S = {
+        "performance_analyst": 20.0,
+        "risk_analyst": 20.0,
+        "audience_strategist": 20.0,
+        "executive_decider": 25.0,
+        "chat": 15.0,
+    }
+
+    def __init__(self):
+        self.hedge_percentile = float(os.environ.get("LLM_HEDGE_PERCENTILE", 95))
+        self.hedge_min_delay_s = float(os.environ.get("LLM_HEDGE_MIN_DELAY_MS", 500)) / 1000
+        default_deadline = os.environ.get("LLM_DEADLINE_S")
+        self.deadlines_s = {
+            role: float(default_deadline) if default_deadline else d
+            for role, d in self.DEFAULT_DEADLINES_S.items()
+        }
+        self.latency = LatencyTracker()
+        self.breaker = CircuitBreaker(
+            failure_threshold=int(os.environ.get("LLM_BREAKER_FAILURES", 5)),
+            cooldown_s=float(os.environ.get("LLM_BREAKER_COOLDOWN_S", 30)),
+        )
+        self.executor = ThreadPoolExecutor(max_workers=int(os.environ.get("LLM_MAX_WORKERS", 32)), thread_name_prefix="llm")
+        self.stats = {"calls": 0, "hedges": 0, "hedge_wins": 0, "deadline_exceeded": 0, "errors": 0, "short_circuited": 0}
+
+    def _hedge_delay(self, role: str) -> float:
+        observed = self.latency.percentile(role, self.hedge_percentile)
+        return max(self.hedge_min_delay_s, observed) if observed is not None else self.hedge_min_delay_s
+
+    def call(self, role: str, fn: Callable[[], Any]) -> Any:
+        """Runs fn under the role's deadline with hedging. Raises on failure; never returns mock data."""
+        if not self.breaker.allow():
+            self.stats["short_circuited"] += 1
+            raise CircuitOpenError("LLM circuit breaker is open")
+
+        self.stats["calls"] += 1
+        deadline = time.monotonic() + self.deadlines_s.get(role, 20.0)
+
+        def timed():
+            t0 = time.monotonic()
+            with profiler.stage(f"llm.attempt.{role}"):
+                result = fn()
+            self.latency.record(role, time.monotonic() - t0)
+            return result
+
+        # Attempts run in the caller's context, so a profiled request's stages follow them
+        primary = self.executor.submit(copy_context().run, timed)
+        attempts = [primary]
+        done, _ = wait(attempts, timeout=min(self._hedge_delay(role), max(0.0, deadline - time.monotonic())))
+        if not done and time.monotonic() < deadline:
+            self.stats["hedges"] += 1
+            attempts.append(self.executor.submit(copy_context().run, timed))
+
+        last_error = None
+        pending = set(attempts)
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is not primary:
+                        self.stats["hedge_wins"] += 1
+                    self.breaker.record_success()
+                    return future.result()
+                last_error = future.exception()
+
+        self.breaker.record_failure()
+        if last_error is not None and not pending:
+            self.stats["errors"] += 1
+            raise last_error
+        self.stats["deadline_exceeded"] += 1
+        raise DeadlineExceeded(f"{role} exceeded its {self.deadlines_s.get(role, 20.0)}s deadline")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "breaker_state": self.breaker.state,
+            "breaker_trips": self.breaker.trips,
+            "hedge_delay_ms": {role: round(self._hedge_delay(role) * 1000, 1) for role in self.deadlines_s},
+        }
@@ -1,20 +1,53 @@
+import threading
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from backend.routers import mock_data, evaluate, chat
+from backend.routers import mock_data, evaluate, chat, campaigns, dashboard, cluster, profiling
+from backend.services.baselines import baselines, ENABLED as BASELINES_ENABLED
+from backend.services.similarity import similarity_index
+from backend.services.risk_signals import risk_monitor, RISK_EVENTS_PATH
+from backend.services.sharding import ShardRouter
+from backend.services.request_profiling import ProfilingMiddleware
+from ai_engine.profiling import PROFILING_ENABLED
 
 app = FastAPI(title="AI Influencer Dashboard API")
 
+# Opt-in (PROFILING=1): sampled / X-Profile requests are profiled, slow ones kept for /profiling/slow
+# (mounted only then, behind ADMIN_TOKEN).
+# Innermost, so it profiles the node that serves the request.
+app.add_middleware(ProfilingMiddleware)
+
+# Multi-node deployments (CLUSTER_NODES): per-influencer requests go to the node holding its evaluations.
+# Added before CORS so CORS stays the outermost layer, also for forwarded responses.
+app.add_middleware(ShardRouter)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"], # Allow all for local dev ease
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Age", "X-Cache", "Retry-After", "X-Shard-Node", "X-Profile-Id"], # Readable by the frontend cross-origin
 )
 
 app.include_router(mock_data.router)
 app.include_router(evaluate.router)
 app.include_router(chat.router)
+app.include_router(campaigns.router)
+app.include_router(dashboard.router)
+app.include_router(cluster.router)
+if PROFILING_ENABLED:
+    app.include_router(profiling.router)
+
+@app.on_event("startup")
+async def warm_indexes():
+    # Build the peer percentile tables off the request path (first evaluations would otherwise wait)
+    if BASELINES_ENABLED:
+        threading.Thread(target=baselines.ensure_built, daemon=True).start()
+    # Chunked: /mock/similar answers from the part indexed so far while the rest builds
+    similarity_index.ensure_built(background=True)
+    # Recorded follower / engagement event streams, if configured (others are generated on demand)
+    if RISK_EVENTS_PATH:
+        threading.Thread(target=risk_monitor.ingest_file, args=(RISK_EVENTS_PATH,), daemon=True).start()
 
 @app.get("/health")
 async def health_check():
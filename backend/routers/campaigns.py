@@ -0,0 +1,44 @@
+from typing import List, Literal, Optional
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel, Field
+from backend.services.campaign_store import campaign_store
+from backend.services.sharding import cluster
+
+router = APIRouter(prefix="/campaigns", tags=["Campaigns"])
+
+# Enums mirror shared-schemas/Campaign.json
+class TargetAudience(BaseModel):
+    age_range: Optional[str] = None
+    gender: Optional[str] = None
+    interests: List[str] = []
+
+class CampaignCreate(BaseModel):
+    brand_name: str
+    category: Literal["Fashion", "Tech", "Beauty", "Fitness", "Gaming", "Food"]
+    budget: float = Field(..., gt=0)
+    goal: Literal["Awareness", "Conversion", "Content Creation"]
+    platform_preference: List[str]
+    required_activities: List[str] = []
+    target_audience: Optional[TargetAudience] = None
+
+@router.post("/", status_code=201)
+async def create_campaign(request: CampaignCreate):
+    """Stores a campaign brief; evaluate against it with /evaluate/demo?campaign_id=<id>."""
+    brief = request.model_dump(exclude_none=True)
+    campaign = campaign_store.create(brief)
+    # Replicated before answering, so an evaluation forwarded to another node finds it
+    await cluster.replicate_campaign(campaign)
+    return campaign
+
+@router.get("/")
+async def list_campaigns(category: str = None, offset: int = 0, limit: int = 50):
+    if offset < 0 or not 1 <= limit <= 500:
+        raise HTTPException(status_code=400, detail="offset must be >= 0 and limit between 1 and 500")
+    return {"total": campaign_store.count(category), "campaigns": campaign_store.list(category, offset, limit)}
+
+@router.get("/{campaign_id}")
+async def get_campaign(campaign_id: str):
+    campaign = campaign_store.get(campaign_id)
+    if campaign is None:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+    return campaign
@@ -1,34 +1,190 @@
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+import asyncio
+import json
+from typing import Optional
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ValidationError
+from starlette.concurrency import iterate_in_threadpool
 from backend.services.cache import cache
-from ai_engine.llm_client import llm_client
+from backend.services.chat_sessions import session_store
+from backend.services.campaign_store import evaluation_key, DEFAULT_CAMPAIGN_ID
+from ai_engine.llm_client import llm_client, StreamInterrupted
+from ai_engine.profiling import profiler
 
 router = APIRouter(prefix="/chat", tags=["Chat"])
 
 class ChatRequest(BaseModel):
     query: str
     influencer_id: str
+    content_type: str = "all"
+    campaign_id: str = DEFAULT_CAMPAIGN_ID
+    session_id: Optional[str] = None
 
 class ChatResponse(BaseModel):
     message: str
+    session_id: Optional[str] = None
 
-from backend.services.chat_context_builder import build_chat_context
+from backend.services.chat_context_builder import chat_context_for
 
-@router.post("/", response_model=ChatResponse)
-async def chat(request: ChatRequest):
+NO_CONTEXT_MESSAGE = "I don't have analysis data for this influencer yet. Please run an evaluation first."
+
+# Max undelivered frames per WebSocket before token producers have to wait for the client
+WS_SEND_QUEUE_SIZE = 64
+
+@profiler.staged("chat.context")
+def _prepare_turn(request: ChatRequest):
+    """
+    Resolves the session and the trimmed per-turn context.
+    Returns (None, None) if there is no evaluation to chat about yet.
+    """
     # 1. Retrieve Context from Cache
     # The cache stores the raw evaluation result (kpis, decision, etc.)
-    evaluation_result = cache.get(request.influencer_id)
+    # /evaluate/demo caches one entry per influencer x campaign x content_type
+    evaluation_result = cache.get(evaluation_key(request.influencer_id, request.campaign_id, request.content_type))
     
     if not evaluation_result:
         # If no context, we can't RAG.
-        return ChatResponse(message="I don't have analysis data for this influencer yet. Please run an evaluation first.")
+        return None, None
+
+    # 2. Resolve the conversation session and its Structured Context
+    # The structured context is built once per evaluation (shared across sessions and /dashboard/), not once per turn.
+    session = session_store.get_or_create(request.session_id, request.influencer_id)
+    if session.evaluation is not evaluation_result:
+        session.evaluation = evaluation_result
+        session.structured_context = chat_context_for(evaluation_result)
+
+    # Only the query-relevant slices + budgeted history are sent
+    return session, session_store.build_turn_context(session, request.query)
 
-    # 2. Build Structured Context
-    structured_context = build_chat_context(evaluation_result)
+@router.post("/", response_model=ChatResponse)
+async def chat(request: ChatRequest):
+    session, turn_context = _prepare_turn(request)
+    if session is None:
+        return ChatResponse(message=NO_CONTEXT_MESSAGE)
 
     # 3. Generate Response using Mock LLM (Simulated RAG)
-    # We pass the formatted context now
-    response = llm_client.chat(request.query, structured_context)
+    response = llm_client.chat(request.query, turn_context)
+
+    session.add_turn("user", request.query)
+    session.add_turn("assistant", response)
     
-    return ChatResponse(message=response)
+    return ChatResponse(message=response, session_id=session.session_id)
+
+@router.post("/stream")
+async def chat_stream_sse(request: ChatRequest):
+    """
+    Server-Sent Events fallback for clients that can't open a WebSocket.
+    Emits `token` events with partial text, then a `done` event with the full message
+    (or an `error` event if the provider fails mid-answer; the turn is then not kept).
+    """
+    session, turn_context = _prepare_turn(request)
+
+    async def event_source():
+        if session is None:
+            yield f"event: done\ndata: {json.dumps({'message': NO_CONTEXT_MESSAGE})}\n\n"
+            return
+
+        parts = []
+        # The LLM stream is blocking, so it is pulled from a worker thread
+        try:
+            async for token in iterate_in_threadpool(llm_client.chat_stream(request.query, turn_context)):
+                parts.append(token)
+                yield f"event: token\ndata: {json.dumps({'delta': token})}\n\n"
+        except StreamInterrupted as e:
+            yield f"event: error\ndata: {json.dumps({'detail': f'Answer interrupted: {e}', 'session_id': session.session_id})}\n\n"
+            return
+
+        message = "".join(parts)
+        session.add_turn("user", request.query)
+        session.add_turn("assistant", message)
+        yield f"event: done\ndata: {json.dumps({'message': message, 'session_id': session.session_id})}\n\n"
+
+    return StreamingResponse(event_source(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+@router.websocket("/ws")
+async def chat_stream_ws(websocket: WebSocket):
+    """
+    Multiplexed streaming chat.
+    The client sends ChatRequest JSON frames; several sessions (one per influencer) can stream
+    over the same socket at once. Every outgoing frame is tagged with its session_id:
+        {"type": "start", "session_id", "influencer_id"}
+        {"type": "token", "session_id", "delta"}
+        {"type": "done", "session_id", "message"}
+        {"type": "error", "detail"} (+ "session_id" if an answer failed or was interrupted mid-stream)
+    A new query on a session that is still streaming cancels the previous answer.
+    Frames go through a bounded queue, so a slow client pauses token production (backpressure)
+    instead of buffering an unbounded backlog in memory.
+    """
+    await websocket.accept()
+    outbox: asyncio.Queue = asyncio.Queue(maxsize=WS_SEND_QUEUE_SIZE)
+    streams = {}
+
+    async def sender():
+        while True:
+            frame = await outbox.get()
+            await websocket.send_json(frame)
+
+    async def stream_turn(request: ChatRequest):
+        try:
+            await answer(request)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # A failed turn ends with an error frame; the socket and the other sessions stay up
+            print(f"Chat turn failed for {request.influencer_id}: {e!r}")
+            await outbox.put({"type": "error", "session_id": request.session_id, "detail": "Answer failed"})
+
+    async def answer(request: ChatRequest):
+        session, turn_context = _prepare_turn(request)
+        if session is None:
+            await outbox.put({"type": "done", "session_id": request.session_id, "influencer_id": request.influencer_id, "message": NO_CONTEXT_MESSAGE})
+            return
+
+        await outbox.put({"type": "start", "session_id": session.session_id, "influencer_id": request.influencer_id})
+        parts = []
+        try:
+            async for token in iterate_in_threadpool(llm_client.chat_stream(request.query, turn_context)):
+                parts.append(token)
+                await outbox.put({"type": "token", "session_id": session.session_id, "delta": token})
+        except StreamInterrupted as e:
+            await outbox.put({"type": "error", "session_id": session.session_id, "detail": f"Answer interrupted: {e}"})
+            return
+
+        message = "".join(parts)
+        session.add_turn("user", request.query)
+        session.add_turn("assistant", message)
+        await outbox.put({"type": "done", "session_id": session.session_id, "message": message})
+
+    send_task = asyncio.ensure_future(sender())
+    try:
+        while True:
+            text = await websocket.receive_text()
+            try:
+                request = ChatRequest(**json.loads(text))
+            except (ValidationError, TypeError, ValueError) as e:  # ValueError: not JSON
+                await outbox.put({"type": "error", "detail": str(e)})
+                continue
+
+            # One in-flight answer per session (or per influencer for brand-new sessions)
+            stream_key = request.session_id or request.influencer_id
+            previous = streams.get(stream_key)
+            if previous and not previous.done():
+                previous.cancel()
+            task = streams[stream_key] = asyncio.ensure_future(stream_turn(request))
+            # Finished answers leave the map, so a long-lived socket doesn't accumulate them
+            task.add_done_callback(lambda t, key=stream_key: streams.pop(key) if streams.get(key) is t else None)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        for task in list(streams.values()):
+            task.cancel()
+        send_task.cancel()
+
+@router.delete("/session/{session_id}")
+async def end_session(session_id: str):
+    session_store.drop(session_id)
+    return {"status": "ok"}
+
+@router.get("/sessions/stats")
+async def session_stats():
+    return session_store.stats()
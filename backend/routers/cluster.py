@@ -0,0 +1,58 @@
+from typing import List, Dict, Any
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
+from backend.services.sharding import cluster
+from backend.services.access import require_cluster_token
+from backend.services.campaign_store import campaign_store
+
+router = APIRouter(prefix="/cluster", tags=["Cluster"])
+
+class MembershipRequest(BaseModel):
+    nodes: List[str]
+    propagate: bool = True  # also apply it on every other node (old and new members)
+
+class HandoffRequest(BaseModel):
+    entries: List[Dict[str, Any]]  # {"key": <evaluation cache key>, "value": <evaluation>}
+
+@router.get("/ring")
+async def ring_stats():
+    """Membership, routing mode, forwarding / handoff counters and how many cached entries this node owns."""
+    return cluster.get_stats()
+
+@router.get("/route")
+async def route(influencer_id: str):
+    """Node owning an influencer, for load balancers and WebSocket clients that pick the node themselves."""
+    return {"influencer_id": influencer_id, "node": cluster.owner(influencer_id)}
+
+@router.put("/nodes", dependencies=[Depends(require_cluster_token)])
+async def set_nodes(request: MembershipRequest):
+    """
+    Node join / leave: replaces the membership and moves only the cache entries whose owner changed.
+    A leaving node hands all of its entries over when it receives a membership without itself.
+    """
+    nodes = [n.rstrip("/") for n in request.nodes]
+    if not nodes:
+        raise HTTPException(status_code=400, detail="nodes must be non-empty")
+    try:
+        return await cluster.set_nodes(nodes, request.propagate)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/handoff", dependencies=[Depends(require_cluster_token)])
+async def handoff(request: HandoffRequest):
+    """Internal: cache entries handed over by a node that no longer owns them."""
+    cluster.receive_handoff(request.entries)
+    return {"received": len(request.entries)}
+
+@router.get("/campaigns", dependencies=[Depends(require_cluster_token)])
+async def all_campaigns():
+    """Internal: every campaign, pulled by a joining node."""
+    return campaign_store.list(limit=campaign_store.count())
+
+@router.post("/campaigns", dependencies=[Depends(require_cluster_token)])
+async def replicated_campaign(campaign: Dict[str, Any]):
+    """Internal: a campaign created on another node."""
+    if "id" not in campaign:
+        raise HTTPException(status_code=400, detail="campaign id is required")
+    campaign_store.add(campaign)
+    return {"id": campaign["id"]}
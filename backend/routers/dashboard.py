@@ -0,0 +1,76 @@
+import asyncio
+from typing import Dict, Any
+from fastapi import APIRouter, Depends, HTTPException, Request
+from ai_engine.profiling import profiler
+from starlette.concurrency import run_in_threadpool
+from backend.services.data_generator import generator, GENERATOR_VERSION
+from backend.services.cache import cache
+from backend.services.wire_format import negotiated_response, representation
+from backend.services.http_cache import make_etag, etag_matches, not_modified, REVALIDATE_CACHE_CONTROL, PROCESS_NONCE
+from backend.services.campaign_store import campaign_store, evaluation_key, DEFAULT_CAMPAIGN_ID
+from backend.services.chat_context_builder import chat_context_for, category_cards, consultant_card
+from backend.routers.evaluate import cached_evaluation, evaluate_once, request_priority
+
+router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
+
+@profiler.staged("dashboard.category_cards")
+def _category_cards(evaluation: Dict[str, Any]) -> Dict[str, Any]:
+    return category_cards(chat_context_for(evaluation))
+
+@profiler.staged("dashboard.consultant_cards")
+def _consultant_cards(evaluation: Dict[str, Any]) -> Dict[str, Any]:
+    context = chat_context_for(evaluation)
+    return {kpi["kpi_id"]: consultant_card(context, kpi) for kpi in evaluation.get("kpis", [])}
+
+@router.get("/{influencer_id}")
+async def get_dashboard(influencer_id: str, http_request: Request, campaign_id: str = DEFAULT_CAMPAIGN_ID,
+                        content_type: str = "all", priority: str = Depends(request_priority)):
+    """
+    Everything the influencer view needs in one round trip: the profile, the evaluation (cached or
+    computed), the chat's category cards and a consultant card per KPI.
+    The profile is generated once and reused by the evaluation; the structured chat context is
+    shared with /chat/, so the first chat turn doesn't rebuild it.
+    A cached evaluation honours If-None-Match (304) before any stage runs.
+    """
+    campaign = campaign_store.get(campaign_id)
+    if campaign is None:
+        raise HTTPException(status_code=404, detail=f"Unknown campaign_id '{campaign_id}'")
+    cache_key = evaluation_key(influencer_id, campaign_id, content_type)
+    evaluation, freshness = cached_evaluation(cache_key, influencer_id, campaign, content_type)
+
+    if evaluation:
+        etag = make_etag("dashboard", cache_key, cache.version(cache_key), GENERATOR_VERSION, PROCESS_NONCE,
+                         *representation(http_request))
+        if etag_matches(http_request, etag):
+            return not_modified(etag, REVALIDATE_CACHE_CONTROL)
+        # 1. All stages at once: they only depend on the cached evaluation
+        profile, categories, consultants = await asyncio.gather(
+            run_in_threadpool(generator.generate_influencer, influencer_id, content_type),
+            run_in_threadpool(_category_cards, evaluation),
+            run_in_threadpool(_consultant_cards, evaluation),
+        )
+    else:
+        freshness = "miss"
+        # 1. Profile, handed to the evaluation so it isn't generated twice
+        profile = await run_in_threadpool(generator.generate_influencer, influencer_id, content_type)
+        # 2. Evaluation (shared with concurrent requests for the same key), then the cards
+        evaluation = await evaluate_once(priority, influencer_id, campaign, content_type, profile)
+        categories, consultants = await asyncio.gather(
+            run_in_threadpool(_category_cards, evaluation),
+            run_in_threadpool(_consultant_cards, evaluation),
+        )
+
+    return negotiated_response(http_request, {
+        "influencer_id": influencer_id,
+        "campaign_id": campaign_id,
+        "content_type": content_type,
+        "profile": profile,
+        "evaluation": evaluation,
+        "category_cards": categories,
+        "consultant_cards": consultants,
+    }, headers={
+        "X-Cache": freshness,
+        "ETag": make_etag("dashboard", cache_key, cache.version(cache_key), GENERATOR_VERSION, PROCESS_NONCE,
+                          *representation(http_request)),
+        "Cache-Control": REVALIDATE_CACHE_CONTROL
+    })
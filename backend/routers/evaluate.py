@@ -1,52 +1,484 @@
-from fastapi import APIRouter, HTTPException
+import asyncio
+import os
+import tempfile
+from typing import List, Dict, Any, Literal, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from fastapi.responses import FileResponse
+from starlette.background import BackgroundTask
+from pydantic import BaseModel
 from ai_engine.orchestrator import orchestrator
+from ai_engine.decision_rules import decision_rules
+from ai_engine.llm_client import llm_client
+from ai_engine.kpi_engine import kpi_engine
+from ai_engine.output_validation import output_validator
+from ai_engine.profiling import profiler
 from ai_engine.models import EvaluationRequest
-from backend.services.data_generator import generator
+from backend.services.data_generator import generator, GENERATOR_VERSION
 from backend.services.cache import cache
+from backend.services.scheduler import scheduler, SchedulerSaturated
+from backend.services.wire_format import negotiated_response, representation
+from backend.services.http_cache import make_etag, etag_matches, not_modified, REVALIDATE_CACHE_CONTROL, PROCESS_NONCE
+from backend.services.export import export_evaluations, EXPORT_FORMATS, PYARROW_AVAILABLE
+from backend.services.baselines import baselines
+from backend.services.sensitivity import sensitivity_analyzer
+from backend.services.campaign_store import campaign_store, evaluation_key, evaluation_key_parts, evaluation_current, DEFAULT_CAMPAIGN_ID
+from backend.services.sharding import cluster
+from backend.services.timeseries import history_store
+from backend.services.access import check_cluster_token, token_matches, ADMIN_TOKEN
 
 router = APIRouter(prefix="/evaluate", tags=["Evaluation"])
 
+class BatchEvaluationRequest(BaseModel):
+    influencer_ids: List[str]
+    campaign_id: str = DEFAULT_CAMPAIGN_ID
+    content_type: str = "all"
+
+class MatrixEvaluationRequest(BaseModel):
+    influencer_ids: List[str]
+    campaigns: List[Dict[str, Any]] = []
+    campaign_ids: List[str] = []  # stored campaigns, evaluated after the inline briefs
+    content_type: str = "all"
+    include_results: bool = False
+
+class KPIComputeRequest(BaseModel):
+    influencer_ids: List[str]
+    campaign_id: str = DEFAULT_CAMPAIGN_ID
+    content_type: str = "all"
+    explain: bool = True
+    # Read sponsored ratio, ad engagement decay and sentiment volatility from the daily histories
+    # (~1.5ms per influencer not in the history cache); off: profile proxies only
+    history: bool = True
+
+# Sweep axes mirror the campaign goals (shared-schemas/Campaign.json) and the generator's content types
+SweepGoal = Literal["Awareness", "Conversion", "Content Creation"]
+SweepContentType = Literal["short", "long", "all"]
+
+class SensitivityRequest(BaseModel):
+    influencer_id: str
+    campaign_id: str = DEFAULT_CAMPAIGN_ID
+    content_type: SweepContentType = "all"
+    # Variations to sweep; an empty list keeps the evaluated value. Budgets and rules are range-checked
+    # by the analyzer (400): a 422 would echo NaN/Infinity back, which JSON cannot encode.
+    budgets: List[float] = []
+    goals: List[SweepGoal] = []
+    content_types: List[SweepContentType] = []
+    rules: Dict[str, float] = {}  # decision threshold overrides, e.g. {"go_roi_min": 1.5}
+
+class CacheInvalidationRequest(BaseModel):
+    # Filters are combined (AND); at least one is required
+    influencer_id: Optional[str] = None
+    campaign_id: Optional[str] = None
+    role: Optional[str] = None  # entries whose evaluation read this role's prompt
+    propagate: bool = True  # also apply it on every other cluster node (propagated calls need the cluster token)
+
+class PromptReloadRequest(BaseModel):
+    propagate: bool = True
+
+# Upper bound on influencers x campaigns per matrix request
+MATRIX_MAX_PAIRS = int(os.environ.get("MATRIX_MAX_PAIRS", 2500))
+# Upper bound on influencers per /evaluate/kpis request
+KPI_MAX_INFLUENCERS = int(os.environ.get("KPI_MAX_INFLUENCERS", 10000))
+
+def _saturated(e: SchedulerSaturated) -> HTTPException:
+    return HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+def request_priority(priority: Optional[str] = None, x_admin_token: Optional[str] = Header(None)) -> str:
+    """
+    Priority class of an interactive endpoint: always 'interactive', unless an operator holding the
+    admin token picks another class with ?priority= (e.g. to backfill through the same endpoint).
+    """
+    if priority is None or priority == "interactive":
+        return "interactive"
+    if not token_matches(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Choosing a priority class requires the admin token")
+    if priority not in scheduler.classes:
+        raise HTTPException(status_code=400, detail=f"Unknown priority class '{priority}'. Expected one of {list(scheduler.classes)}")
+    return priority
+
+async def _schedule(priority: str, fn, *args):
+    """Runs a blocking evaluation through the priority scheduler, mapping saturation to 429."""
+    try:
+        return await scheduler.submit(priority, fn, *args)
+    except SchedulerSaturated as e:
+        raise _saturated(e)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.post("/")
-async def evaluate_influencer(request: EvaluationRequest):
+async def evaluate_influencer(request: EvaluationRequest, http_request: Request, priority: str = Depends(request_priority)):
     """
     Evaluates an influencer against a campaign.
     Uses the AI Engine Orchestrator to compute KPIs and a decision.
+    Responds in JSON, MessagePack or CBOR depending on the Accept header.
     """
     # If the request contains only IDs (which we don't fully support in schema yet but might),
     # we would fetch them. For now, we assume full objects or fetch if IDs are passed.
     # To support the Frontend efficiently, let's allow passing IDs or full objects.
     # The current schema expects full objects in the dict.
     
-    # Simple pass-through to orchestrator
-    result = orchestrator.evaluate(request.influencer, request.campaign)
+    # Simple pass-through to orchestrator (via the scheduler)
+    result = await _schedule(priority, orchestrator.evaluate, request.influencer, request.campaign)
+    return negotiated_response(http_request, result)
+
+def _get_campaign(campaign_id: str) -> Dict[str, Any]:
+    campaign = campaign_store.get(campaign_id)
+    if campaign is None:
+        raise HTTPException(status_code=404, detail=f"Unknown campaign_id '{campaign_id}'")
+    return campaign
+
+def _run_demo_evaluation(influencer_id: str, campaign: Dict[str, Any], content_type: str, influencer: Dict[str, Any] = None):
+    """Blocking part of the demo evaluation: generate data (unless the caller already has the profile), evaluate, cache."""
+    cache_key = evaluation_key(influencer_id, campaign["id"], content_type)
+
+    # Pass content_type to generator to influence metrics
+    if influencer is None:
+        with profiler.stage("profile"):
+            influencer = generator.generate_influencer(influencer_id, content_type)
+
+    result = orchestrator.evaluate(influencer, campaign)
+    # Evaluated profiles join the peer percentile tables
+    with profiler.stage("baselines"):
+        baselines.observe(influencer, content_type)
+    
+    # Store in cache (unless the prompts were reloaded while it ran)
+    if evaluation_current(cache_key, result):
+        cache.set(cache_key, result)
+    
     return result
 
-@router.post("/demo")
-async def evaluate_demo(influencer_id: str, campaign_id: str = None, content_type: str = "all"):
+def _evaluation_etag(cache_key: str, http_request: Request) -> str:
+    return make_etag(cache_key, cache.version(cache_key), PROCESS_NONCE, *representation(http_request))
+
+def cached_evaluation(cache_key: str, influencer_id: str, campaign: Dict[str, Any], content_type: str):
+    """(result, freshness) from the cache; a stale hit is served and refreshed once in the background."""
+    cached_result, freshness = cache.get_with_freshness(cache_key)
+    if cached_result and freshness == "stale" and cache.begin_refresh(cache_key):
+        task = asyncio.ensure_future(_background_refresh(cache_key, influencer_id, campaign, content_type))
+        _refresh_tasks.add(task)
+        task.add_done_callback(_refresh_tasks.discard)
+    return cached_result, freshness
+
+# Evaluations being computed, by cache key: concurrent misses for the same key share one run
+_inflight: Dict[str, asyncio.Future] = {}
+
+async def evaluate_once(priority: str, influencer_id: str, campaign: Dict[str, Any], content_type: str,
+                        influencer: Dict[str, Any] = None):
+    """Computes (and caches) an uncached evaluation; requests arriving while it runs await the same result."""
+    cache_key = evaluation_key(influencer_id, campaign["id"], content_type)
+    pending = _inflight.get(cache_key)
+    if pending is not None:
+        return await asyncio.shield(pending)
+    future = asyncio.get_running_loop().create_future()
+    _inflight[cache_key] = future
+    try:
+        result = await _schedule(priority, _run_demo_evaluation, influencer_id, campaign, content_type, influencer)
+        future.set_result(result)
+        return result
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        future.exception()  # retrieved here, so an unawaited failure isn't logged as "never retrieved"
+        raise
+    finally:
+        del _inflight[cache_key]
+
+@router.api_route("/demo", methods=["GET", "POST"])
+async def evaluate_demo(http_request: Request, influencer_id: str, campaign_id: str = DEFAULT_CAMPAIGN_ID, content_type: str = "all",
+                        priority: str = Depends(request_priority)):
     """
     Helper endpoint for the frontend.
-    Fetches the mock data by ID, then runs evaluation.
+    Fetches the mock data by ID and the campaign from the campaign store, then runs evaluation.
     This saves the frontend from having to send massive JSON blobs.
+    GET requests for a cached evaluation honour If-None-Match (304 on a matching ETag).
     """
-    # Check cache first (Cache key now includes content_type)
-    cache_key = f"{influencer_id}_{content_type}"
-    cached_result = cache.get(cache_key)
+    campaign = _get_campaign(campaign_id)
+
+    # Check cache first (one entry per influencer x campaign x content_type)
+    cache_key = evaluation_key(influencer_id, campaign_id, content_type)
+    # Stale-while-revalidate: answer now, refresh once in the background
+    cached_result, freshness = cached_evaluation(cache_key, influencer_id, campaign, content_type)
     if cached_result:
-        return cached_result
+        etag = _evaluation_etag(cache_key, http_request)
+        if http_request.method == "GET" and etag_matches(http_request, etag):
+            return not_modified(etag, REVALIDATE_CACHE_CONTROL)
 
-    # Pass content_type to generator to influence metrics
-    influencer = generator.generate_influencer(influencer_id, content_type)
-    
-    if campaign_id:
-        # TODO: Implement get_campaign by ID if we add persistence. 
-        # For now, generate a random one or use the one provided.
-         campaign = generator.generate_campaign_brief() # Placeholder
-    else:
-        campaign = generator.generate_campaign_brief()
-        
-    result = orchestrator.evaluate(influencer, campaign)
-    
-    # Store in cache
-    cache.set(cache_key, result)
-    
-    return result
+        return negotiated_response(http_request, cached_result, headers={
+            "X-Cache": freshness,
+            "Age": str(int(cache.age(cache_key) or 0)),
+            "ETag": etag,
+            "Cache-Control": REVALIDATE_CACHE_CONTROL
+        })
+
+    result = await evaluate_once(priority, influencer_id, campaign, content_type)
+    return negotiated_response(http_request, result, headers={
+        "X-Cache": "miss",
+        "ETag": _evaluation_etag(cache_key, http_request),
+        "Cache-Control": REVALIDATE_CACHE_CONTROL
+    })
+
+# Strong references so pending refresh tasks aren't garbage collected
+_refresh_tasks = set()
+
+async def _background_refresh(cache_key: str, influencer_id: str, campaign: Dict[str, Any], content_type: str):
+    """Re-evaluates a stale entry in the bulk class so it never competes with interactive requests."""
+    ok = False
+    try:
+        await scheduler.submit("bulk", _run_demo_evaluation, influencer_id, campaign, content_type)
+        ok = True
+    except Exception as e:
+        print(f"Background refresh failed for {cache_key}: {e}")
+    finally:
+        cache.end_refresh(cache_key, ok)
+
+@router.post("/batch")
+async def evaluate_batch(request: BatchEvaluationRequest, http_request: Request):
+    """
+    Bulk / backfill evaluation of many influencers.
+    Always runs in the 'bulk' priority class so it cannot starve interactive audits.
+    Returns 413 for a batch larger than the bulk queue, 429 + Retry-After if the queue cannot
+    admit the whole batch now. Otherwise one entry per influencer, in order, each with a `status`
+    ("ok" with the `result`, or "error" with the HTTP `code` and `detail` it failed with).
+    """
+    campaign = _get_campaign(request.campaign_id)
+    max_queue = scheduler.classes["bulk"].max_queue
+    if len(request.influencer_ids) > max_queue:
+        raise HTTPException(status_code=413, detail=f"At most {max_queue} influencers per batch")
+    try:
+        scheduler.admit("bulk", len(request.influencer_ids))
+    except SchedulerSaturated as e:
+        raise _saturated(e)
+
+    async def evaluate_one(influencer_id: str):
+        cached_result = cache.get(evaluation_key(influencer_id, request.campaign_id, request.content_type))
+        if cached_result:
+            return cached_result
+        # Concurrent batches can still race past the check above: per-item saturation is a 429 too
+        return await _schedule("bulk", _run_demo_evaluation, influencer_id, campaign, request.content_type)
+
+    def item(influencer_id: str, outcome: Any) -> Dict[str, Any]:
+        if isinstance(outcome, HTTPException):
+            return {"influencer_id": influencer_id, "status": "error", "code": outcome.status_code, "detail": outcome.detail}
+        if isinstance(outcome, Exception):
+            print(f"Batch evaluation failed for {influencer_id}: {outcome!r}")
+            return {"influencer_id": influencer_id, "status": "error", "code": 500, "detail": "Evaluation failed"}
+        return {"influencer_id": influencer_id, "status": "ok", "result": outcome}
+
+    # One failed item (e.g. a 429 from a racing batch) must not discard the others
+    outcomes = await asyncio.gather(*[evaluate_one(i) for i in request.influencer_ids], return_exceptions=True)
+    return negotiated_response(http_request, [item(i, o) for i, o in zip(request.influencer_ids, outcomes)])
+
+def _run_matrix_evaluation(influencer_ids: List[str], campaigns: List[Dict[str, Any]], content_type: str, include_results: bool):
+    influencers = [generator.generate_influencer(i, content_type) for i in influencer_ids]
+    campaigns = [{**c, "id": c.get("id") or f"campaign-{j}"} for j, c in enumerate(campaigns)]
+    matrix = orchestrator.evaluate_matrix(influencers, campaigns)
+    for influencer in influencers:
+        baselines.observe(influencer, content_type)
+    if not include_results:
+        matrix.pop("results")
+    return {"influencer_ids": influencer_ids, "campaign_ids": [c["id"] for c in campaigns], "content_type": content_type, **matrix}
+
+@router.post("/matrix")
+async def evaluate_matrix(request: MatrixEvaluationRequest, http_request: Request):
+    """
+    Scores N influencers against M campaign briefs in one call.
+    Returns dense N x M `scores` (mean normalized KPI score) and `decisions`; full per-pair
+    results only with include_results. Analyst roles that don't read the campaign run once per
+    influencer. Runs as a single job in the 'bulk' priority class.
+    """
+    campaigns = request.campaigns + [_get_campaign(i) for i in request.campaign_ids]
+    pairs = len(request.influencer_ids) * len(campaigns)
+    if not pairs:
+        raise HTTPException(status_code=400, detail="influencer_ids and campaigns/campaign_ids must be non-empty")
+    if pairs > MATRIX_MAX_PAIRS:
+        raise HTTPException(status_code=400, detail=f"At most {MATRIX_MAX_PAIRS} influencer x campaign pairs per request")
+
+    result = await _schedule("bulk", _run_matrix_evaluation, request.influencer_ids, campaigns,
+                             request.content_type, request.include_results)
+    return negotiated_response(http_request, result)
+
+def _run_kpi_engine(influencer_ids: List[str], campaign: Dict[str, Any], content_type: str, explain: bool, history: bool):
+    influencers = [generator.generate_influencer(i, content_type) for i in influencer_ids]
+    if history:
+        influencers = [{**p, "history": history_store.summary(p)} for p in influencers]
+    kpis = kpi_engine.compute(influencers, campaign, explain)
+    return {
+        "campaign_id": campaign["id"],
+        "content_type": content_type,
+        "results": [{"influencer_id": i, "kpis": k} for i, k in zip(influencer_ids, kpis)]
+    }
+
+@router.post("/kpis")
+async def compute_kpis(request: KPIComputeRequest, http_request: Request, priority: str = Depends(request_priority)):
+    """
+    Numeric KPIs from kpi_definitions.json for many influencers in one local pass (no LLM calls).
+    A separate, non-authoritative screening estimate with "engine."-prefixed ids: the evaluation's
+    KPIs and decision come from the analysts and never read it (their brand_safety_score etc. are
+    computed differently). Use /evaluate/demo for the audit and decision.
+    """
+    if not request.influencer_ids:
+        raise HTTPException(status_code=400, detail="influencer_ids must be non-empty")
+    if len(request.influencer_ids) > KPI_MAX_INFLUENCERS:
+        raise HTTPException(status_code=400, detail=f"At most {KPI_MAX_INFLUENCERS} influencers per request")
+
+    campaign = _get_campaign(request.campaign_id)
+    result = await _schedule(priority, _run_kpi_engine, request.influencer_ids, campaign, request.content_type,
+                             request.explain, request.history)
+    return negotiated_response(http_request, result)
+
+@router.post("/sensitivity")
+async def evaluate_sensitivity(request: SensitivityRequest, http_request: Request, priority: str = Depends(request_priority)):
+    """
+    What-if sweep for sliders: ROI, decision and business implications for every combination of
+    budgets x goals x content_types, recomputed locally from the cached evaluation (no LLM calls).
+    Only an uncached evaluation is computed first, once.
+    """
+    try:
+        sensitivity_analyzer.check(request.budgets, request.rules)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    campaign = _get_campaign(request.campaign_id)
+    cache_key = evaluation_key(request.influencer_id, request.campaign_id, request.content_type)
+    evaluation, freshness = cached_evaluation(cache_key, request.influencer_id, campaign, request.content_type)
+    if not evaluation:
+        freshness = "miss"
+        evaluation = await evaluate_once(priority, request.influencer_id, campaign, request.content_type)
+
+    # est_cost isn't part of the evaluation; the profile is deterministic, so regenerate it
+    influencer = generator.generate_influencer(request.influencer_id, request.content_type)
+    try:
+        result = sensitivity_analyzer.analyze(
+            evaluation, influencer, campaign, request.content_type,
+            request.budgets, request.goals, request.content_types, request.rules
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return negotiated_response(http_request, {
+        "influencer_id": request.influencer_id,
+        "campaign_id": request.campaign_id,
+        **result
+    }, headers={"X-Cache": freshness})
+
+@router.get("/scheduler/stats")
+async def scheduler_stats():
+    """Queue depth and wait-time percentiles per priority class."""
+    return scheduler.stats()
+
+@router.get("/export")
+async def export_results(format: str = "parquet"):
+    """
+    Bulk export of all cached evaluation results as a columnar file
+    (one row per influencer x campaign x content_type x kpi_id).
+    format: "parquet" or "arrow" (Arrow IPC file, memory-mappable).
+    """
+    if not PYARROW_AVAILABLE:
+        raise HTTPException(status_code=501, detail="Export requires pyarrow on the server.")
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {EXPORT_FORMATS}")
+
+    suffix = ".parquet" if format == "parquet" else ".arrow"
+    fd, path = tempfile.mkstemp(suffix=suffix)
+    os.close(fd)
+    # Writing is blocking (and chunked), keep it off the event loop
+    await asyncio.get_running_loop().run_in_executor(None, export_evaluations, path, format)
+
+    return FileResponse(
+        path,
+        filename=f"evaluations{suffix}",
+        media_type="application/vnd.apache.parquet" if format == "parquet" else "application/vnd.apache.arrow.file",
+        background=BackgroundTask(os.remove, path)
+    )
+
+@router.post("/cache/invalidate")
+async def invalidate_cache(request: CacheInvalidationRequest, x_cluster_token: Optional[str] = Header(None)):
+    """
+    Targeted invalidation: evicts only the cached evaluations of an influencer, a campaign and/or
+    produced with a given role's prompt, instead of clearing the whole cache.
+    """
+    if not request.propagate:
+        check_cluster_token(x_cluster_token)
+    if request.influencer_id is None and request.campaign_id is None and request.role is None:
+        raise HTTPException(status_code=400, detail="Give at least one of influencer_id, campaign_id, role")
+    if request.role is not None and request.role not in orchestrator.prompt_digests:
+        raise HTTPException(status_code=400, detail=f"Unknown role '{request.role}'")
+
+    def selected(key: str, result: Any) -> bool:
+        parts = evaluation_key_parts(key)
+        return ((request.influencer_id is None or parts["influencer_id"] == request.influencer_id)
+                and (request.campaign_id is None or parts["campaign_id"] == request.campaign_id)
+                and (request.role is None or request.role in (result.get("prompt_versions") or {})))
+
+    failed = 0
+    if request.propagate and cluster.enabled:
+        failed = await cluster.post_all(cluster.peers(), "/evaluate/cache/invalidate",
+                                        {**request.model_dump(), "propagate": False})
+    return {"evicted": cache.evict(selected), "entries": cache.get_stats()["entries"], "failed_nodes": failed}
+
+@router.post("/cache/reload_prompts")
+async def reload_prompts(request: PromptReloadRequest = PromptReloadRequest(), x_cluster_token: Optional[str] = Header(None)):
+    """
+    Re-reads the prompt files and evicts only the cached evaluations produced with a prompt that changed
+    (an executive decider edit keeps every evaluation decided by the local rules).
+    """
+    if not request.propagate:
+        check_cluster_token(x_cluster_token)
+    failed = 0
+    if request.propagate and cluster.enabled:
+        failed = await cluster.post_all(cluster.peers(), "/evaluate/cache/reload_prompts", {"propagate": False})
+    changed = orchestrator.reload_prompts()
+    evicted = cache.evict(lambda key, result: not evaluation_current(key, result)) if changed else 0
+    return {"changed_roles": changed, "evicted": evicted, "entries": cache.get_stats()["entries"],
+            "failed_nodes": failed, **_prompt_versions()}
+
+def _prompt_versions() -> Dict[str, Any]:
+    return {"prompt_versions": orchestrator.prompt_digests, "cache_version": orchestrator.cache_version,
+            "llm_model": getattr(llm_client, "model", "mock"), "generator_version": GENERATOR_VERSION}
+
+@router.get("/prompt_versions")
+async def prompt_versions():
+    """Digest of each loaded prompt, and the version part of evaluation cache keys (model + analyst prompts)."""
+    return _prompt_versions()
+
+@router.get("/prompt_tokens")
+async def prompt_token_stats():
+    """Estimated LLM input tokens per analyst role (system prompt + projected context)."""
+    return orchestrator.get_token_stats()
+
+@router.get("/decision_stats")
+async def decision_stats():
+    """Share of executive decisions resolved by the local rules engine vs. the LLM."""
+    return decision_rules.get_stats()
+
+@router.get("/llm_stats")
+async def llm_stats():
+    """Hedging, deadline and circuit-breaker state of the real LLM client (empty for the mock); replay hit rates."""
+    if hasattr(llm_client, "get_stats"):
+        return llm_client.get_stats()
+    resilience = getattr(llm_client, "resilience", None)
+    return resilience.get_stats() if resilience else {"client": type(llm_client).__name__}
+
+@router.get("/validation_stats")
+async def validation_stats():
+    """Schema validation of LLM outputs: failures per role, repairs, re-asks, fallbacks and cost per evaluation."""
+    return output_validator.get_stats()
+
+@router.get("/kpi_engine_stats")
+async def kpi_engine_stats():
+    """Compiled KPI definitions and usage of the local KPI engine."""
+    return kpi_engine.get_stats()
+
+@router.get("/baseline_stats")
+async def baseline_stats():
+    """Size and lookup counts of the niche x platform x content_type percentile tables."""
+    return baselines.get_stats()
+
+@router.get("/sensitivity_stats")
+async def sensitivity_stats():
+    """What-if sweeps served locally and their average cost."""
+    return sensitivity_analyzer.get_stats()
+
+@router.get("/cache_stats")
+async def cache_stats():
+    """Fresh hits, stale serves and background refreshes of the evaluation cache."""
+    return cache.get_stats()
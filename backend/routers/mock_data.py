@@ -1,19 +1,40 @@
-from fastapi import APIRouter, HTTPException
-from backend.services.data_generator import generator
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from backend.services.data_generator import generator, GENERATOR_VERSION
+from backend.services.http_cache import make_etag, etag_matches, not_modified, STATIC_CACHE_CONTROL
+from backend.services.similarity import similarity_index, MAX_K
+from backend.services.data_generator import NICHES, PLATFORMS
+from backend.services.timeseries import history_store
+from backend.services.risk_signals import risk_monitor, StreamCapacityExceeded
+from backend.services.access import require_admin_token
+from pydantic import BaseModel
+from typing import List, Optional
+import math
 import uuid
 
 router = APIRouter(prefix="/mock", tags=["Mock Data"])
 
 @router.get("/top_influencers")
-def get_top_influencers():
+def get_top_influencers(request: Request, response: Response):
+    # The list is fully determined by the generator version, so revalidation needs no generation
+    etag = make_etag("top_influencers", GENERATOR_VERSION)
+    if etag_matches(request, etag):
+        return not_modified(etag, STATIC_CACHE_CONTROL)
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = STATIC_CACHE_CONTROL
     return generator.get_top_influencers()
 
 @router.get("/influencer/{influencer_id}")
-async def get_influencer(influencer_id: str):
+async def get_influencer(influencer_id: str, request: Request, response: Response, content_type: str = "all"):
     """
     Get a specific influencer by ID. 
     The data is deterministically generated from the ID.
+    Supports If-None-Match: a matching ETag returns 304 without regenerating the profile.
     """
+    etag = make_etag(influencer_id, content_type, GENERATOR_VERSION)
+    if etag_matches(request, etag):
+        return not_modified(etag, STATIC_CACHE_CONTROL)
+
     try:
         # Validate UUID format just to be safe, though not strictly required by logic
         uuid_obj = uuid.UUID(influencer_id) 
@@ -22,9 +43,124 @@ async def get_influencer(influencer_id: str):
         # Actually generator expects UUID string for exact reconstruction in my logic, 
         # let's just pass the string.
 
-    data = generator.generate_influencer(influencer_id)
+    data = generator.generate_influencer(influencer_id, content_type)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = STATIC_CACHE_CONTROL
     return data
 
+@router.get("/similar/{influencer_id}")
+def get_similar_influencers(influencer_id: str, k: int = 10, niche: str = None, platform: str = None, exact: bool = False):
+    """
+    Creators most similar to influencer_id by their detailed_metrics profile (cosine k-NN),
+    optionally restricted to a niche and/or platform. Neighbour IDs work with /mock/influencer/{id}.
+    Unfiltered queries are approximate (IVF) unless exact=true.
+    """
+    if niche and niche not in NICHES:
+        raise HTTPException(status_code=400, detail=f"niche must be one of {NICHES}")
+    if platform and platform not in PLATFORMS:
+        raise HTTPException(status_code=400, detail=f"platform must be one of {PLATFORMS}")
+    if not 1 <= k <= MAX_K:
+        raise HTTPException(status_code=400, detail=f"k must be between 1 and {MAX_K}")
+
+    profile = generator.generate_influencer(influencer_id)
+    neighbours = similarity_index.query(profile, k, niche, platform, exclude_id=influencer_id, exact=exact)
+    if neighbours is None:
+        raise HTTPException(status_code=503, detail="Similarity index is warming up", headers={"Retry-After": "2"})
+
+    results = []
+    for neighbour_id, score in neighbours:
+        neighbour = generator.generate_influencer(neighbour_id)
+        results.append({
+            "id": neighbour_id,
+            "handle": neighbour["handle"],
+            "niche": neighbour["niche"],
+            "platform": neighbour["platform"],
+            "followers": neighbour["followers"],
+            "similarity": score,
+        })
+    return {
+        "influencer_id": influencer_id,
+        "filters": {"niche": niche, "platform": platform},
+        "indexed": similarity_index.indexed,
+        "query_ms": similarity_index.stats["last_query_ms"],
+        "results": results,
+    }
+
+@router.get("/similar_stats")
+def get_similarity_stats():
+    """Size, build progress and last query latency of the similarity index."""
+    return similarity_index.get_stats()
+
+@router.get("/history/{influencer_id}")
+def get_influencer_history(influencer_id: str, request: Request, response: Response, days: int = 90):
+    """
+    Daily followers / views / engagement rate / sentiment / sponsored-post series (last `days` days)
+    plus the 30d/90d rolling aggregates the analysts receive. Deterministic per ID, like the profile.
+    """
+    total_days = history_store.total_days
+    if not 1 <= days <= total_days:
+        raise HTTPException(status_code=400, detail=f"days must be between 1 and {total_days}")
+    etag = make_etag("history", influencer_id, days, total_days, GENERATOR_VERSION)
+    if etag_matches(request, etag):
+        return not_modified(etag, STATIC_CACHE_CONTROL)
+
+    history = history_store.get(generator.generate_influencer(influencer_id))
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = STATIC_CACHE_CONTROL
+    return {
+        "influencer_id": influencer_id,
+        "days": days,
+        "series": history.series(days),
+        "aggregates": history.summary(),
+    }
+
+@router.get("/history_stats")
+def get_history_stats():
+    """Cached histories, generation count and lazily appended days of the history store."""
+    return history_store.get_stats()
+
+class RiskEvent(BaseModel):
+    influencer_id: str
+    followers: float
+    engagements: float
+    sentiment: Optional[float] = None
+
+class RiskEventBatch(BaseModel):
+    events: List[RiskEvent]
+
+@router.get("/risk_signals/{influencer_id}")
+def get_risk_signals(influencer_id: str):
+    """
+    Bot-inflation and engagement-spike scores from the influencer's event stream.
+    Streams not ingested through /mock/risk_events (or RISK_EVENTS_PATH) are replayed from the generator.
+    """
+    scores = risk_monitor.scores(influencer_id)
+    if scores is None:
+        scores = risk_monitor.profile_scores(generator.generate_influencer(influencer_id))
+    return {"influencer_id": influencer_id, **scores}
+
+@router.post("/risk_events", dependencies=[Depends(require_admin_token)])
+def ingest_risk_events(batch: RiskEventBatch):
+    """
+    Feeds live events (in time order per influencer) into the streaming detectors. Operator feed:
+    needs the admin token. 429 when the new streams don't fit in RISK_MAX_STREAMS.
+    On a cluster, all events of a batch must belong to influencers owned by one node.
+    """
+    try:
+        risk_monitor.check_capacity(e.influencer_id for e in batch.events)
+    except StreamCapacityExceeded as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    count = risk_monitor.ingest(
+        (e.influencer_id, e.followers, e.engagements, math.nan if e.sentiment is None else e.sentiment)
+        for e in batch.events
+    )
+    return {"ingested": count}
+
+@router.get("/risk_signal_stats")
+def get_risk_signal_stats():
+    """Streams, processed events and per-stream state size of the risk signal monitor."""
+    return risk_monitor.get_stats()
+
 @router.get("/campaign")
 async def get_random_campaign():
     """Get a random new campaign brief"""
@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import PlainTextResponse
+from ai_engine.profiling import profiler
+from backend.services.access import require_admin_token
+
+# Only mounted with PROFILING=1; stacks and paths are operator data, so every route needs the admin token
+router = APIRouter(prefix="/profiling", tags=["Profiling"], dependencies=[Depends(require_admin_token)])
+
+@router.get("/slow")
+async def slow_requests():
+    """Captured slow (or X-Profile) requests, newest first, without stacks."""
+    return {"profiles": profiler.list_slow(), **profiler.get_stats()}
+
+@router.get("/slow/{profile_id}")
+async def slow_request(profile_id: int, format: str = "json"):
+    """
+    One captured request: stage timeline, samples per stage and the hottest stacks.
+    format=collapsed returns folded stacks for flame graph tools (flamegraph.pl, speedscope).
+    """
+    profile = profiler.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found (not captured, or rotated out)")
+    if format == "collapsed":
+        return PlainTextResponse(profile.collapsed())
+    return profile.summary(profiler.interval_ms)
+
+@router.delete("/slow")
+async def clear_slow_requests():
+    profiler.clear()
+    return {"kept": 0}
+
+@router.get("/stats")
+async def profiling_stats():
+    return profiler.get_stats()
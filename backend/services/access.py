@@ -0,0 +1,35 @@
+import hmac
+import os
+from typing import Optional
+
+from fastapi import Header, HTTPException
+
+from backend.services.sharding import cluster, CLUSTER_TOKEN
+
+# Shared secret for operator endpoints (/profiling) and forced profiles; defaults to the cluster
+# token. Unset: every admin call is refused.
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN", CLUSTER_TOKEN)
+ADMIN_TOKEN_HEADER = "x-admin-token"
+
+
+def token_matches(given: Optional[str], expected: str) -> bool:
+    return bool(expected) and given is not None and hmac.compare_digest(given.encode(), expected.encode())
+
+
+def check_cluster_token(token: Optional[str]):
+    """404 on a node without a cluster configuration, 403 without the cluster's shared secret."""
+    if not cluster.configured:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not token_matches(token, cluster.token):
+        raise HTTPException(status_code=403, detail="Missing or invalid cluster token")
+
+
+def require_cluster_token(x_cluster_token: Optional[str] = Header(None)):
+    """Dependency for internal node-to-node endpoints."""
+    check_cluster_token(x_cluster_token)
+
+
+def require_admin_token(x_admin_token: Optional[str] = Header(None)):
+    """Dependency for operator endpoints."""
+    if not token_matches(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Missing or invalid admin token")
@@ -0,0 +1,183 @@
+import bisect
+import os
+import random
+import threading
+import zlib
+from typing import Dict, Any, List, Optional, Tuple
+
+from backend.services.data_generator import DataGenerator
+
+# BASELINE_SCORING=0 keeps the analysts' fixed scalings
+ENABLED = os.environ.get("BASELINE_SCORING", "1") != "0"
+# Profiles generated per content_type for the initial tables (built lazily on first lookup)
+POPULATION_PER_CONTENT_TYPE = int(os.environ.get("BASELINE_POPULATION", 10000))
+# Reservoir size per (segment, metric); lookups are O(log SKETCH_CAPACITY)
+SKETCH_CAPACITY = int(os.environ.get("BASELINE_SKETCH_CAPACITY", 2048))
+# Segments with fewer samples fall back to the coarser level
+MIN_SEGMENT_SAMPLES = 50
+
+CONTENT_TYPES = ["all", "short", "long"]
+ANY = "*"
+
+# Mid-points of MockLLMClient's per-post reach / save / conversion ranges, so predicted
+# impressions, saves and redemptions are ranked against what peers would be expected to get.
+REACH_RATE = 0.25
+SAVE_RATE = 0.05
+CONVERSION_RATE = 0.0125
+REDEMPTION_RATE = 0.6
+
+BASELINE_METRICS = {
+    "followers": lambda p: p["followers"],
+    "completion_rate": lambda p: p["detailed_metrics"]["engagement_quality"]["completion_rate"],
+    "comment_sentiment_quality": lambda p: p["detailed_metrics"]["engagement_quality"]["comment_sentiment_quality"],
+    "audience_quality_score": lambda p: p["detailed_metrics"]["audience_credibility"]["audience_quality_score"],
+    "promo_redemption_rate": lambda p: p["detailed_metrics"]["intent_conversion"]["promo_redemption_rate"],
+    "retention_score": lambda p: p["detailed_metrics"]["consistency_loyalty"]["retention_score"],
+    "brand_safety_score": lambda p: p["detailed_metrics"]["brand_readiness"]["brand_safety_score"],
+    "predicted_growth_6m": lambda p: p["detailed_metrics"]["growth_momentum"]["predicted_growth_6m"],
+    "predicted_roi": lambda p: p["detailed_metrics"]["roi_forecasting"]["predicted_roi"],
+    "expected_impressions": lambda p: p["followers"] * REACH_RATE,
+    "expected_saves": lambda p: p["followers"] * REACH_RATE * SAVE_RATE,
+    "expected_redemptions": lambda p: p["followers"] * REACH_RATE * CONVERSION_RATE * REDEMPTION_RATE,
+}
+
+
+class QuantileSketch:
+    """
+    Fixed-size uniform reservoir kept sorted.
+    add() is O(capacity) worst case (one list insert), percentile()/quantile() are O(log capacity).
+    Seeded, so the same stream of values always produces the same table.
+    """
+
+    def __init__(self, capacity: int = SKETCH_CAPACITY, seed: int = 0):
+        self.capacity = capacity
+        self.count = 0
+        self.samples: List[float] = []
+        self._rng = random.Random(seed)
+
+    def add(self, value: float):
+        self.count += 1
+        if len(self.samples) < self.capacity:
+            bisect.insort(self.samples, value)
+            return
+        # Reservoir sampling: keep the new value with probability capacity / count
+        if self._rng.randrange(self.count) < self.capacity:
+            del self.samples[self._rng.randrange(self.capacity)]
+            bisect.insort(self.samples, value)
+
+    def add_many(self, values: List[float]):
+        """Bulk load: one uniform sample + one sort instead of an insort per value."""
+        if self.count:
+            for value in values:
+                self.add(value)
+            return
+        self.count = len(values)
+        self.samples = sorted(values if len(values) <= self.capacity else self._rng.sample(values, self.capacity))
+
+    def percentile(self, value: float) -> float:
+        """Mid-rank percentile of value (0-100); ties count half."""
+        lo = bisect.bisect_left(self.samples, value)
+        hi = bisect.bisect_right(self.samples, value)
+        return 100.0 * (lo + hi) / (2 * len(self.samples))
+
+    def quantile(self, q: float) -> float:
+        idx = min(len(self.samples) - 1, max(0, int(q * len(self.samples))))
+        return self.samples[idx]
+
+
+class BaselineStore:
+    """
+    Per niche x platform x content_type percentile tables over a generated population.
+    Each profile is recorded at three levels -- (niche, platform, ct), (niche, *, ct), (*, *, ct) --
+    so sparse segments fall back to a coarser peer group instead of returning noise.
+    """
+
+    def __init__(self, population_per_content_type: int = POPULATION_PER_CONTENT_TYPE):
+        self.population_per_content_type = population_per_content_type
+        self._tables: Dict[Tuple[str, str, str], Dict[str, QuantileSketch]] = {}
+        self._seen = set()
+        self._lock = threading.Lock()
+        self._built = False
+        self.stats = {"population": 0, "observed": 0, "lookups": 0, "fallbacks": 0}
+
+    def _sketch(self, segment: Tuple[str, str, str], metric: str) -> QuantileSketch:
+        table = self._tables.setdefault(segment, {})
+        sketch = table.get(metric)
+        if sketch is None:
+            sketch = table[metric] = QuantileSketch(seed=zlib.crc32("|".join((*segment, metric)).encode("utf-8")))
+        return sketch
+
+    def _segments(self, profile: Dict[str, Any], content_type: str):
+        niche, platform = profile["niche"], profile["platform"]
+        return ((niche, platform, content_type), (niche, ANY, content_type), (ANY, ANY, content_type))
+
+    def _add_profile(self, profile: Dict[str, Any], content_type: str) -> bool:
+        if (profile["id"], content_type) in self._seen:
+            return False
+        self._seen.add((profile["id"], content_type))
+        for segment in self._segments(profile, content_type):
+            for metric, extract in BASELINE_METRICS.items():
+                self._sketch(segment, metric).add(float(extract(profile)))
+        return True
+
+    def ensure_built(self):
+        """Generates the reference population once. Safe to call from several threads."""
+        if self._built:
+            return
+        with self._lock:
+            if self._built:
+                return
+            gen = DataGenerator()
+            columns: Dict[Tuple[Tuple[str, str, str], str], List[float]] = {}
+            for content_type in CONTENT_TYPES:
+                for i in range(self.population_per_content_type):
+                    profile = gen.generate_influencer(f"baseline-{content_type}-{i}", content_type)
+                    self._seen.add((profile["id"], content_type))
+                    values = [float(extract(profile)) for extract in BASELINE_METRICS.values()]
+                    for segment in self._segments(profile, content_type):
+                        for metric, value in zip(BASELINE_METRICS, values):
+                            columns.setdefault((segment, metric), []).append(value)
+            for (segment, metric), values in columns.items():
+                self._sketch(segment, metric).add_many(values)
+            self.stats["population"] = len(self._seen)
+            self._built = True
+
+    def observe(self, profile: Dict[str, Any], content_type: str = "all"):
+        """Folds an evaluated profile into the tables (once per id and content_type)."""
+        if not ENABLED:
+            return
+        self.ensure_built()
+        with self._lock:
+            if self._add_profile(profile, content_type):
+                self.stats["observed"] += 1
+
+    def _lookup(self, niche: str, platform: str, content_type: str, metric: str) -> Optional[QuantileSketch]:
+        content_type = content_type if content_type in CONTENT_TYPES else "all"
+        for i, segment in enumerate(((niche, platform, content_type), (niche, ANY, content_type), (ANY, ANY, content_type))):
+            sketch = self._tables.get(segment, {}).get(metric)
+            if sketch is not None and len(sketch.samples) >= MIN_SEGMENT_SAMPLES:
+                if i:
+                    self.stats["fallbacks"] += 1
+                return sketch
+        return None
+
+    def percentile(self, niche: str, platform: str, content_type: str, metric: str, value: float) -> Optional[float]:
+        """Percentile (0-100) of value among peers, or None if there is no baseline for the metric."""
+        if not ENABLED:
+            return None
+        self.ensure_built()
+        self.stats["lookups"] += 1
+        sketch = self._lookup(niche, platform, content_type, metric)
+        return None if sketch is None else sketch.percentile(float(value))
+
+    def median(self, niche: str, platform: str, content_type: str, metric: str) -> Optional[float]:
+        self.ensure_built()
+        sketch = self._lookup(niche, platform, content_type, metric)
+        return None if sketch is None else sketch.quantile(0.5)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "enabled": ENABLED, "built": self._built, "segments": len(self._tables),
+                "metrics": list(BASELINE_METRICS), "sketch_capacity": SKETCH_CAPACITY}
+
+
+baselines = BaselineStore()
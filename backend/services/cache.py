@@ -1,4 +1,16 @@
-from typing import Dict, Any, Optional
+import itertools
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Any, Iterator, Optional, Tuple
+
+# Entries younger than FRESH_TTL_S are served as-is. Older ones are served stale while a single
+# background refresh runs; past MAX_STALE_S they are treated as a miss.
+FRESH_TTL_S = float(os.environ.get("EVAL_CACHE_TTL_S", 900))
+MAX_STALE_S = float(os.environ.get("EVAL_CACHE_MAX_STALE_S", 86400))
+# Least recently used entries are evicted beyond this many
+MAX_ENTRIES = int(os.environ.get("EVAL_CACHE_MAX_ENTRIES", 10000))
 
 class EvaluationCache:
     _instance = None
@@ -7,16 +19,130 @@ class EvaluationCache:
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(EvaluationCache, cls).__new__(cls)
-            cls._store = {}
+            cls._store = OrderedDict()
+            cls._stored_at: Dict[str, float] = {}
+            cls._versions: Dict[str, int] = {}
+            # Versions come from one process-wide counter, so a key written again after
+            # eviction never reuses a version (and an ETag) it had before
+            cls._version_counter = itertools.count(1)
+            cls._refreshing = set()
+            cls._lock = threading.Lock()
+            cls.fresh_ttl_s = FRESH_TTL_S
+            cls.max_stale_s = MAX_STALE_S
+            cls.max_entries = MAX_ENTRIES
+            cls.stats = {"fresh_hits": 0, "stale_serves": 0, "misses": 0, "expired": 0, "evicted": 0,
+                         "background_refreshes": 0, "refresh_failures": 0, "invalidated": 0}
         return cls._instance
 
+    def age(self, key: str) -> Optional[float]:
+        stored_at = self._stored_at.get(key)
+        return None if stored_at is None else time.monotonic() - stored_at
+
+    def get_with_freshness(self, key: str) -> Tuple[Optional[Any], Optional[str]]:
+        """
+        Returns (value, "fresh" | "stale"), or (None, None) on a miss.
+        Entries older than max_stale_s are dropped and count as a miss.
+        """
+        value = self._store.get(key)
+        if value is None:
+            self.stats["misses"] += 1
+            return None, None
+
+        age = self.age(key) or 0.0
+        if age > self.max_stale_s:
+            self.stats["expired"] += 1
+            self.pop(key)
+            return None, None
+        self._touch(key)
+        if age > self.fresh_ttl_s:
+            self.stats["stale_serves"] += 1
+            return value, "stale"
+        self.stats["fresh_hits"] += 1
+        return value, "fresh"
+
     def get(self, key: str) -> Optional[Any]:
-        return self._store.get(key)
+        """Fresh or stale value (within the hard max age), without touching freshness stats."""
+        value = self._store.get(key)
+        if value is None or (self.age(key) or 0.0) > self.max_stale_s:
+            return None
+        self._touch(key)
+        return value
 
     def set(self, key: str, value: Any):
-        self._store[key] = value
+        with self._lock:
+            self._store[key] = value
+            self._store.move_to_end(key)
+            self._stored_at[key] = time.monotonic()
+            self._versions[key] = next(self._version_counter)
+            while len(self._store) > self.max_entries:
+                oldest, _ = self._store.popitem(last=False)
+                self._stored_at.pop(oldest, None)
+                self._versions.pop(oldest, None)
+                self.stats["evicted"] += 1
+
+    def pop(self, key: str) -> Optional[Any]:
+        """Removes one entry (e.g. handed over to another node)."""
+        with self._lock:
+            self._stored_at.pop(key, None)
+            self._versions.pop(key, None)
+            return self._store.pop(key, None)
+
+    def _touch(self, key: str):
+        with self._lock:
+            if key in self._store:
+                self._store.move_to_end(key)
+
+    def _reap(self):
+        """Drops every entry past max_stale_s."""
+        now = time.monotonic()
+        with self._lock:
+            expired = [key for key, stored_at in self._stored_at.items() if now - stored_at > self.max_stale_s]
+        for key in expired:
+            self.pop(key)
+        self.stats["expired"] += len(expired)
+
+    def evict(self, predicate: Callable[[str, Any], bool]) -> int:
+        """Targeted invalidation: removes the entries for which predicate(key, value) is true; returns how many."""
+        keys = [key for key, value in self.items() if predicate(key, value)]
+        for key in keys:
+            self.pop(key)
+        self.stats["invalidated"] += len(keys)
+        return len(keys)
+
+    def version(self, key: str) -> int:
+        """Changes on every write to the key; lets validators (ETags) change when the entry is refreshed."""
+        return self._versions.get(key, 0)
+
+    def begin_refresh(self, key: str) -> bool:
+        """Per-key refresh lock. True if the caller now owns the refresh, False if one is already running."""
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            self.stats["background_refreshes"] += 1
+            return True
+
+    def end_refresh(self, key: str, ok: bool = True):
+        with self._lock:
+            self._refreshing.discard(key)
+            if not ok:
+                self.stats["refresh_failures"] += 1
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        """Snapshot iteration over live entries (safe against concurrent writes); expired ones are reaped first."""
+        self._reap()
+        with self._lock:
+            return iter(list(self._store.items()))
+
+    def get_stats(self) -> Dict[str, Any]:
+        self._reap()
+        return {**self.stats, "entries": len(self._store), "refreshing": len(self._refreshing),
+                "fresh_ttl_s": self.fresh_ttl_s, "max_stale_s": self.max_stale_s, "max_entries": self.max_entries}
 
     def clear(self):
-        self._store = {}
+        with self._lock:
+            self._store = OrderedDict()
+            self._stored_at = {}
+            self._versions = {}
 
 cache = EvaluationCache()
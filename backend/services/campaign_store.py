@@ -0,0 +1,94 @@
+import json
+import os
+import threading
+import uuid
+from typing import Dict, Any, List, Optional
+
+from ai_engine.orchestrator import orchestrator
+from backend.services.data_generator import DataGenerator, GENERATOR_VERSION
+
+# Optional write-through persistence (JSON file); in-memory only when unset
+CAMPAIGN_STORE_PATH = os.environ.get("CAMPAIGN_STORE_PATH")
+
+# Used by /evaluate/demo and /chat when no campaign_id is given, so those requests share cache entries
+DEFAULT_CAMPAIGN_ID = "demo"
+
+
+def evaluation_key(influencer_id: str, campaign_id: str, content_type: str) -> str:
+    """
+    Evaluation cache key: one entry per (influencer, campaign, content type), for the current LLM model,
+    analyst prompts (orchestrator.cache_version) and generator version. Entries produced under another
+    version are never looked up again.
+    """
+    return f"{influencer_id}|{campaign_id}|{content_type}|{orchestrator.cache_version}-g{GENERATOR_VERSION}"
+
+
+def evaluation_key_parts(key: str) -> Dict[str, str]:
+    influencer_id, campaign_id, content_type, version = (key.split("|") + [""] * 4)[:4]
+    return {"influencer_id": influencer_id, "campaign_id": campaign_id, "content_type": content_type, "version": version}
+
+
+def evaluation_current(key: str, result: Any) -> bool:
+    """True if a cached entry was produced by the current model, generator and prompts (including the conditional ones)."""
+    return key.endswith(f"|{orchestrator.cache_version}-g{GENERATOR_VERSION}") and orchestrator.is_current(result)
+
+
+class CampaignStore:
+    """
+    Campaign briefs indexed by ID (dict lookup), plus a per-category index for filtered listing.
+    Insertion order is kept for listing.
+    """
+
+    def __init__(self, path: Optional[str] = CAMPAIGN_STORE_PATH):
+        self.path = path
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self._by_category: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+
+        if path and os.path.exists(path):
+            with open(path, "r") as f:
+                for campaign in json.load(f):
+                    self._index(campaign)
+        if DEFAULT_CAMPAIGN_ID not in self._by_id:
+            # Deterministic brief (fixed generator seed) so the default campaign is the same on every start
+            self._index({**DataGenerator(seed=42).generate_campaign_brief(), "id": DEFAULT_CAMPAIGN_ID})
+
+    def _index(self, campaign: Dict[str, Any]):
+        self._by_id[campaign["id"]] = campaign
+        self._by_category.setdefault(campaign.get("category"), []).append(campaign["id"])
+
+    def _save(self):
+        if not self.path:
+            return
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(list(self._by_id.values()), f)
+        os.replace(tmp, self.path)
+
+    def create(self, brief: Dict[str, Any]) -> Dict[str, Any]:
+        """Stores a brief under a new ID. Campaigns are immutable once created (cached evaluations refer to them)."""
+        campaign = {**brief, "id": str(uuid.uuid4())}
+        with self._lock:
+            self._index(campaign)
+            self._save()
+        return campaign
+
+    def add(self, campaign: Dict[str, Any]):
+        """Stores a campaign under its existing ID (replicated from another node); no-op if already known."""
+        with self._lock:
+            if campaign["id"] not in self._by_id:
+                self._index(campaign)
+                self._save()
+
+    def get(self, campaign_id: str) -> Optional[Dict[str, Any]]:
+        return self._by_id.get(campaign_id)
+
+    def list(self, category: str = None, offset: int = 0, limit: int = 50) -> List[Dict[str, Any]]:
+        ids = self._by_category.get(category, []) if category else list(self._by_id)
+        return [self._by_id[i] for i in ids[offset:offset + limit]]
+
+    def count(self, category: str = None) -> int:
+        return len(self._by_category.get(category, [])) if category else len(self._by_id)
+
+
+campaign_store = CampaignStore()
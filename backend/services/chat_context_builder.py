@@ -1,4 +1,20 @@
-from typing import Dict, List, Any
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple
+
+from backend.services.context_enrichment import context_enricher
+
+# Structured contexts kept for recent evaluation results (shared by /chat/ and /dashboard/)
+CHAT_CONTEXT_CACHE_SIZE = int(os.environ.get("CHAT_CONTEXT_CACHE_SIZE", 1024))
+
+CATEGORY_TITLES = {
+    "Attention": "Attention Analysis",
+    "Virality": "Virality Assessment",
+    "Conversion": "Conversion Potential",
+    "Risk": "Risk Evaluation",
+    "Audience": "Audience Analysis",
+}
 
 def build_chat_context(evaluation_result: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -23,7 +39,7 @@ def build_chat_context(evaluation_result: Dict[str, Any]) -> Dict[str, Any]:
     # Simple logic for conclusion
     avg_viewed = get_kpi("avg_percentage_viewed")
     if avg_viewed:
-        val = int(avg_viewed["value"].strip('%'))
+        val = float(avg_viewed["value"].strip("%"))
         if val > 40:
             attention_conclusion = "Strong depth of viewing indicates high content resonance."
         elif val < 20:
@@ -144,3 +160,68 @@ def build_chat_context(evaluation_result: Dict[str, Any]) -> Dict[str, Any]:
     }
 
     return structured_context
+
+
+# id(evaluation result) -> (result, structured context); the result is kept so its id can't be reused
+_contexts: "OrderedDict[int, Tuple[Dict[str, Any], Dict[str, Any]]]" = OrderedDict()
+_contexts_lock = threading.Lock()
+
+
+def chat_context_for(evaluation_result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    build_chat_context memoized per evaluation result object. Cached evaluations are shared and
+    never mutated, so every session and the dashboard reuse one structured context until the
+    cache entry is replaced.
+    """
+    key = id(evaluation_result)
+    with _contexts_lock:
+        entry = _contexts.get(key)
+        if entry is not None and entry[0] is evaluation_result:
+            _contexts.move_to_end(key)
+            return entry[1]
+    context = build_chat_context(evaluation_result)
+    with _contexts_lock:
+        _contexts[key] = (evaluation_result, context)
+        if len(_contexts) > CHAT_CONTEXT_CACHE_SIZE:
+            _contexts.popitem(last=False)
+    return context
+
+
+def category_card(context: Dict[str, Any], category_name: str, title: str) -> Optional[Dict[str, Any]]:
+    """The chat's analysis card for one category of the structured context (None if the category is missing)."""
+    cat = context.get("categories", {}).get(category_name)
+    if not cat:
+        return None
+
+    # Extract verdict from conclusion (simple heuristic or passed context)
+    verdict = "Neutral"
+    if "Strong" in cat['conclusion'] or "High" in cat['conclusion']: verdict = "Positive"
+    if "Low" in cat['conclusion'] or "fail" in cat['conclusion'] or "Risk" in cat['conclusion']: verdict = "Concern"
+
+    return {
+        "type": "analysis_card",
+        "title": title,
+        "verdict": verdict,
+        "content": cat['conclusion'],
+        "metrics": [{"label": m['kpi_id'].replace('_', ' ').title(), "value": str(m['value'])} for m in cat["metrics"]]
+    }
+
+
+def category_cards(context: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Analysis cards for every category, as the chat would answer a broad question about each."""
+    cards = {name: category_card(context, name, title) for name, title in CATEGORY_TITLES.items()}
+    return {name: card for name, card in cards.items() if card}
+
+
+def consultant_card(context: Dict[str, Any], metric: Dict[str, Any]) -> Dict[str, Any]:
+    """ContextEnricher's consultant card for one KPI, as returned by the chat for metric questions."""
+    enriched = context_enricher.enrich_metric(
+        metric_key=metric['kpi_id'],
+        value=metric['value'],
+        score_normalized=metric['score_normalized'] if 'score_normalized' in metric else 75, # Fallback if score missing
+        category=context.get("niche", "General"),
+        goal=context.get("goal", "Awareness")
+    )
+    # Add type for frontend usage if needed, though frontend detects by 'metric_name' existence
+    enriched["type"] = "consultant_card"
+    return enriched
@@ -0,0 +1,146 @@
+import json
+import math
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
+
+# Query keywords -> context categories they need.
+# Mirrors the routing in MockLLMClient.chat so a sliced context still answers the query.
+CATEGORY_KEYWORDS = {
+    "Attention": ["attention", "hook", "view", "watch", "completion", "stay", "swipe", "duration"],
+    "Virality": ["viral", "reach", "save", "share"],
+    "Conversion": ["roi", "money", "revenue", "convert", "sale", "redemption", "code", "cpa"],
+    "Risk": ["risk", "bot", "safety", "scam", "fraud", "fake", "controversy"],
+    "Audience": ["audience", "fan", "demographic", "engagement", "interact", "like", "comment", "sentiment"],
+}
+
+SUMMARY_MAX_TOKENS = 150
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 chars per token for English/JSON)."""
+    return math.ceil(len(text) / 4) if text else 0
+
+
+def _summarize_turn(turn: Dict[str, Any]) -> str:
+    """One-line summary of a turn. Assistant replies are JSON cards, so keep title/verdict only."""
+    if turn["role"] == "user":
+        return f"User asked: {turn['content'][:80]}"
+    try:
+        card = json.loads(turn["content"])
+        label = card.get("title") or card.get("metric_name") or "answer"
+        verdict = card.get("verdict") or card.get("value") or ""
+        return f"Assistant answered {label} ({verdict})"
+    except (ValueError, AttributeError):
+        return f"Assistant answered: {turn['content'][:80]}"
+
+
+class ChatSession:
+    def __init__(self, session_id: str, influencer_id: str):
+        self.session_id = session_id
+        self.influencer_id = influencer_id
+        self.turns: List[Dict[str, Any]] = []
+        self.summary_lines: List[str] = []
+        self.structured_context: Optional[Dict[str, Any]] = None
+        self.evaluation: Optional[Dict[str, Any]] = None
+        self.last_active = time.monotonic()
+
+    def add_turn(self, role: str, content: str):
+        self.turns.append({"role": role, "content": content, "tokens": estimate_tokens(content)})
+        self.last_active = time.monotonic()
+
+    def history_tokens(self) -> int:
+        return sum(t["tokens"] for t in self.turns)
+
+    def compact(self, token_budget: int):
+        """
+        Folds the oldest turns into the running summary until the verbatim history fits the budget.
+        The summary itself is capped so it can't grow without bound either.
+        """
+        while self.turns and self.history_tokens() > token_budget:
+            self.summary_lines.append(_summarize_turn(self.turns.pop(0)))
+
+        while self.summary_lines and estimate_tokens(" ".join(self.summary_lines)) > SUMMARY_MAX_TOKENS:
+            self.summary_lines.pop(0)
+
+
+class ChatSessionStore:
+    """
+    Server-side conversation state for /chat/.
+    - LRU bounded by max_sessions
+    - Sessions idle longer than idle_timeout_s are dropped
+    - History is compacted to a token budget before every turn
+    """
+
+    def __init__(self, max_sessions: int = 1000, idle_timeout_s: float = 1800, history_token_budget: int = 800):
+        self.max_sessions = max_sessions
+        self.idle_timeout_s = idle_timeout_s
+        self.history_token_budget = history_token_budget
+        self._sessions: "OrderedDict[str, ChatSession]" = OrderedDict()
+
+    def _evict_idle(self):
+        now = time.monotonic()
+        # Oldest-used sessions are at the front, so we can stop at the first live one
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if now - session.last_active <= self.idle_timeout_s:
+                break
+            del self._sessions[session_id]
+
+    def get_or_create(self, session_id: Optional[str], influencer_id: str) -> ChatSession:
+        self._evict_idle()
+
+        session = self._sessions.get(session_id) if session_id else None
+        if session is None or session.influencer_id != influencer_id:
+            session = ChatSession(session_id or str(uuid.uuid4()), influencer_id)
+            self._sessions[session.session_id] = session
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+        self._sessions.move_to_end(session.session_id)
+        session.last_active = time.monotonic()
+        return session
+
+    def drop(self, session_id: str):
+        self._sessions.pop(session_id, None)
+
+    def build_turn_context(self, session: ChatSession, query: str) -> Dict[str, Any]:
+        """
+        Context for one chat turn: only the categories relevant to the query,
+        plus the budgeted history and rolling summary.
+        """
+        session.compact(self.history_token_budget)
+        full = session.structured_context or {}
+        categories = full.get("categories", {})
+
+        query_lower = query.lower()
+        relevant = [
+            name for name, words in CATEGORY_KEYWORDS.items()
+            if name in categories and any(w in query_lower for w in words)
+        ]
+        if relevant:
+            sliced = {name: categories[name] for name in relevant}
+        else:
+            # Nothing matched: conclusions only, metrics are the bulky part
+            sliced = {name: {"metrics": [], "conclusion": cat["conclusion"]} for name, cat in categories.items()}
+
+        return {
+            "influencer_id": full.get("influencer_id"),
+            "niche": full.get("niche", "General"),
+            "goal": full.get("goal", "Awareness"),
+            "categories": sliced,
+            "executive_summary": full.get("executive_summary", "No summary available."),
+            "history_summary": " ".join(session.summary_lines),
+            "history": [{"role": t["role"], "content": t["content"]} for t in session.turns],
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "active_sessions": len(self._sessions),
+            "max_sessions": self.max_sessions,
+            "history_token_budget": self.history_token_budget,
+        }
+
+# Global instance
+session_store = ChatSessionStore()
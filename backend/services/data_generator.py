@@ -1,13 +1,18 @@
 import random
 import uuid
 import json
-import hashlib
 from typing import List, Dict
 
+from ai_engine.deterministic_rng import RNG_VERSION, profile_rng
+
 # Niches and Platforms
 NICHES = ["Tech", "Beauty", "Fitness", "Gaming", "Fashion", "Food", "Travel"]
 PLATFORMS = ["Instagram", "TikTok", "YouTube"]
 
+# Bump whenever generate_influencer / get_top_influencers output changes for the same ID.
+# Used in HTTP validators (ETags) and cache keys.
+GENERATOR_VERSION = f"1-rng{RNG_VERSION}"
+
 class DataGenerator:
     def __init__(self, seed: int = 42):
         self.seed = seed
@@ -28,9 +33,7 @@ class DataGenerator:
             influencer_id = str(uuid.UUID(int=self.rng.getrandbits(128)))
         
         # Seed the RNG with the influencer ID for determinism
-        seed_int = int(hashlib.md5(influencer_id.encode('utf-8')).hexdigest(), 16)
-        local_seed = seed_int % 1000000 
-        local_rng = random.Random(local_seed)
+        local_rng = profile_rng(influencer_id)
 
         niche = local_rng.choice(NICHES)
         platform = local_rng.choice(PLATFORMS)
@@ -0,0 +1,123 @@
+from typing import Dict, Any, Iterable, Iterator, List
+
+from backend.services.cache import cache
+
+# Optional analytics dependency
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+EXPORT_FORMATS = ("arrow", "parquet")
+DEFAULT_CHUNK_ROWS = 8192
+
+# One row per (influencer, campaign, content_type, kpi_id).
+# KPI `value` is mixed-type in KPIResult.json (number | string), so it is split into
+# a numeric column (null for strings) and its display string.
+# Low-cardinality columns stay plain strings: Parquet dictionary-encodes them on write, and
+# Arrow IPC files can't carry per-chunk dictionaries.
+if PYARROW_AVAILABLE:
+    EXPORT_SCHEMA = pa.schema([
+        ("influencer_id", pa.string()),
+        ("campaign_id", pa.string()),
+        ("content_type", pa.string()),
+        ("niche", pa.string()),
+        ("goal", pa.string()),
+        ("decision", pa.string()),
+        ("risk_level", pa.string()),
+        ("kpi_id", pa.string()),
+        ("value_numeric", pa.float64()),
+        ("value_text", pa.string()),
+        ("score_normalized", pa.float64()),
+        ("confidence_score", pa.float64()),
+        ("explanation", pa.string()),
+    ])
+
+
+def _rows(results: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    for result in results:
+        decision = result.get("decision_summary") or {}
+        if not isinstance(decision, dict):
+            decision = {}
+        for kpi in result.get("kpis", []):
+            value = kpi.get("value")
+            yield {
+                "influencer_id": result.get("influencer_id"),
+                "campaign_id": result.get("campaign_id"),
+                "content_type": result.get("content_type", "all"),
+                "niche": result.get("niche"),
+                "goal": result.get("goal"),
+                "decision": decision.get("decision"),
+                "risk_level": decision.get("risk_level"),
+                "kpi_id": kpi.get("kpi_id"),
+                "value_numeric": float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else None,
+                "value_text": str(value),
+                "score_normalized": kpi.get("score_normalized"),
+                "confidence_score": kpi.get("confidence_score"),
+                "explanation": kpi.get("explanation"),
+            }
+
+
+def iter_record_batches(results: Iterable[Dict[str, Any]], chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator["pa.RecordBatch"]:
+    """Converts evaluation results into record batches of at most chunk_rows rows."""
+    names = EXPORT_SCHEMA.names
+    columns: Dict[str, List[Any]] = {n: [] for n in names}
+    count = 0
+    for row in _rows(results):
+        for n in names:
+            columns[n].append(row[n])
+        count += 1
+        if count == chunk_rows:
+            yield pa.RecordBatch.from_pydict(columns, schema=EXPORT_SCHEMA)
+            columns = {n: [] for n in names}
+            count = 0
+    if count:
+        yield pa.RecordBatch.from_pydict(columns, schema=EXPORT_SCHEMA)
+
+
+def cached_results() -> Iterator[Dict[str, Any]]:
+    """All orchestrator results currently held by the evaluation cache."""
+    for _, result in cache.items():
+        if isinstance(result, dict) and "kpis" in result:
+            yield result
+
+
+def export_evaluations(path: str, fmt: str = "parquet", results: Iterable[Dict[str, Any]] = None,
+                       chunk_rows: int = DEFAULT_CHUNK_ROWS) -> int:
+    """
+    Streams evaluation results to a columnar file, one chunk in memory at a time.
+    Returns the number of rows written.
+    """
+    if not PYARROW_AVAILABLE:
+        raise RuntimeError("pyarrow is not installed. Run `pip install pyarrow` to enable exports.")
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}'. Expected one of {EXPORT_FORMATS}")
+
+    results = cached_results() if results is None else results
+    rows = 0
+    if fmt == "parquet":
+        with pq.ParquetWriter(path, EXPORT_SCHEMA, compression="zstd") as writer:
+            for batch in iter_record_batches(results, chunk_rows):
+                writer.write_batch(batch)
+                rows += batch.num_rows
+    else:
+        with pa.OSFile(path, "wb") as sink, pa_ipc.new_file(sink, EXPORT_SCHEMA) as writer:
+            for batch in iter_record_batches(results, chunk_rows):
+                writer.write_batch(batch)
+                rows += batch.num_rows
+    return rows
+
+
+def read_export(path: str) -> "pa.Table":
+    """
+    Consumer-side reader. Arrow IPC files are memory-mapped (zero-copy);
+    Parquet is read with memory mapping enabled.
+    """
+    if not PYARROW_AVAILABLE:
+        raise RuntimeError("pyarrow is not installed. Run `pip install pyarrow` to read exports.")
+    if path.endswith(".parquet"):
+        return pq.read_table(path, memory_map=True)
+    return pa_ipc.open_file(pa.memory_map(path, "r")).read_all()
@@ -0,0 +1,39 @@
+import hashlib
+import uuid
+from typing import Any
+
+from fastapi import Request
+from fastapi.responses import Response
+
+# Deterministic mock data: browsers/CDNs may reuse it for an hour without asking
+STATIC_CACHE_CONTROL = "public, max-age=3600"
+# Evaluations can be refreshed in the background: always revalidate (cheap with a 304)
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+# Per-process nonce for validators built on in-memory counters, which restart at 0 on reboot
+PROCESS_NONCE = uuid.uuid4().hex[:12]
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Strong ETag from the inputs that fully determine a response body. For negotiated responses
+    that includes the representation (wire_format.representation): each format and content-coding
+    has different bytes, so it needs its own strong validator.
+    """
+    digest = hashlib.blake2b("|".join(str(p) for p in parts).encode("utf-8"), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match check (weak comparison, as RFC 9110 specifies for this header)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [c.strip() for c in header.split(",")]
+    return any(c == etag or c == f"W/{etag}" for c in candidates)
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
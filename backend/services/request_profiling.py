@@ -0,0 +1,41 @@
+from ai_engine.profiling import profiler
+from backend.services.access import token_matches, ADMIN_TOKEN, ADMIN_TOKEN_HEADER
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_ID_HEADER = b"x-profile-id"
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware tracking requests for the opt-in profiler (PROFILING=1): a sampled fraction is
+    profiled from the start, X-Profile: 1 with the admin token forces it (and the response carries
+    X-Profile-Id), and requests that turn out slow are captured. A no-op when profiling is off.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not profiler.enabled or scope["path"].startswith("/profiling"):
+            return await self.app(scope, receive, send)
+
+        headers = dict(scope["headers"])
+        forced = (headers.get(PROFILE_HEADER, b"0") not in (b"", b"0")
+                  and token_matches(headers.get(ADMIN_TOKEN_HEADER.encode(), b"").decode("latin-1"), ADMIN_TOKEN))
+        profile = profiler.begin(scope["method"], scope["path"], forced)
+        status = 500
+
+        async def send_tracked(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if forced:
+                    message = {**message, "headers": [*message.get("headers", []), (PROFILE_ID_HEADER, str(profile.id).encode())]}
+            await send(message)
+
+        token = profiler.activate(profile)
+        try:
+            await self.app(scope, receive, send_tracked)
+        finally:
+            profiler.deactivate(token)
+            profiler.end(profile, status)
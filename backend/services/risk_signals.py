@@ -0,0 +1,423 @@
+import csv
+import gzip
+import json
+import math
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Iterable, Iterator, Tuple
+
+from ai_engine.deterministic_rng import risk_events_rng
+from backend.services.timeseries import history_store
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Optional event file (JSONL or CSV, optionally .gz) ingested at startup; other streams are generated
+RISK_EVENTS_PATH = os.environ.get("RISK_EVENTS_PATH")
+# Streams held in memory. Generated streams are replayed on demand, so the least recently used one
+# makes room for a new stream; ingested streams can't be rebuilt and are never evicted
+RISK_MAX_STREAMS = int(os.environ.get("RISK_MAX_STREAMS", 100_000))
+# Smaller batches run event by event: numpy's per-call overhead outweighs the vectorized pass
+VECTORIZE_MIN_BATCH = 32
+
+# Online statistics. EWMA weight (the first events use a running mean until 1/n drops below it),
+# Huber clip of residuals in scale units so outliers barely move the baseline, and MAD -> sigma.
+ALPHA = 0.05
+HUBER_K = 2.5
+MAD_TO_SIGMA = 1.25
+WARMUP_EVENTS = 14
+# Robust z thresholds: follower jump, engagement that "followed" it, engagement spike, sentiment drop
+JUMP_Z = 4.0
+FOLLOW_Z = 2.0
+SPIKE_Z = 3.0
+SENTIMENT_DROP_Z = 2.0
+# Page CUSUM (drift k, threshold h, both in z units) on follower growth (drip-fed followers)
+# and on sentiment (sustained drop); a detector resets after each change point
+CUSUM_K = 0.5
+CUSUM_H = 6.0
+# Evidence decays per event (half-life ~70 daily events) and maps to a probability
+EVIDENCE_DECAY = 0.99
+JUMP_WEIGHT = 0.5
+DRIP_WEIGHT = 0.5
+VIRAL_WEIGHT = 0.25
+CONTROVERSY_WEIGHT = 1.0
+SENTIMENT_SHIFT_WEIGHT = 0.5
+FAKE_FOLLOWER_RANGE = (3.0, 95.0)
+BOT_EVIDENCE_SCALE = 2.0
+CONTROVERSY_RANGE = (1.0, 90.0)
+SPIKE_EVIDENCE_SCALE = 4.0
+_EPS = 1e-9
+
+# Per-stream state: constant size, one row per influencer
+FIELDS = ("n", "followers", "engagements",
+          "mean_growth", "scale_growth", "mean_engagement", "scale_engagement", "mean_sentiment", "scale_sentiment",
+          "cusum_growth", "cusum_sentiment", "bot_evidence", "spike_evidence",
+          "follower_jumps", "drip_alerts", "engagement_spikes", "controversial_spikes", "sentiment_shifts")
+
+
+class _ScalarOps:
+    """Event-at-a-time ops (fallback without numpy, and small batches)."""
+    log = staticmethod(math.log)
+    abs = staticmethod(abs)
+
+    @staticmethod
+    def clip(x, lo, hi):
+        return min(max(x, lo), hi)
+
+    @staticmethod
+    def maximum(x, y):
+        return max(x, y)
+
+    @staticmethod
+    def where(cond, x, y):
+        return x if cond else y
+
+
+class _VectorOps:
+    """Batch-at-a-time ops (numpy): one event for each of many streams."""
+
+    @staticmethod
+    def log(x):
+        return np.log(x)
+
+    @staticmethod
+    def abs(x):
+        return np.abs(x)
+
+    @staticmethod
+    def clip(x, lo, hi):
+        return np.clip(x, lo, hi)
+
+    @staticmethod
+    def maximum(x, y):
+        return np.maximum(x, y)
+
+    @staticmethod
+    def where(cond, x, y):
+        return np.where(cond, x, y)
+
+
+def _robust_update(o, mean, scale, x, n, warm):
+    """(robust z of x against the state, updated mean, updated scale). Huberized EWMA of level and MAD."""
+    z = (x - mean) / (MAD_TO_SIGMA * scale + _EPS)
+    residual = x - mean
+    residual = o.where(warm, o.clip(residual, -HUBER_K * scale, HUBER_K * scale), residual)
+    # Running means until 1/n drops below ALPHA; the scale starts from the first residual (n = 1)
+    mean = mean + o.maximum(1.0 / (n + 1), ALPHA) * residual
+    scale = o.where(n == 0, 0.0, scale + o.maximum(1.0 / o.maximum(n, 1.0), ALPHA) * (o.abs(residual) - scale))
+    return z, mean, scale
+
+
+def _step(o, state, followers, engagements, sentiment):
+    """
+    One event per stream. `state` is a tuple in FIELDS order (floats, or numpy columns for a batch);
+    returns the new state tuple. The same code runs scalar and vectorized.
+    """
+    (n, last_followers, last_engagements, m_g, s_g, m_e, s_e, m_s, s_s, cusum_g, cusum_s,
+     bot, spike, jumps, drips, spikes, controversial, shifts) = state
+    followers = o.maximum(followers, 1.0)
+    engagements = o.maximum(engagements, 1.0)
+    first = n == 0
+    warm = n >= WARMUP_EVENTS
+    has_sentiment = sentiment == sentiment  # False for NaN (no sentiment in this event)
+    sentiment = o.where(has_sentiment, sentiment, m_s)
+
+    # 1. Per-event signals: log growth of followers and of engagements
+    growth = o.log(followers / o.where(first, followers, last_followers))
+    engagement_growth = o.log(engagements / o.where(first, engagements, last_engagements))
+
+    # 2. Robust z-scores against the baselines, then baseline updates
+    z_g, new_m_g, new_s_g = _robust_update(o, m_g, s_g, growth, n, warm)
+    z_e, new_m_e, new_s_e = _robust_update(o, m_e, s_e, engagement_growth, n, warm)
+    z_s, new_m_s, new_s_s = _robust_update(o, m_s, s_s, sentiment, n, warm)
+    z_s = o.where(has_sentiment, z_s, 0.0)
+    new_m_s = o.where(has_sentiment, new_m_s, m_s)
+    new_s_s = o.where(has_sentiment, new_s_s, s_s)
+
+    # 3. Point anomalies: followers jump without engagement following (bought followers),
+    #    engagement spikes (viral), spikes with a sentiment drop (controversy)
+    jump = warm & (z_g > JUMP_Z) & (z_e < FOLLOW_Z)
+    viral = warm & (z_e > SPIKE_Z)
+    controversy = viral & (z_s < -SENTIMENT_DROP_Z)
+
+    # 4. Change points (CUSUM): sustained follower growth above baseline, sustained sentiment drop
+    cusum_g = o.where(warm, o.maximum(0.0, cusum_g + o.clip(z_g, -JUMP_Z, JUMP_Z) - CUSUM_K), 0.0)
+    drip = cusum_g > CUSUM_H
+    cusum_g = o.where(drip, 0.0, cusum_g)
+    cusum_s = o.where(warm, o.maximum(0.0, cusum_s - o.clip(z_s, -JUMP_Z, JUMP_Z) - CUSUM_K), 0.0)
+    shift = cusum_s > CUSUM_H
+    cusum_s = o.where(shift, 0.0, cusum_s)
+
+    # 5. Decayed evidence
+    bot = bot * EVIDENCE_DECAY + JUMP_WEIGHT * jump + DRIP_WEIGHT * drip
+    # A controversy is also a viral spike: it is weighted CONTROVERSY_WEIGHT in total
+    spike = (spike * EVIDENCE_DECAY + VIRAL_WEIGHT * viral + (CONTROVERSY_WEIGHT - VIRAL_WEIGHT) * controversy
+             + SENTIMENT_SHIFT_WEIGHT * shift)
+
+    return (n + 1, followers, engagements, new_m_g, new_s_g, new_m_e, new_s_e, new_m_s, new_s_s, cusum_g, cusum_s,
+            bot, spike, jumps + jump, drips + drip, spikes + viral, controversial + controversy, shifts + shift)
+
+
+class StreamCapacityExceeded(Exception):
+    """Raised when new ingested streams don't fit: the other slots all hold ingested streams."""
+
+
+def _probability(evidence: float, bounds: Tuple[float, float], scale: float) -> float:
+    lo, hi = bounds
+    return lo + (hi - lo) * (1 - math.exp(-evidence / scale))
+
+
+def _open(path: str):
+    return gzip.open(path, "rt", encoding="utf-8") if path.endswith(".gz") else open(path, "r", encoding="utf-8")
+
+
+def read_events(path: str) -> Iterator[Tuple[str, float, float, float]]:
+    """
+    (influencer_id, followers, engagements, sentiment) rows from a JSONL or CSV file, in file order.
+    Events of one influencer must be in time order. Sentiment is optional, but a stream should
+    carry it on every event or on none (its baseline starts from the first event).
+    """
+    name = path[:-3] if path.endswith(".gz") else path
+    with _open(path) as f:
+        rows = csv.DictReader(f) if name.endswith(".csv") else (json.loads(line) for line in f if line.strip())
+        for row in rows:
+            sentiment = row.get("sentiment")
+            yield (str(row["influencer_id"]), float(row["followers"]), float(row["engagements"]),
+                   float(sentiment) if sentiment not in (None, "") else math.nan)
+
+
+class RiskSignalMonitor:
+    """
+    Online bot-inflation and engagement-spike detection over per-influencer event streams
+    (followers, engagements, sentiment per day). Each stream is one constant-size state row; events
+    update it in O(1) and are never stored. A batch holding one event for each of many streams is
+    processed as numpy columns, so thousands of streams advance together on one core.
+    """
+
+    def __init__(self, vectorized: bool = True, max_streams: int = RISK_MAX_STREAMS):
+        self.vectorized = vectorized and NUMPY_AVAILABLE
+        self.max_streams = max_streams
+        self._slots: Dict[str, int] = {}
+        # Generated (replayable) streams, least recently used first: the eviction candidates
+        self._generated: "OrderedDict[str, None]" = OrderedDict()
+        self._state = np.zeros((min(1024, max_streams), len(FIELDS))) if self.vectorized else []
+        self._lock = threading.Lock()
+        self.stats = {"events": 0, "batches": 0, "generated_streams": 0, "ingested_events": 0, "evicted_streams": 0}
+
+    def _slot(self, influencer_id: str, generated: bool = False) -> int:
+        """The stream's row, allocated (or taken from the least recently used generated stream) if new."""
+        slot = self._slots.get(influencer_id)
+        if slot is not None:
+            return slot
+        if len(self._slots) < self.max_streams:
+            slot = len(self._slots)
+            if not self.vectorized:
+                self._state.append([0.0] * len(FIELDS))
+            elif slot == len(self._state):
+                self._state = np.concatenate([self._state, np.zeros_like(self._state)])
+        elif self._generated:
+            evicted, _ = self._generated.popitem(last=False)
+            slot = self._slots.pop(evicted)
+            self._state[slot] = [0.0] * len(FIELDS)
+            self.stats["evicted_streams"] += 1
+        else:
+            raise StreamCapacityExceeded(f"All {self.max_streams} risk streams hold ingested events")
+        self._slots[influencer_id] = slot
+        if generated:
+            self._generated[influencer_id] = None
+        return slot
+
+    def _check_capacity(self, influencer_ids: Iterable[str]):
+        influencer_ids = set(influencer_ids)
+        new = sum(1 for i in influencer_ids if i not in self._slots)
+        kept = sum(1 for i in influencer_ids if i in self._generated)
+        if len(self._slots) + new - self.max_streams > len(self._generated) - kept:
+            raise StreamCapacityExceeded(f"All {self.max_streams} risk streams hold ingested events")
+
+    def check_capacity(self, influencer_ids: Iterable[str]):
+        """Raises StreamCapacityExceeded unless live events for all these streams can be ingested now."""
+        with self._lock:
+            self._check_capacity(influencer_ids)
+
+    def _ingest_slots(self, influencer_ids: List[str]) -> List[int]:
+        """
+        Rows of streams receiving live events (which makes them unevictable). Raises
+        StreamCapacityExceeded, before allocating any, if the new streams don't fit.
+        """
+        self._check_capacity(influencer_ids)
+        for influencer_id in influencer_ids:
+            self._generated.pop(influencer_id, None)
+        return [self._slot(i) for i in influencer_ids]
+
+    def observe(self, influencer_id: str, followers: float, engagements: float, sentiment: float = math.nan):
+        """Folds one event into its stream."""
+        with self._lock:
+            self._observe(self._ingest_slots([influencer_id])[0], followers, engagements, sentiment)
+            self.stats["events"] += 1
+
+    def _observe(self, slot: int, followers: float, engagements: float, sentiment: float):
+        row = self._state[slot]
+        new = _step(_ScalarOps, tuple(row.tolist() if self.vectorized else row), followers, engagements, sentiment)
+        self._state[slot] = list(new)
+
+    def observe_batch(self, influencer_ids: List[str], followers, engagements, sentiments=None):
+        """
+        One event per listed stream (IDs must be distinct within a batch).
+        Column arguments may be lists or numpy arrays; missing sentiment is NaN.
+        """
+        n = len(influencer_ids)
+        if sentiments is None:
+            sentiments = [math.nan] * n
+        with self._lock:
+            slots = self._ingest_slots(influencer_ids)
+            if self.vectorized and n >= VECTORIZE_MIN_BATCH:
+                idx = np.asarray(slots)
+                state = tuple(self._state[idx].T)
+                new = _step(_VectorOps, state, np.asarray(followers, dtype=float), np.asarray(engagements, dtype=float),
+                            np.asarray(sentiments, dtype=float))
+                self._state[idx] = np.column_stack(new)
+            else:
+                for slot, f, e, s in zip(slots, followers, engagements, sentiments):
+                    self._observe(slot, float(f), float(e), float(s))
+            self.stats["events"] += n
+            self.stats["batches"] += 1
+
+    def ingest(self, events: Iterable[Tuple[str, float, float, float]], batch_size: int = 4096) -> int:
+        """
+        Feeds a time-ordered event iterable. Consecutive events are grouped into batches that
+        hold at most one event per stream, so per-stream order is preserved.
+        """
+        count = 0
+        ids, fs, es, ss, seen = [], [], [], [], set()
+        for influencer_id, f, e, s in events:
+            if influencer_id in seen or len(ids) >= batch_size:
+                self.observe_batch(ids, fs, es, ss)
+                ids, fs, es, ss, seen = [], [], [], [], set()
+            seen.add(influencer_id)
+            ids.append(influencer_id)
+            fs.append(f)
+            es.append(e)
+            ss.append(s)
+            count += 1
+        if ids:
+            self.observe_batch(ids, fs, es, ss)
+        self.stats["ingested_events"] += count
+        return count
+
+    def ingest_file(self, path: str) -> int:
+        count = self.ingest(read_events(path))
+        print(f"Ingested {count} risk events from {path} ({len(self._slots)} streams)")
+        return count
+
+    def scores(self, influencer_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            slot = self._slots.get(influencer_id)
+            if slot is None:
+                return None
+            if influencer_id in self._generated:
+                self._generated.move_to_end(influencer_id)
+            row = self._state[slot]
+            return _row_scores(row.tolist() if self.vectorized else list(row))
+
+    def profile_scores(self, profile: Dict[str, Any]) -> Dict[str, Any]:
+        """Scores for a generated profile, replaying its stream on first use (or after eviction)."""
+        scores = self.scores(profile["id"])
+        if scores is not None:
+            return scores
+        events = generated_events(profile)
+        with self._lock:
+            if profile["id"] not in self._slots:
+                try:
+                    slot = self._slot(profile["id"], generated=True)
+                except StreamCapacityExceeded:
+                    # Nothing evictable: score a replay that isn't kept
+                    row = [0.0] * len(FIELDS)
+                    for _, f, e, s in events:
+                        row = list(_step(_ScalarOps, tuple(row), f, e, s))
+                    return _row_scores(row)
+                for _, f, e, s in events:
+                    self._observe(slot, f, e, s)
+                self.stats["events"] += len(events)
+                self.stats["generated_streams"] += 1
+            row = self._state[self._slots[profile["id"]]]
+            return _row_scores(row.tolist() if self.vectorized else list(row))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "streams": len(self._slots), "generated_streams_held": len(self._generated),
+                "max_streams": self.max_streams, "vectorized": self.vectorized,
+                "state_bytes_per_stream": 8 * len(FIELDS)}
+
+
+def _row_scores(row: List[float]) -> Dict[str, Any]:
+    state = dict(zip(FIELDS, row))
+    return {
+        "events": int(state["n"]),
+        "warming_up": state["n"] < WARMUP_EVENTS,
+        "fake_follower_probability": round(_probability(state["bot_evidence"], FAKE_FOLLOWER_RANGE, BOT_EVIDENCE_SCALE), 1),
+        "controversy_probability": round(_probability(state["spike_evidence"], CONTROVERSY_RANGE, SPIKE_EVIDENCE_SCALE), 1),
+        "bot_evidence": round(state["bot_evidence"], 3),
+        "spike_evidence": round(state["spike_evidence"], 3),
+        "follower_jumps": int(state["follower_jumps"]),
+        "drip_alerts": int(state["drip_alerts"]),
+        "engagement_spikes": int(state["engagement_spikes"]),
+        "controversial_spikes": int(state["controversial_spikes"]),
+        "sentiment_shifts": int(state["sentiment_shifts"]),
+    }
+
+
+# Episode rates: bought followers get likelier as audience quality drops, controversies as brand safety drops
+BOT_EPISODE_RATE = 0.02      # per day at audience quality 0
+SPIKE_EPISODE_RATE = 0.01    # per day, organic viral spikes
+CONTROVERSY_EPISODE_RATE = 0.1  # per day at brand safety 0
+
+
+def generated_events(profile: Dict[str, Any]) -> List[Tuple[str, float, float, float]]:
+    """
+    Daily events for a generated influencer: the history from backend/services/timeseries.py with
+    bot-purchase (one-day jump or drip-fed), viral and controversy episodes injected at rates set by
+    the profile's audience quality and brand safety. Deterministic per ID.
+    """
+    history = history_store.get(profile)
+    readiness = profile["detailed_metrics"]["brand_readiness"]
+    quality = profile["detailed_metrics"]["audience_credibility"]["audience_quality_score"] / 100
+    bot_rate = BOT_EPISODE_RATE * (1 - quality) ** 2
+    controversy_rate = CONTROVERSY_EPISODE_RATE * (1 - readiness["brand_safety_score"] / 100) ** 2
+    rng = risk_events_rng(profile["id"])
+
+    events = []
+    bought, drip_days, drip_rate, spike_days, spike_mult, sentiment_drop = 1.0, 0, 0.0, 0, 1.0, 0.0
+    for day in range(len(history)):
+        # Start at most one episode per day
+        draw = rng.random()
+        if not drip_days and not spike_days:
+            if draw < bot_rate:
+                if rng.random() < 0.5:
+                    bought *= 1 + rng.uniform(0.03, 0.12)
+                else:
+                    drip_days, drip_rate = rng.randint(5, 15), rng.uniform(0.005, 0.012)
+            elif draw < bot_rate + controversy_rate:
+                spike_days, spike_mult, sentiment_drop = rng.randint(1, 3), rng.uniform(2.5, 6.0), rng.uniform(15, 35)
+            elif draw < bot_rate + controversy_rate + SPIKE_EPISODE_RATE:
+                spike_days, spike_mult, sentiment_drop = rng.randint(1, 2), rng.uniform(2.5, 5.0), 0.0
+                bought *= 1 + rng.uniform(0.005, 0.02)  # organic: a viral post also brings real followers
+        if drip_days:
+            bought *= 1 + drip_rate
+            drip_days -= 1
+
+        followers = history.followers[day] * bought
+        # Bought followers don't engage: engagements scale with the organic audience only
+        engagements = history.views[day] * history.engagement_rate[day] / 100
+        sentiment = float(history.sentiment[day])
+        if spike_days:
+            engagements *= spike_mult
+            sentiment = max(sentiment - sentiment_drop, 0.0)
+            spike_days -= 1
+        events.append((profile["id"], followers, engagements, sentiment))
+    return events
+
+
+risk_monitor = RiskSignalMonitor()
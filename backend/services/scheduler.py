@@ -0,0 +1,190 @@
+import asyncio
+import contextvars
+import math
+import os
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+
+class SchedulerSaturated(Exception):
+    """Raised when a priority class queue is full. Carries a Retry-After hint (seconds)."""
+
+    def __init__(self, priority: str, retry_after: int):
+        super().__init__(f"Evaluation queue for '{priority}' is saturated")
+        self.priority = priority
+        self.retry_after = retry_after
+
+
+class PriorityClass:
+    """
+    Configuration + live state for one priority class.
+    - weight: share of dispatch slots under contention (weighted fair queuing)
+    - max_concurrency: cap on in-flight evaluations (and therefore LLM calls) for this class
+    - max_queue: admission control limit; beyond this, requests get a 429
+    """
+
+    def __init__(self, name: str, weight: float, max_concurrency: int, max_queue: int):
+        self.name = name
+        self.weight = weight
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+
+        self.queue: Deque[Dict[str, Any]] = deque()
+        self.in_flight = 0
+        self.last_finish_tag = 0.0
+
+        # Metrics
+        self.wait_times_ms: Deque[float] = deque(maxlen=1000)
+        self.service_times_ms: Deque[float] = deque(maxlen=1000)
+        self.completed = 0
+        self.rejected = 0
+
+
+class EvaluationScheduler:
+    """
+    Routes Orchestrator.evaluate calls through per-class queues so bulk/backfill work
+    cannot starve interactive audits.
+
+    Dispatch uses weighted fair queuing: every job gets a virtual finish tag
+    (max(virtual_time, last tag of its class) + 1/weight) and the smallest tag among
+    classes with free concurrency is started next. The blocking evaluation itself runs
+    in the default thread pool so the event loop stays responsive.
+    """
+
+    DEFAULT_CLASSES = {
+        # name: (weight, max_concurrency, max_queue)
+        "interactive": (8.0, int(os.environ.get("SCHED_INTERACTIVE_CONCURRENCY", 8)), int(os.environ.get("SCHED_INTERACTIVE_QUEUE", 64))),
+        "bulk": (1.0, int(os.environ.get("SCHED_BULK_CONCURRENCY", 2)), int(os.environ.get("SCHED_BULK_QUEUE", 1000))),
+    }
+
+    def __init__(self, classes: Optional[Dict[str, tuple]] = None):
+        classes = classes or self.DEFAULT_CLASSES
+        self.classes: Dict[str, PriorityClass] = {
+            name: PriorityClass(name, *cfg) for name, cfg in classes.items()
+        }
+        self.virtual_time = 0.0
+
+    def _get_class(self, priority: str) -> PriorityClass:
+        pclass = self.classes.get(priority)
+        if pclass is None:
+            raise ValueError(f"Unknown priority class '{priority}'. Expected one of {list(self.classes)}")
+        return pclass
+
+    def _retry_after(self, pclass: PriorityClass) -> int:
+        """Estimate how long the backlog takes to drain (seconds, at least 1)."""
+        if pclass.service_times_ms:
+            avg_s = sum(pclass.service_times_ms) / len(pclass.service_times_ms) / 1000
+        else:
+            avg_s = 1.0
+        backlog = len(pclass.queue) + pclass.in_flight
+        return max(1, math.ceil(backlog * avg_s / max(1, pclass.max_concurrency)))
+
+    def admit(self, priority: str, jobs: int):
+        """
+        Whole-batch admission control: raises SchedulerSaturated unless `jobs` more submissions
+        currently fit in the class queue (so a batch is rejected up front rather than half-queued).
+        """
+        pclass = self._get_class(priority)
+        if len(pclass.queue) + jobs > pclass.max_queue:
+            pclass.rejected += 1
+            raise SchedulerSaturated(priority, self._retry_after(pclass))
+
+    async def submit(self, priority: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Queues fn(*args, **kwargs) under the given priority class and waits for its result.
+        Raises SchedulerSaturated if the class queue is full.
+        """
+        pclass = self._get_class(priority)
+
+        if len(pclass.queue) >= pclass.max_queue:
+            pclass.rejected += 1
+            raise SchedulerSaturated(priority, self._retry_after(pclass))
+
+        loop = asyncio.get_running_loop()
+        start_tag = max(self.virtual_time, pclass.last_finish_tag)
+        finish_tag = start_tag + 1.0 / pclass.weight
+        pclass.last_finish_tag = finish_tag
+
+        job = {
+            # Runs in the submitter's context, not the one of whichever request dispatches it
+            "context": contextvars.copy_context(),
+            "fn": fn,
+            "args": args,
+            "kwargs": kwargs,
+            "tag": finish_tag,
+            "enqueued_at": time.perf_counter(),
+            "future": loop.create_future(),
+        }
+        pclass.queue.append(job)
+        self._dispatch()
+
+        try:
+            return await job["future"]
+        except asyncio.CancelledError:
+            # Caller went away before dispatch: don't spend an evaluation on it
+            if job in pclass.queue:
+                pclass.queue.remove(job)
+            raise
+
+    def _dispatch(self):
+        """Starts queued jobs, smallest finish tag first, while classes have free slots."""
+        while True:
+            eligible = [
+                c for c in self.classes.values()
+                if c.queue and c.in_flight < c.max_concurrency
+            ]
+            if not eligible:
+                return
+
+            pclass = min(eligible, key=lambda c: c.queue[0]["tag"])
+            job = pclass.queue.popleft()
+            self.virtual_time = max(self.virtual_time, job["tag"])
+            pclass.in_flight += 1
+            asyncio.ensure_future(self._run(pclass, job))
+
+    async def _run(self, pclass: PriorityClass, job: Dict[str, Any]):
+        started = time.perf_counter()
+        pclass.wait_times_ms.append((started - job["enqueued_at"]) * 1000)
+
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(None, lambda: job["context"].run(job["fn"], *job["args"], **job["kwargs"]))
+            if not job["future"].done():
+                job["future"].set_result(result)
+        except Exception as e:
+            if not job["future"].done():
+                job["future"].set_exception(e)
+        finally:
+            pclass.service_times_ms.append((time.perf_counter() - started) * 1000)
+            pclass.in_flight -= 1
+            pclass.completed += 1
+            self._dispatch()
+
+    @staticmethod
+    def _percentile(samples: List[float], pct: float) -> float:
+        if not samples:
+            return 0.0
+        ordered = sorted(samples)
+        idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return round(ordered[idx], 2)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and wait-time metrics per priority class."""
+        result = {}
+        for name, c in self.classes.items():
+            waits = list(c.wait_times_ms)
+            result[name] = {
+                "queue_depth": len(c.queue),
+                "in_flight": c.in_flight,
+                "max_concurrency": c.max_concurrency,
+                "completed": c.completed,
+                "rejected": c.rejected,
+                "wait_ms_p50": self._percentile(waits, 50),
+                "wait_ms_p99": self._percentile(waits, 99),
+                "service_ms_p50": self._percentile(list(c.service_times_ms), 50),
+            }
+        return result
+
+# Global instance
+scheduler = EvaluationScheduler()
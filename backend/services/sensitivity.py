@@ -0,0 +1,241 @@
+import itertools
+import math
+import os
+import threading
+import time
+from typing import Dict, Any, List, Optional
+
+from ai_engine.decision_rules import decision_rules, kpi_number
+from ai_engine.kpi_engine import CONTENT_TYPE_LIFT, GOAL_CONVERSION_RATES, DEFAULT_BUDGET
+from backend.services.context_enrichment import context_enricher
+
+# Optional vectorized path. Without numpy the grid is swept point by point with the same kernel.
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Smaller grids run point by point: numpy's per-call overhead outweighs the vectorized pass
+VECTORIZE_MIN_BATCH = 32
+# Upper bound on budgets x goals x content types per request
+SENSITIVITY_MAX_POINTS = int(os.environ.get("SENSITIVITY_MAX_POINTS", 10000))
+
+# KPIs the rules engine decides on (all reported by the analysts)
+DECISION_INPUTS = ("brand_safety_score", "fake_follower_probability", "controversy_probability",
+                   "audience_brand_fit", "promo_code_redemptions")
+
+DECISIONS = ("NO-GO", "TEST", "GO")
+NO_GO, TEST, GO = range(3)
+
+
+class _ScalarOps:
+    """Point-at-a-time ops (fallback without numpy, small grids)."""
+    abs = staticmethod(abs)
+    floor = staticmethod(math.floor)
+
+    @staticmethod
+    def round1(x):
+        return round(x, 1)
+
+    @staticmethod
+    def where(condition, x, y):
+        return x if condition else y
+
+
+class _VectorOps:
+    """Grid-at-a-time ops (numpy). round1 agrees with round() except on exact decimal ties."""
+
+    @staticmethod
+    def abs(x):
+        return np.abs(x)
+
+    @staticmethod
+    def floor(x):
+        return np.floor(x)
+
+    @staticmethod
+    def round1(x):
+        return np.round(x, 1)
+
+    @staticmethod
+    def where(condition, x, y):
+        return np.where(condition, x, y)
+
+
+def _sweep(o, r: Dict[str, float], base: Dict[str, Any], budget, goal_rate, lift) -> Dict[str, Any]:
+    """
+    The rules engine's ROI and decision steps over grid columns (numpy) or one grid point (fallback).
+    Risk and audience fit don't depend on budget, goal or content type and come in as constants.
+    """
+    # 1. Redemptions per post scale with the goal's conversion benchmark and the content type's reach lift
+    redemptions = base["redemptions"] * (goal_rate / base["goal_rate"]) * (lift / base["lift"])
+    roi_mid = redemptions * r["avg_order_value"] / base["est_cost"]
+    spread = 1 - base["confidence"]
+    roi_min = o.round1(roi_mid * (1 - spread))
+    roi_max = o.round1(roi_mid * (1 + spread))
+
+    # 2. Decision, as DecisionRulesEngine.decide (borderline points would go to the LLM executive there)
+    if base["risk"] == "HIGH":
+        decision = NO_GO
+        borderline = base["risk_borderline"]
+    else:
+        meets = (roi_min >= r["go_roi_min"]) & (base["risk"] == "LOW") & (base["fit"] >= r["go_fit_min"])
+        decision = o.where(meets, GO, TEST)
+        borderline = base["risk_borderline"] | base["fit_borderline"] \
+            | (o.abs(roi_min - r["go_roi_min"]) < r["borderline_roi_margin"])
+
+    # 3. Posts the budget buys at the influencer's estimated cost per post
+    posts = o.floor(budget / base["est_cost"])
+    return {
+        "decision": decision,
+        "roi_min": roi_min,
+        "roi_max": roi_max,
+        "borderline": borderline,
+        "redemptions": redemptions,
+        "posts": posts,
+    }
+
+
+def _column(values, n: int) -> List[Any]:
+    if NUMPY_AVAILABLE and isinstance(values, np.ndarray):
+        return values.tolist() if values.ndim else [values.item()] * n
+    return [values] * n if not isinstance(values, list) else values
+
+
+class SensitivityAnalyzer:
+    """
+    What-if sweeps over a cached evaluation: ROI, decision and goal-dependent business implications
+    for every (budget, goal, content_type) combination, recomputed locally without LLM calls.
+    Analyst KPIs are taken as evaluated; only what the parameters move is recomputed.
+    """
+
+    def __init__(self, vectorized: bool = NUMPY_AVAILABLE):
+        self.vectorized = vectorized and NUMPY_AVAILABLE
+        self.stats = {"sweeps": 0, "points": 0, "total_ms": 0.0}
+        self._lock = threading.Lock()
+
+    def _baseline(self, evaluation: Dict[str, Any], influencer: Dict[str, Any], campaign: Dict[str, Any],
+                  content_type: str, r: Dict[str, float]) -> Dict[str, Any]:
+        """Grid-independent inputs of the sweep, read from the evaluation's KPIs."""
+        kpis = {k["kpi_id"]: k for k in evaluation.get("kpis", [])}
+        values = {kpi_id: kpi_number(kpis[kpi_id].get("value")) if kpi_id in kpis else None for kpi_id in DECISION_INPUTS}
+        est_cost = influencer["detailed_metrics"]["roi_forecasting"]["est_cost"]
+        missing = [kpi_id for kpi_id, v in values.items() if v is None]
+        if missing or not est_cost:
+            raise ValueError(f"Evaluation lacks decision inputs: {missing or ['est_cost']}")
+
+        safety, fake, controversy = (values[k] for k in DECISION_INPUTS[:3])
+        margin = r["borderline_margin"]
+        near = lambda value, threshold: abs(value - threshold) < margin
+
+        return {
+            "redemptions": values["promo_code_redemptions"],
+            "fit": values["audience_brand_fit"],
+            "confidence": round(kpis["promo_code_redemptions"].get("confidence_score", 0.8), 2),
+            "est_cost": est_cost,
+            "goal_rate": GOAL_CONVERSION_RATES.get(campaign.get("goal"), 0.02),
+            "lift": CONTENT_TYPE_LIFT.get(content_type, 1.0),
+            "risk": decision_rules.risk_level(safety, fake, controversy, r),
+            "risk_borderline": near(safety, r["brand_safety_min"]) or near(fake, r["fake_follower_max"])
+                               or near(controversy, r["controversy_high"]),
+            "fit_borderline": near(values["audience_brand_fit"], r["go_fit_min"]),
+        }
+
+    def check(self, budgets: List[float] = (), rules: Optional[Dict[str, float]] = None):
+        """Raises ValueError for unknown or non-finite rules and for budgets that aren't positive finite numbers."""
+        unknown = sorted(set(rules or {}) - set(decision_rules.rules))
+        if unknown:
+            raise ValueError(f"Unknown decision rule(s): {unknown}")
+        non_finite = sorted(k for k, v in (rules or {}).items() if not math.isfinite(v))
+        if non_finite:
+            raise ValueError(f"Decision rule(s) must be finite numbers: {non_finite}")
+        if any(not (math.isfinite(b) and b > 0) for b in budgets):
+            raise ValueError("Budgets must be positive finite numbers")
+
+    def analyze(self, evaluation: Dict[str, Any], influencer: Dict[str, Any], campaign: Dict[str, Any],
+                content_type: str, budgets: List[float] = (), goals: List[str] = (), content_types: List[str] = (),
+                rules: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """
+        One point per combination of the given budgets, goals and content types (each defaults to the
+        evaluated value). `rules` overrides decision thresholds for this sweep only.
+        Raises ValueError for invalid budgets or rules (see check()), grids over SENSITIVITY_MAX_POINTS
+        or evaluations without the decision inputs.
+        """
+        t0 = time.perf_counter()
+        self.check(budgets, rules)
+        r = {**decision_rules.rules, **(rules or {})}
+        budgets = list(budgets) or [campaign.get("budget", DEFAULT_BUDGET)]
+        goals = list(goals) or [campaign.get("goal", "Awareness")]
+        content_types = list(content_types) or [content_type]
+        n = len(budgets) * len(goals) * len(content_types)
+        if n > SENSITIVITY_MAX_POINTS:
+            raise ValueError(f"At most {SENSITIVITY_MAX_POINTS} grid points per request")
+        base = self._baseline(evaluation, influencer, campaign, content_type, r)
+
+        # 1. Flattened grid (budget-major), swept in one pass
+        grid = list(itertools.product(budgets, goals, content_types))
+        budget_col = [float(b) for b, _, _ in grid]
+        rate_col = [GOAL_CONVERSION_RATES.get(g, 0.02) for _, g, _ in grid]
+        lift_col = [CONTENT_TYPE_LIFT.get(t, 1.0) for _, _, t in grid]
+        if self.vectorized and n >= VECTORIZE_MIN_BATCH:
+            swept = _sweep(_VectorOps, r, base, np.array(budget_col), np.array(rate_col), np.array(lift_col))
+            columns = {name: _column(values, n) for name, values in swept.items()}
+        else:
+            rows = [_sweep(_ScalarOps, r, base, b, g, l) for b, g, l in zip(budget_col, rate_col, lift_col)]
+            columns = {name: [row[name] for row in rows] for name in rows[0]} if rows else {}
+
+        # 2. Goal-dependent implications: one text per KPI and distinct goal, not per point
+        implications = {
+            goal: {k["kpi_id"]: context_enricher._get_business_impact(k["kpi_id"], k.get("score_normalized", 50), goal)
+                   for k in evaluation.get("kpis", [])}
+            for goal in dict.fromkeys(goals)
+        }
+
+        confidence = base["confidence"]
+        points = [
+            {
+                "budget": b,
+                "goal": g,
+                "content_type": t,
+                "decision": DECISIONS[int(decision)],
+                "risk_level": base["risk"],
+                "roi_prediction": {"min": roi_min, "max": roi_max, "confidence": confidence},
+                "borderline": bool(borderline),
+                "predicted_redemptions_per_post": round(redemptions, 1),
+                "posts_within_budget": int(posts),
+            }
+            for (b, g, t), decision, roi_min, roi_max, borderline, redemptions, posts in zip(
+                grid, columns.get("decision", []), columns.get("roi_min", []), columns.get("roi_max", []),
+                columns.get("borderline", []), columns.get("redemptions", []), columns.get("posts", []))
+        ]
+
+        elapsed_ms = (time.perf_counter() - t0) * 1000
+        with self._lock:
+            self.stats["sweeps"] += 1
+            self.stats["points"] += n
+            self.stats["total_ms"] += elapsed_ms
+        return {
+            "evaluated": {
+                "budget": campaign.get("budget", DEFAULT_BUDGET),
+                "goal": campaign.get("goal", "Awareness"),
+                "content_type": content_type,
+                "decision": (evaluation.get("decision_summary") or {}).get("decision"),
+            },
+            "est_cost": base["est_cost"],
+            "points": points,
+            "implications": implications,
+            "elapsed_ms": round(elapsed_ms, 3),
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        sweeps = self.stats["sweeps"]
+        return {
+            "sweeps": sweeps,
+            "points": self.stats["points"],
+            "vectorized": self.vectorized,
+            "avg_ms_per_sweep": round(self.stats["total_ms"] / sweeps, 3) if sweeps else 0.0,
+        }
+
+# Global instance
+sensitivity_analyzer = SensitivityAnalyzer()
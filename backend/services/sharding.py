@@ -0,0 +1,355 @@
+import asyncio
+import bisect
+import hashlib
+import json
+import os
+import re
+from typing import Dict, Any, List, Optional, Iterable
+from urllib.parse import parse_qs
+
+from starlette.responses import JSONResponse
+
+# Optional: without httpx nodes can't forward or hand off, and routing falls back to hint mode
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+from backend.services.cache import cache
+from backend.services.campaign_store import campaign_store, evaluation_current
+
+# Comma-separated base URLs of every backend node (the same list on each node); unset = single node
+CLUSTER_NODES = [n.strip().rstrip("/") for n in os.environ.get("CLUSTER_NODES", "").split(",") if n.strip()]
+# This node's base URL, exactly as it appears in CLUSTER_NODES
+CLUSTER_SELF = os.environ.get("CLUSTER_SELF", "").rstrip("/")
+# Every node URL a membership change may name (nodes that may join later included); defaults to CLUSTER_NODES
+CLUSTER_ALLOWED_NODES = [n.strip().rstrip("/") for n in os.environ.get("CLUSTER_ALLOWED_NODES", "").split(",") if n.strip()] or CLUSTER_NODES
+# Shared secret of the nodes, sent on node-to-node calls (membership, handoff, campaign replication,
+# propagated cache invalidation) and required by their endpoints. Unset = those endpoints refuse every call
+CLUSTER_TOKEN = os.environ.get("CLUSTER_TOKEN", "")
+CLUSTER_TOKEN_HEADER = "x-cluster-token"
+# "forward": proxy requests for influencers owned by another node (one internal hop)
+# "hint": serve locally and only report the owner in X-Shard-Node, for an influencer-aware load balancer
+CLUSTER_MODE = os.environ.get("CLUSTER_MODE", "forward")
+# Virtual nodes per node: more points on the ring, more even key shares
+CLUSTER_VNODES = int(os.environ.get("CLUSTER_VNODES", 160))
+CLUSTER_FORWARD_TIMEOUT_S = float(os.environ.get("CLUSTER_FORWARD_TIMEOUT_S", 60))
+# Cache entries per handoff request when rebalancing
+HANDOFF_BATCH = 200
+
+NODE_HEADER = "x-shard-node"
+# Set on forwarded requests: the receiving node serves them itself, so rings that briefly
+# disagree during a membership change can't bounce a request between nodes
+FORWARDED_HEADER = "x-shard-forwarded"
+HOP_BY_HOP = {b"connection", b"keep-alive", b"transfer-encoding", b"upgrade", b"host"}
+
+# Requests that read or write per-influencer state (evaluation cache, chat sessions, risk streams),
+# by where their influencer_id is. Batch endpoints and the chat WebSocket are served where they land.
+PATH_KEYED = (re.compile(r"^/dashboard/([^/]+)$"), re.compile(r"^/mock/risk_signals/([^/]+)$"))
+QUERY_KEYED = {"/evaluate/demo"}
+BODY_KEYED = {"/chat/", "/chat/stream", "/evaluate/sensitivity"}
+# Batches whose items (in this body field) each carry an influencer_id: routed to the node owning all
+# of them; a batch spanning several owners is rejected with 409 and the influencers grouped by owner
+BATCH_KEYED = {"/mock/risk_events": "events"}
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """
+    Consistent-hash ring with virtual nodes. A key belongs to the first point clockwise of its hash,
+    so adding or removing a node only moves the keys on that node's arcs (~1/N of them).
+    """
+
+    def __init__(self, nodes: Iterable[str] = (), vnodes: int = CLUSTER_VNODES):
+        self.vnodes = vnodes
+        self.nodes = list(dict.fromkeys(nodes))
+        points = sorted((_hash(f"{node}#{i}"), node) for node in self.nodes for i in range(vnodes))
+        self._points = [point for point, _ in points]
+        self._owners = [node for _, node in points]
+
+    def node_for(self, key: str) -> Optional[str]:
+        if not self._points:
+            return None
+        i = bisect.bisect(self._points, _hash(key))
+        return self._owners[i % len(self._owners)]
+
+
+def _key_influencer(cache_key: str) -> str:
+    """Influencer part of an evaluation cache key (influencer|campaign|content_type|version)."""
+    return cache_key.split("|", 1)[0]
+
+
+class Cluster:
+    """
+    Node membership and ownership: which node holds an influencer's evaluations, forwarding to it,
+    and handing cache entries over when the membership changes. Rings are replaced, never mutated.
+    """
+
+    def __init__(self, nodes: List[str] = CLUSTER_NODES, self_url: str = CLUSTER_SELF, mode: str = CLUSTER_MODE,
+                 allowed: List[str] = CLUSTER_ALLOWED_NODES, token: str = CLUSTER_TOKEN):
+        self.self_url = self_url
+        self.allowed = set(allowed)
+        self.token = token
+        self.mode = mode if HTTPX_AVAILABLE else "hint"
+        self.ring = HashRing(nodes)
+        self._clients: Dict[int, Any] = {}
+        self.stats = {"local": 0, "forwarded": 0, "forward_failures": 0, "hinted": 0, "received_forwarded": 0,
+                      "handed_off": 0, "handoff_failures": 0, "received_handoff": 0, "rejected_handoff": 0, "rebalances": 0,
+                      "rejected_mixed_batches": 0}
+
+    @property
+    def configured(self) -> bool:
+        """Started with a cluster configuration (single-node deployments expose no internal endpoints)."""
+        return bool(self.allowed)
+
+    @property
+    def enabled(self) -> bool:
+        return len(self.ring.nodes) > 1 and self.self_url in self.ring.nodes
+
+    def owner(self, influencer_id: str) -> str:
+        return self.ring.node_for(influencer_id) or self.self_url
+
+    def peers(self, nodes: Iterable[str] = None) -> List[str]:
+        return [n for n in (nodes if nodes is not None else self.ring.nodes) if n != self.self_url]
+
+    def client(self):
+        """One pooled HTTP client per event loop (forwarding keeps connections to peers warm)."""
+        loop = id(asyncio.get_running_loop())
+        if loop not in self._clients:
+            headers = {CLUSTER_TOKEN_HEADER: self.token} if self.token else None
+            self._clients[loop] = httpx.AsyncClient(timeout=CLUSTER_FORWARD_TIMEOUT_S, headers=headers)
+        return self._clients[loop]
+
+    async def post_all(self, nodes: Iterable[str], path: str, payload: Any, method: str = "POST") -> int:
+        """Sends payload to every node; returns how many failed."""
+        if not HTTPX_AVAILABLE:
+            return 0
+        results = await asyncio.gather(
+            *[self.client().request(method, node + path, json=payload) for node in nodes],
+            return_exceptions=True
+        )
+        return sum(isinstance(r, Exception) or r.status_code >= 400 for r in results)
+
+    async def set_nodes(self, nodes: List[str], propagate: bool = True) -> Dict[str, Any]:
+        """
+        Replaces the membership. With propagate, every node in the old or new membership gets it too.
+        Then hands this node's entries that now belong elsewhere to their owners.
+        Raises ValueError for nodes outside the allowlist (CLUSTER_ALLOWED_NODES).
+        """
+        unknown = [n for n in nodes if n not in self.allowed]
+        if unknown:
+            raise ValueError(f"Nodes not in CLUSTER_ALLOWED_NODES: {unknown}")
+        old = self.ring.nodes
+        if propagate:
+            await self.post_all(self.peers(dict.fromkeys(old + nodes)), "/cluster/nodes",
+                                {"nodes": nodes, "propagate": False}, method="PUT")
+        joined = self.self_url in nodes and self.self_url not in old
+        self.ring = HashRing(nodes, self.ring.vnodes)
+        if joined and self.peers():
+            await self.pull_campaigns(self.peers()[0])
+        return {"nodes": self.ring.nodes, **await self.rebalance()}
+
+    async def rebalance(self) -> Dict[str, int]:
+        """Moves cache entries this node no longer owns to their owners; only those keys move."""
+        self.stats["rebalances"] += 1
+        moving: Dict[str, List[Dict[str, Any]]] = {}
+        kept = 0
+        for key, value in cache.items():
+            owner = self.ring.node_for(_key_influencer(key))
+            if owner is None or owner == self.self_url:
+                kept += 1
+            else:
+                moving.setdefault(owner, []).append({"key": key, "value": value})
+        if not HTTPX_AVAILABLE:
+            return {"kept": kept + sum(map(len, moving.values())), "moved": 0, "failed": 0}
+
+        async def hand_off(owner: str, entries: List[Dict[str, Any]]) -> int:
+            moved = 0
+            for i in range(0, len(entries), HANDOFF_BATCH):
+                batch = entries[i:i + HANDOFF_BATCH]
+                try:
+                    response = await self.client().post(owner + "/cluster/handoff", json={"entries": batch})
+                    response.raise_for_status()
+                except httpx.HTTPError:
+                    continue  # Kept here: still served (and refreshed) locally if requests land on this node
+                for entry in batch:
+                    cache.pop(entry["key"])
+                moved += len(batch)
+            return moved
+
+        moved = sum(await asyncio.gather(*[hand_off(o, e) for o, e in moving.items()]))
+        failed = sum(map(len, moving.values())) - moved
+        self.stats["handed_off"] += moved
+        self.stats["handoff_failures"] += failed
+        return {"kept": kept, "moved": moved, "failed": failed}
+
+    def receive_handoff(self, entries: List[Dict[str, Any]]):
+        # Entries produced by a node running other prompts / model / generator version are dropped
+        current = [entry for entry in entries if evaluation_current(entry["key"], entry["value"])]
+        for entry in current:
+            cache.set(entry["key"], entry["value"])
+        self.stats["received_handoff"] += len(current)
+        self.stats["rejected_handoff"] += len(entries) - len(current)
+
+    async def replicate_campaign(self, campaign: Dict[str, Any]):
+        """Campaigns are small and immutable: every node keeps all of them, so forwarded requests find theirs."""
+        if self.enabled:
+            await self.post_all(self.peers(), "/cluster/campaigns", campaign)
+
+    async def pull_campaigns(self, node: str):
+        try:
+            response = await self.client().get(node + "/cluster/campaigns")
+            response.raise_for_status()
+        except httpx.HTTPError:
+            return
+        for campaign in response.json():
+            campaign_store.add(campaign)
+
+    async def forward(self, owner: str, scope: Dict[str, Any], body: bytes):
+        """Sends the request to its owner; returns the response with its body still unread."""
+        url = owner + scope["path"] + (f"?{scope['query_string'].decode()}" if scope["query_string"] else "")
+        headers = [(k, v) for k, v in scope["headers"] if k not in HOP_BY_HOP and k != b"content-length"]
+        headers.append((FORWARDED_HEADER.encode(), self.self_url.encode()))
+        request = self.client().build_request(scope["method"], url, headers=headers, content=body)
+        return await self.client().send(request, stream=True)
+
+    @staticmethod
+    async def relay(response, send):
+        """Streams a forwarded response back to the client as it arrives (SSE included)."""
+        try:
+            await send({
+                "type": "http.response.start",
+                "status": response.status_code,
+                "headers": [(k, v) for k, v in response.headers.raw if k.lower() not in HOP_BY_HOP],
+            })
+            async for chunk in response.aiter_raw():
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        finally:
+            await response.aclose()
+
+    def get_stats(self) -> Dict[str, Any]:
+        owned = sum(1 for key, _ in cache.items() if self.owner(_key_influencer(key)) == self.self_url)
+        return {
+            "self": self.self_url,
+            "nodes": self.ring.nodes,
+            "enabled": self.enabled,
+            "mode": self.mode,
+            "vnodes": self.ring.vnodes,
+            "cached_entries": cache.get_stats()["entries"],
+            "owned_entries": owned,
+            **self.stats,
+        }
+
+
+def _influencer_id(path: str, query_string: bytes) -> Optional[str]:
+    for pattern in PATH_KEYED:
+        match = pattern.match(path)
+        if match:
+            return match.group(1)
+    if path in QUERY_KEYED:
+        return (parse_qs(query_string.decode()).get("influencer_id") or [None])[0]
+    return None
+
+
+def _batch_influencers(body: bytes, field: str) -> List[str]:
+    try:
+        return [item["influencer_id"] for item in json.loads(body)[field] if isinstance(item["influencer_id"], str)]
+    except (ValueError, LookupError, TypeError):
+        return []  # Left to the endpoint's own validation
+
+
+async def _read_body(receive) -> bytes:
+    chunks, more = [], True
+    while more:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        more = message.get("more_body", False)
+    return b"".join(chunks)
+
+
+def _replay(body: bytes, receive):
+    """receive() that yields the already-read body once, then defers to the server (disconnects)."""
+    pending = [{"type": "http.request", "body": body, "more_body": False}]
+
+    async def replay():
+        return pending.pop() if pending else await receive()
+    return replay
+
+
+class ShardRouter:
+    """
+    ASGI middleware routing per-influencer requests to the node that owns the influencer on the
+    hash ring. Forward mode proxies them (one hop); hint mode serves them locally. Responses carry
+    the owner in X-Shard-Node either way. A no-op on a single node.
+    """
+
+    def __init__(self, app, cluster_: Cluster = None):
+        self.app = app
+        self.cluster = cluster_ or cluster
+
+    async def __call__(self, scope, receive, send):
+        c = self.cluster
+        if scope["type"] != "http" or scope["method"] == "OPTIONS" or not c.enabled:
+            return await self.app(scope, receive, send)
+
+        # 1. Which influencer (path / query first; JSON bodies are small and read only if needed)
+        path, body = scope["path"], None
+        forwarded = any(k == FORWARDED_HEADER.encode() for k, _ in scope["headers"])
+        influencer_id = _influencer_id(path, scope["query_string"])
+        if influencer_id is None and path in BODY_KEYED:
+            body = await _read_body(receive)
+            receive = _replay(body, receive)
+            try:
+                influencer_id = json.loads(body).get("influencer_id")
+            except (ValueError, AttributeError):
+                influencer_id = None  # Left to the endpoint's own validation
+        elif influencer_id is None and path in BATCH_KEYED:
+            body = await _read_body(receive)
+            receive = _replay(body, receive)
+            owners: Dict[str, List[str]] = {}
+            for i in dict.fromkeys(_batch_influencers(body, BATCH_KEYED[path])):
+                owners.setdefault(c.owner(i), []).append(i)
+            if len(owners) > 1 and not forwarded:
+                c.stats["rejected_mixed_batches"] += 1
+                return await JSONResponse(status_code=409, content={
+                    "detail": "All items of a batch must belong to influencers owned by one node",
+                    "owners": owners,
+                })(scope, receive, send)
+            influencer_id = next(iter(owners.values()))[0] if owners else None
+        if not isinstance(influencer_id, str):
+            return await self.app(scope, receive, send)
+
+        # 2. Serve here: own it, already forwarded once, or hint mode
+        owner = c.owner(influencer_id)
+        if owner == c.self_url or forwarded or c.mode != "forward":
+            c.stats["received_forwarded" if forwarded else "local" if owner == c.self_url else "hinted"] += 1
+            return await self.app(scope, receive, _with_node_header(send, owner))
+
+        # 3. Forward to the owner; if it can't be reached, serve here rather than fail
+        if body is None:
+            body = await _read_body(receive)
+        try:
+            response = await c.forward(owner, scope, body)
+        except httpx.TransportError:
+            c.stats["forward_failures"] += 1
+            return await self.app(scope, _replay(body, receive), _with_node_header(send, c.self_url))
+        c.stats["forwarded"] += 1
+        await c.relay(response, send)
+
+
+def _with_node_header(send, node: str):
+    async def send_with_header(message):
+        if message["type"] == "http.response.start":
+            message = {**message, "headers": [*message.get("headers", []), (NODE_HEADER.encode(), node.encode())]}
+        await send(message)
+    return send_with_header
+
+# Global instance
+cluster = Cluster()
@@ -0,0 +1,260 @@
+import math
+import os
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+from backend.services.data_generator import DataGenerator, NICHES, PLATFORMS
+
+# Optional vectorized path. Without numpy the index is capped to a population pure Python can scan in time.
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Every process builds its own copy at startup (~5 s of CPU per 100k profiles), so the default stays
+# modest; raise it for a dedicated search node or the benchmark
+POPULATION = int(os.environ.get("SIMILAR_POPULATION", 100_000 if NUMPY_AVAILABLE else 5000))
+BUILD_CHUNK = 50_000
+ID_PREFIX = "sim-"
+MAX_K = 50
+# Inverted-file index for unfiltered queries (numpy only): k-means lists, probe the closest few.
+# Filtered queries stay exact: a niche x platform bucket is small enough to scan.
+IVF_LISTS = int(os.environ.get("SIMILAR_IVF_LISTS", 256))
+IVF_PROBES = int(os.environ.get("SIMILAR_IVF_PROBES", 12))
+IVF_MIN_POPULATION = 100_000
+IVF_TRAIN_SAMPLE = 50_000
+IVF_ITERATIONS = 10
+
+# (group, path, transform). Heavy-tailed counts are log-scaled before standardisation.
+FEATURES = [
+    ("engagement", ("engagement_quality", "like_to_view_ratio"), None),
+    ("engagement", ("engagement_quality", "comment_to_view_ratio"), None),
+    ("engagement", ("engagement_quality", "share_ratio"), None),
+    ("engagement", ("engagement_quality", "completion_rate"), None),
+    ("engagement", ("engagement_quality", "avg_view_duration"), "seconds"),
+    ("engagement", ("engagement_quality", "comment_sentiment_quality"), None),
+    ("credibility", ("audience_credibility", "audience_quality_score"), None),
+    ("credibility", ("audience_credibility", "subscriber_view_rate"), None),
+    ("credibility", ("audience_credibility", "follower_growth_rate"), None),
+    ("intent", ("intent_conversion", "watch_to_subscribe_ratio"), None),
+    ("intent", ("intent_conversion", "promo_redemption_rate"), None),
+    ("intent", ("intent_conversion", "ctr_estimated"), None),
+    ("loyalty", ("consistency_loyalty", "consistency_score"), None),
+    ("loyalty", ("consistency_loyalty", "retention_score"), None),
+    ("brand", ("brand_readiness", "brand_safety_score"), None),
+    ("brand", ("brand_readiness", "overall_sentiment_score"), None),
+    ("brand", ("brand_readiness", "brand_collaboration_ratio"), None),
+    ("growth", ("growth_momentum", "predicted_growth_6m"), "signed_log"),
+    ("growth", ("growth_momentum", "predicted_views_next_3"), "log"),
+    ("roi", ("roi_forecasting", "predicted_roi"), "log"),
+    ("roi", ("roi_forecasting", "est_cost"), "log"),
+]
+DIM = len(FEATURES)
+
+# Each group contributes equally to the distance regardless of how many fields it has
+_GROUP_SIZES = {g: sum(1 for f in FEATURES if f[0] == g) for g, _, _ in FEATURES}
+GROUP_WEIGHTS = [1.0 / math.sqrt(_GROUP_SIZES[g]) for g, _, _ in FEATURES]
+
+
+def raw_features(profile: Dict[str, Any]) -> List[float]:
+    """Numeric detailed_metrics of a profile, in FEATURES order (before standardisation)."""
+    dm = profile["detailed_metrics"]
+    out = []
+    for _, (group, field), transform in FEATURES:
+        value = dm[group][field]
+        if transform == "seconds":
+            value = float(str(value).rstrip("s"))
+        elif transform == "log":
+            value = math.log1p(max(0.0, value))
+        elif transform == "signed_log":
+            value = math.copysign(math.log1p(abs(value)), value)
+        out.append(float(value))
+    return out
+
+
+def segment_of(niche: str, platform: str) -> int:
+    return NICHES.index(niche) * len(PLATFORMS) + PLATFORMS.index(platform)
+
+
+class SimilarityIndex:
+    """
+    k-NN over embedded influencer profiles (cosine similarity of standardised, group-weighted,
+    L2-normalised detailed_metrics vectors).
+
+    Population members are generated deterministically as "sim-<n>" so every neighbour can be
+    re-fetched via /mock/influencer/{id}. Rows are bucketed by niche x platform: filtered queries
+    scan only the matching buckets (exact). Once a large population is fully indexed, unfiltered
+    queries go through an IVF index instead of scanning every bucket (approximate).
+    """
+
+    def __init__(self, population: int = POPULATION):
+        self.population = population
+        self.indexed = 0
+        self.build_seconds: Optional[float] = None
+        self._mean: Optional[List[float]] = None
+        self._scale: Optional[List[float]] = None
+        # segment -> (vectors, row ids); replaced wholesale so readers always see a consistent snapshot
+        self._buckets: Dict[int, Tuple[Any, Any]] = {}
+        # (centroids, row ids sorted by list, vectors in the same order, list offsets)
+        self._ivf: Optional[Tuple[Any, Any, Any, Any]] = None
+        self._lock = threading.Lock()
+        self._building = False
+        self.stats = {"queries": 0, "last_query_ms": 0.0}
+
+    # --- Building ---
+
+    def _fit_scaling(self, rows: List[List[float]]):
+        n = len(rows)
+        mean = [sum(r[j] for r in rows) / n for j in range(DIM)]
+        std = [math.sqrt(sum((r[j] - mean[j]) ** 2 for r in rows) / n) or 1.0 for j in range(DIM)]
+        self._mean = mean
+        self._scale = [w / s for w, s in zip(GROUP_WEIGHTS, std)]
+
+    def _normalize_py(self, raw: List[float]) -> List[float]:
+        vec = [(x - m) * s for x, m, s in zip(raw, self._mean, self._scale)]
+        norm = math.sqrt(sum(v * v for v in vec)) or 1.0
+        return [v / norm for v in vec]
+
+    def _normalize_np(self, raw):
+        vecs = (np.asarray(raw, dtype=np.float32) - np.asarray(self._mean, dtype=np.float32)) * np.asarray(self._scale, dtype=np.float32)
+        norms = np.linalg.norm(vecs, axis=-1, keepdims=True)
+        return vecs / np.where(norms == 0, 1.0, norms)
+
+    def _add_chunk(self, start: int, stop: int, gen: DataGenerator):
+        raws, segments = [], []
+        for i in range(start, stop):
+            profile = gen.generate_influencer(f"{ID_PREFIX}{i}")
+            raws.append(raw_features(profile))
+            segments.append(segment_of(profile["niche"], profile["platform"]))
+        if self._mean is None:
+            # Scaling is fixed from the first chunk so vectors never change once indexed
+            self._fit_scaling(raws)
+
+        buckets = dict(self._buckets)
+        if NUMPY_AVAILABLE:
+            vecs = self._normalize_np(raws)
+            segs = np.asarray(segments, dtype=np.int16)
+            ids = np.arange(start, stop, dtype=np.int32)
+            for seg in np.unique(segs):
+                mask = segs == seg
+                old_vecs, old_ids = buckets.get(int(seg), (np.empty((0, DIM), np.float32), np.empty(0, np.int32)))
+                buckets[int(seg)] = (np.concatenate([old_vecs, vecs[mask]]), np.concatenate([old_ids, ids[mask]]))
+        else:
+            for offset, (raw, seg) in enumerate(zip(raws, segments)):
+                old_vecs, old_ids = buckets.get(seg, ([], []))
+                buckets[seg] = (old_vecs + [self._normalize_py(raw)], old_ids + [start + offset])
+        self._buckets = buckets
+        self.indexed = stop
+
+    def ensure_built(self, background: bool = False):
+        """Builds the index in chunks; queries made meanwhile search the part indexed so far."""
+        with self._lock:
+            if self._building or self.indexed >= self.population:
+                return
+            self._building = True
+
+        def build():
+            # A failed build can be retried: the next call resumes from the last indexed chunk
+            try:
+                t0 = time.perf_counter()
+                gen = DataGenerator()
+                for start in range(self.indexed, self.population, BUILD_CHUNK):
+                    self._add_chunk(start, min(start + BUILD_CHUNK, self.population), gen)
+                if NUMPY_AVAILABLE and self.indexed >= IVF_MIN_POPULATION:
+                    self._build_ivf()
+                self.build_seconds = round(time.perf_counter() - t0, 1)
+            finally:
+                self._building = False
+
+        if background:
+            threading.Thread(target=build, daemon=True).start()
+        else:
+            build()
+
+    def _build_ivf(self):
+        """Spherical k-means over a sample, then every row is filed under its closest centroid."""
+        segs = sorted(self._buckets)
+        vecs = np.concatenate([self._buckets[seg][0] for seg in segs])
+        ids = np.concatenate([self._buckets[seg][1] for seg in segs])
+        rng = np.random.default_rng(0)
+
+        sample = vecs[rng.choice(len(vecs), min(IVF_TRAIN_SAMPLE, len(vecs)), replace=False)]
+        centroids = sample[rng.choice(len(sample), IVF_LISTS, replace=False)].copy()
+        for _ in range(IVF_ITERATIONS):
+            assign = np.argmax(sample @ centroids.T, axis=1)
+            for c in range(IVF_LISTS):
+                members = sample[assign == c]
+                if len(members):
+                    centroid = members.sum(axis=0)
+                    centroids[c] = centroid / (np.linalg.norm(centroid) or 1.0)
+
+        assign = np.concatenate([np.argmax(vecs[i:i + BUILD_CHUNK] @ centroids.T, axis=1)
+                                 for i in range(0, len(vecs), BUILD_CHUNK)])
+        order = np.argsort(assign, kind="stable")
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(assign, minlength=IVF_LISTS))])
+        self._ivf = (centroids, ids[order], vecs[order], offsets)
+
+    # --- Querying ---
+
+    def _ivf_candidates(self, query, fetch: int) -> List[Tuple[float, int]]:
+        centroids, ids, vecs, offsets = self._ivf
+        probes = np.argpartition(-(centroids @ query), IVF_PROBES - 1)[:IVF_PROBES]
+        # Lists are contiguous slices: no gather, one small matvec per probed list
+        scores = np.concatenate([vecs[offsets[p]:offsets[p + 1]] @ query for p in probes])
+        row_ids = np.concatenate([ids[offsets[p]:offsets[p + 1]] for p in probes])
+        top = np.argpartition(-scores, fetch - 1)[:fetch] if len(scores) > fetch else np.arange(len(scores))
+        return list(zip(scores[top].tolist(), row_ids[top].tolist()))
+
+    def embed(self, profile: Dict[str, Any]):
+        raw = raw_features(profile)
+        return self._normalize_np(raw) if NUMPY_AVAILABLE else self._normalize_py(raw)
+
+    def query(self, profile: Dict[str, Any], k: int = 10, niche: str = None, platform: str = None,
+              exclude_id: str = None, exact: bool = False) -> Optional[List[Tuple[str, float]]]:
+        """
+        Top-k (id, cosine similarity) among indexed profiles, optionally filtered by niche/platform.
+        Unfiltered queries use the IVF index when it exists, unless exact=True.
+        None while the first chunk is still being indexed (the build is started if needed).
+        """
+        if self._mean is None:
+            self.ensure_built(background=True)
+            return None
+        t0 = time.perf_counter()
+        k = max(1, min(k, MAX_K))
+        buckets = self._buckets
+        segments = [segment_of(n, p) for n in ([niche] if niche else NICHES) for p in ([platform] if platform else PLATFORMS)]
+        query = self.embed(profile)
+        fetch = k + 1  # room for the query profile itself
+
+        candidates: List[Tuple[float, int]] = []
+        if self._ivf is not None and not (niche or platform or exact):
+            segments = []
+            candidates = self._ivf_candidates(query, fetch)
+        for seg in segments:
+            if seg not in buckets:
+                continue
+            vecs, ids = buckets[seg]
+            if NUMPY_AVAILABLE:
+                scores = vecs @ query
+                top = np.argpartition(-scores, fetch - 1)[:fetch] if len(scores) > fetch else np.arange(len(scores))
+                candidates.extend(zip(scores[top].tolist(), ids[top].tolist()))
+            else:
+                candidates.extend((sum(a * b for a, b in zip(vec, query)), row) for vec, row in zip(vecs, ids))
+
+        candidates.sort(reverse=True)
+        results = [(f"{ID_PREFIX}{row}", round(score, 4)) for score, row in candidates if f"{ID_PREFIX}{row}" != exclude_id][:k]
+
+        elapsed_ms = (time.perf_counter() - t0) * 1000
+        self.stats["queries"] += 1
+        self.stats["last_query_ms"] = round(elapsed_ms, 2)
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "numpy": NUMPY_AVAILABLE, "population": self.population, "indexed": self.indexed,
+                "building": self._building, "build_seconds": self.build_seconds, "dim": DIM,
+                "ivf": {"lists": IVF_LISTS, "probes": IVF_PROBES} if self._ivf is not None else None}
+
+
+similarity_index = SimilarityIndex()
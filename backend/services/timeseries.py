@@ -0,0 +1,328 @@
+import math
+import os
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+
+from ai_engine.deterministic_rng import history_rng
+
+# Days of history generated per influencer; the profile snapshot is the last of them
+HISTORY_DAYS = int(os.environ.get("HISTORY_DAYS", 180))
+# Influencer histories kept in memory (LRU); an evicted one is regenerated identically on next use
+HISTORY_CACHE_SIZE = int(os.environ.get("HISTORY_CACHE_SIZE", 2000))
+# Wall-clock seconds per simulated day: histories gain a day each time a UTC day boundary passes
+# (0 disables the clock; days are then only added through HistoryStore.advance)
+HISTORY_DAY_S = float(os.environ.get("HISTORY_DAY_S", 86400))
+# Pushes between exact recomputations of a window's running sums (bounds floating-point drift)
+RESYNC_EVERY = 1024
+
+WINDOWS = (30, 90)
+SERIES = ("followers", "views", "engagement_rate", "sentiment")
+AD_WINDOW = 30
+
+# Day-to-day noise: followers follow the profile's growth trend with AR(1) deviations (~1% sd),
+# views and engagement scatter around the profile's rates, sponsored posts reach and engage less
+FOLLOWER_NOISE = 0.004
+FOLLOWER_NOISE_PERSISTENCE = 0.9
+SENTIMENT_NOISE = 4.0
+AD_VIEW_FACTOR = 0.85
+
+
+class RollingWindow:
+    """
+    Mean, variance and least-squares slope of the last `size` values, updated in O(1) per push.
+    Keeps running sums (sum y, sum y^2, sum t*y with t = 0..n-1 inside the window) over a ring buffer.
+    Values are stored relative to the first one pushed so sum y^2 stays well conditioned for large
+    levels (follower counts); every RESYNC_EVERY pushes the sums are recomputed from the buffer.
+    """
+
+    __slots__ = ("size", "count", "_buf", "_head", "_shift", "_sum", "_sq", "_ty", "_pushes")
+
+    def __init__(self, size: int):
+        self.size = size
+        self.count = 0
+        self._buf = array("d", bytes(8 * size))
+        self._head = 0  # slot of the oldest value once the window is full
+        self._shift = None
+        self._sum = self._sq = self._ty = 0.0
+        self._pushes = 0
+
+    def push(self, value: float):
+        if self._shift is None:
+            self._shift = value
+        y = value - self._shift
+        n = self.count
+        if n == self.size:
+            old = self._buf[self._head]
+            self._sum -= old
+            self._sq -= old * old
+            # The oldest value sat at t = 0; every remaining value moves down one position
+            self._ty -= self._sum
+            self._buf[self._head] = y
+            self._head = (self._head + 1) % self.size
+            n -= 1
+        else:
+            self._buf[n] = y
+            self.count += 1
+        self._sum += y
+        self._sq += y * y
+        self._ty += n * y
+        self._pushes += 1
+        if self._pushes % RESYNC_EVERY == 0:
+            self._resync()
+
+    def load(self, values: List[float]):
+        """Starts the window from a block of history (only the last `size` values are kept)."""
+        values = values[-self.size:]
+        self._shift = values[0] if values else None
+        self.count = len(values)
+        self._head = 0
+        for i, value in enumerate(values):
+            self._buf[i] = value - self._shift
+        self._resync()
+
+    def _shifted(self) -> List[float]:
+        if self.count < self.size:
+            return list(self._buf[:self.count])
+        return list(self._buf[self._head:]) + list(self._buf[:self._head])
+
+    def _resync(self):
+        values = self._shifted()
+        self._sum = math.fsum(values)
+        self._sq = math.fsum(y * y for y in values)
+        self._ty = math.fsum(t * y for t, y in enumerate(values))
+
+    def values(self) -> List[float]:
+        """Window contents, oldest first."""
+        return [y + self._shift for y in self._shifted()]
+
+    @property
+    def last(self) -> Optional[float]:
+        if not self.count:
+            return None
+        return self._buf[(self._head - 1) % self.size if self.count == self.size else self.count - 1] + self._shift
+
+    @property
+    def total(self) -> float:
+        return self._sum + self.count * (self._shift or 0.0)
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self._shift + self._sum / self.count if self.count else None
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (0 with fewer than two values)."""
+        n = self.count
+        if n < 2:
+            return 0.0
+        return max(self._sq - self._sum * self._sum / n, 0.0) / (n - 1)
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    @property
+    def slope(self) -> float:
+        """Least-squares trend per step over the window."""
+        n = self.count
+        if n < 2:
+            return 0.0
+        st = n * (n - 1) / 2
+        stt = (n - 1) * n * (2 * n - 1) / 6
+        return (n * self._ty - st * self._sum) / (n * stt - st * st)
+
+
+class InfluencerHistory:
+    """
+    Deterministic daily series of one influencer in array-backed columns (8 bytes/day for
+    followers and views, 4 for engagement rate and sentiment, 1 for the sponsored-post flag).
+    Series are drawn around the profile's own rates, so the snapshot and its history agree.
+    Rolling aggregates are kept current as days are appended; nothing rescans the history.
+    """
+
+    def __init__(self, profile: Dict[str, Any], days: int = HISTORY_DAYS, extra_days: int = 0):
+        metrics = profile["detailed_metrics"]
+        monthly_growth = metrics["audience_credibility"]["follower_growth_rate"] / 100
+        self.influencer_id = profile["id"]
+        self._growth = (1 + monthly_growth) ** (1 / 30)
+        # Trend anchored so day `days - 1` is the profile snapshot
+        self._trend = profile["followers"] / self._growth ** (days - 1)
+        self._deviation = 0.0
+        self._view_rate = metrics["audience_credibility"]["subscriber_view_rate"] / 100
+        eq = metrics["engagement_quality"]
+        self._engagement = eq["like_to_view_ratio"] + eq["comment_to_view_ratio"] + eq["share_ratio"]
+        self._sentiment = metrics["brand_readiness"]["overall_sentiment_score"]
+        self._ad_ratio = metrics["brand_readiness"]["brand_collaboration_ratio"] / 100
+        self._rng = history_rng(self.influencer_id)
+        self._ad_decay = self._rng.uniform(0.05, 0.35)
+
+        self.followers = array("d")
+        self.views = array("d")
+        self.engagement_rate = array("f")
+        self.sentiment = array("f")
+        self.sponsored = array("b")
+        self.windows = {name: {size: RollingWindow(size) for size in WINDOWS} for name in SERIES}
+        self._ad_days = RollingWindow(AD_WINDOW)
+        self._ad_engagement = RollingWindow(AD_WINDOW)  # engagement on sponsored days, 0 otherwise
+        self._summary: Optional[Dict[str, Any]] = None
+        # Days after the snapshot (HistoryStore day clock or advance) continue the same trend and RNG stream.
+        # The windows are loaded from the tail of the generated columns in one pass each.
+        for _ in range(days + extra_days):
+            self._draw_day()
+        columns = {"followers": self.followers, "views": self.views,
+                   "engagement_rate": self.engagement_rate, "sentiment": self.sentiment}
+        for name, windows in self.windows.items():
+            for size, window in windows.items():
+                window.load(list(columns[name][-size:]))
+        flags = list(self.sponsored[-AD_WINDOW:])
+        self._ad_days.load([float(f) for f in flags])
+        self._ad_engagement.load([e if f else 0.0 for e, f in zip(self.engagement_rate[-AD_WINDOW:], flags)])
+
+    def __len__(self) -> int:
+        return len(self.followers)
+
+    def _draw_day(self) -> Tuple[float, float, float, float, bool]:
+        rng = self._rng
+        self._deviation = FOLLOWER_NOISE_PERSISTENCE * self._deviation + rng.gauss(0.0, FOLLOWER_NOISE)
+        followers = self._trend * self._growth ** len(self) * math.exp(self._deviation)
+        sponsored = rng.random() < self._ad_ratio
+        views = followers * self._view_rate * rng.uniform(0.6, 1.4) * (AD_VIEW_FACTOR if sponsored else 1.0)
+        engagement = self._engagement * rng.uniform(0.8, 1.2) * ((1 - self._ad_decay) if sponsored else 1.0)
+        sentiment = min(max(rng.gauss(self._sentiment, SENTIMENT_NOISE), 0.0), 100.0)
+
+        self.followers.append(followers)
+        self.views.append(views)
+        self.engagement_rate.append(engagement)
+        self.sentiment.append(sentiment)
+        self.sponsored.append(sponsored)
+        return followers, views, engagement, sentiment, sponsored
+
+    def append_day(self):
+        """Draws the next day and folds it into every rolling window (O(1))."""
+        followers, views, _, _, sponsored = self._draw_day()
+        # Read back the float32 columns so appended and freshly loaded windows see identical values
+        engagement, sentiment = self.engagement_rate[-1], self.sentiment[-1]
+        for name, value in zip(SERIES, (followers, views, engagement, sentiment)):
+            for window in self.windows[name].values():
+                window.push(value)
+        self._ad_days.push(1.0 if sponsored else 0.0)
+        self._ad_engagement.push(engagement if sponsored else 0.0)
+        self._summary = None
+
+    def series(self, last: int = None) -> Dict[str, List]:
+        start = 0 if last is None else max(len(self) - last, 0)
+        return {
+            "followers": [int(v) for v in self.followers[start:]],
+            "views": [int(v) for v in self.views[start:]],
+            "engagement_rate": [round(v, 3) for v in self.engagement_rate[start:]],
+            "sentiment": [round(v, 1) for v in self.sentiment[start:]],
+            "sponsored": [bool(v) for v in self.sponsored[start:]],
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """Rolling aggregates for the analysts' context (cached until the next appended day)."""
+        if self._summary is not None:
+            return self._summary
+        summary: Dict[str, Any] = {"days": len(self)}
+        for name in SERIES:
+            windows = self.windows[name]
+            last, baseline = windows[WINDOWS[0]].last, windows[WINDOWS[0]].mean
+            stats = {"last": round(last, 2), f"vs_{WINDOWS[0]}d_pct": _pct(last - baseline, baseline)}
+            for size, window in windows.items():
+                stats[f"mean_{size}d"] = round(window.mean, 2)
+                stats[f"std_{size}d"] = round(window.std, 2)
+                stats[f"slope_{size}d"] = round(window.slope, 4)
+                # Trend change across the window, relative to its mean
+                stats[f"trend_{size}d_pct"] = _pct(window.slope * (window.count - 1), window.mean)
+            summary[name] = stats
+
+        ad_days = self._ad_days.total
+        engagement = self.windows["engagement_rate"][AD_WINDOW]
+        organic_days = engagement.count - ad_days
+        summary[f"sponsored_ratio_{AD_WINDOW}d"] = _pct(ad_days, self._ad_days.count)
+        if ad_days >= 1 and organic_days >= 1:
+            ad_mean = self._ad_engagement.total / ad_days
+            organic_mean = (engagement.total - self._ad_engagement.total) / organic_days
+            summary["engagement_decay_on_ads_pct"] = _pct(organic_mean - ad_mean, organic_mean)
+        else:
+            summary["engagement_decay_on_ads_pct"] = None
+        self._summary = summary
+        return summary
+
+
+def _pct(part: float, whole: float) -> float:
+    return round(100 * part / whole, 2) if whole else 0.0
+
+
+class HistoryStore:
+    """
+    LRU of InfluencerHistory by (influencer ID, content type): a profile's rates depend on the
+    content type, and so does the history drawn around them. A day clock (HISTORY_DAY_S) or
+    advance() moves the simulated calendar forward; histories catch up lazily (one O(1) append
+    per missing day) the next time they are read.
+    """
+
+    def __init__(self, days: int = HISTORY_DAYS, capacity: int = HISTORY_CACHE_SIZE, day_s: float = HISTORY_DAY_S):
+        self.days = days
+        self.capacity = capacity
+        self.day_s = day_s
+        self.elapsed_days = 0
+        self._clock_day = self._day_index()
+        self._entries: "OrderedDict[Tuple[str, str], InfluencerHistory]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"generated": 0, "hits": 0, "evicted": 0, "days_appended": 0}
+
+    def _day_index(self) -> int:
+        return int(time.time() // self.day_s) if self.day_s > 0 else 0
+
+    def _tick(self):
+        """Adds the days the clock has passed since the last read (caller holds the lock)."""
+        day = self._day_index()
+        if day > self._clock_day:
+            self.elapsed_days += day - self._clock_day
+            self._clock_day = day
+
+    @property
+    def total_days(self) -> int:
+        """Days in every history as of now (the generated ones plus the elapsed ones)."""
+        with self._lock:
+            self._tick()
+            return self.days + self.elapsed_days
+
+    def get(self, profile: Dict[str, Any]) -> InfluencerHistory:
+        key = (profile["id"], profile.get("content_type_context", "all"))
+        with self._lock:
+            self._tick()
+            history = self._entries.get(key)
+            if history is None:
+                history = InfluencerHistory(profile, self.days, self.elapsed_days)
+                self._entries[key] = history
+                self.stats["generated"] += 1
+                if len(self._entries) > self.capacity:
+                    self._entries.popitem(last=False)
+                    self.stats["evicted"] += 1
+            else:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                while len(history) < self.days + self.elapsed_days:
+                    history.append_day()
+                    self.stats["days_appended"] += 1
+            return history
+
+    def summary(self, profile: Dict[str, Any]) -> Dict[str, Any]:
+        return self.get(profile).summary()
+
+    def advance(self, days: int = 1):
+        """Adds `days` new days to every history (applied on next access)."""
+        with self._lock:
+            self.elapsed_days += days
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "cached": len(self._entries), "capacity": self.capacity,
+                "history_days": self.total_days, "day_s": self.day_s, "windows": list(WINDOWS)}
+
+
+history_store = HistoryStore()
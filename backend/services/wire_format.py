@@ -0,0 +1,221 @@
+import gzip
+import json
+from typing import Dict, Any, List, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response
+
+# Optional binary codecs / compressors. JSON + gzip always work.
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+try:
+    import cbor2
+    CBOR_AVAILABLE = True
+except ImportError:
+    CBOR_AVAILABLE = False
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+MSGPACK_MEDIA_TYPE = "application/x-msgpack"
+# Accept names clients use for MessagePack; responses are always labelled MSGPACK_MEDIA_TYPE
+MSGPACK_ALIASES = (MSGPACK_MEDIA_TYPE, "application/msgpack", "application/vnd.msgpack")
+CBOR_MEDIA_TYPE = "application/cbor"
+
+# Bodies smaller than this aren't worth the compression CPU
+COMPRESSION_MIN_BYTES = 1024
+
+COMPACT_VERSION = 1
+KPI_FIELDS = ["kpi_id", "value", "score_normalized", "explanation", "confidence_score"]
+
+
+class _Table:
+    """Append-only string dictionary: value -> index."""
+
+    def __init__(self):
+        self.items: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def ref(self, value: str) -> int:
+        idx = self._index.get(value)
+        if idx is None:
+            idx = len(self.items)
+            self._index[value] = idx
+            self.items.append(value)
+        return idx
+
+
+def to_compact(result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Dictionary-encodes an evaluation payload.
+    - kpis become rows [kpi_id_ref, value, score, explanation_ref, confidence]
+    - kpi_ids and explanations are stored once in string tables
+    - analyst_reports reference their KPIs by row index instead of repeating them
+    """
+    kpi_ids, strings = _Table(), _Table()
+    rows = []
+    row_of = {}
+    for kpi in result.get("kpis", []):
+        row_of[id(kpi)] = len(rows)
+        rows.append([
+            kpi_ids.ref(kpi["kpi_id"]),
+            kpi.get("value"),
+            kpi.get("score_normalized"),
+            strings.ref(kpi.get("explanation", "")),
+            kpi.get("confidence_score"),
+        ])
+
+    reports = []
+    for report in result.get("analyst_reports", []):
+        refs = []
+        for kpi in report.get("kpis", []):
+            idx = row_of.get(id(kpi))
+            if idx is None:
+                # Not shared with the flat list: append it as its own row
+                idx = len(rows)
+                rows.append([kpi_ids.ref(kpi["kpi_id"]), kpi.get("value"), kpi.get("score_normalized"),
+                             strings.ref(kpi.get("explanation", "")), kpi.get("confidence_score")])
+            refs.append(idx)
+        reports.append({**report, "kpis": refs})
+
+    compact = {k: v for k, v in result.items() if k not in ("kpis", "analyst_reports")}
+    compact.update({
+        "_v": COMPACT_VERSION,
+        "kpi_ids": kpi_ids.items,
+        "strings": strings.items,
+        "kpis": rows,
+        "kpi_count": len(result.get("kpis", [])),
+        "analyst_reports": reports,
+    })
+    return compact
+
+
+def from_compact(compact: Dict[str, Any]) -> Dict[str, Any]:
+    """Inverse of to_compact, for Python consumers (exports, tests, notebooks)."""
+    kpi_ids, strings = compact["kpi_ids"], compact["strings"]
+    kpis = [
+        {"kpi_id": kpi_ids[r[0]], "value": r[1], "score_normalized": r[2],
+         "explanation": strings[r[3]], "confidence_score": r[4]}
+        for r in compact["kpis"]
+    ]
+    result = {k: v for k, v in compact.items() if k not in ("_v", "kpi_ids", "strings", "kpis", "kpi_count", "analyst_reports")}
+    result["kpis"] = kpis[:compact["kpi_count"]]
+    result["analyst_reports"] = [
+        {**report, "kpis": [kpis[i] for i in report["kpis"]]}
+        for report in compact.get("analyst_reports", [])
+    ]
+    return result
+
+
+def encode(result: Any, media_type: str) -> bytes:
+    if media_type == MSGPACK_MEDIA_TYPE:
+        return msgpack.packb(to_compact(result) if isinstance(result, dict) else [to_compact(r) for r in result], use_bin_type=True)
+    if media_type == CBOR_MEDIA_TYPE:
+        return cbor2.dumps(to_compact(result) if isinstance(result, dict) else [to_compact(r) for r in result])
+    return json.dumps(result, separators=(",", ":")).encode("utf-8")
+
+
+def decode(body: bytes, media_type: str) -> Any:
+    if media_type == MSGPACK_MEDIA_TYPE:
+        data = msgpack.unpackb(body, raw=False, strict_map_key=False)
+    elif media_type == CBOR_MEDIA_TYPE:
+        data = cbor2.loads(body)
+    else:
+        return json.loads(body)
+    return from_compact(data) if isinstance(data, dict) else [from_compact(d) for d in data]
+
+
+def _q_values(header: str) -> Dict[str, float]:
+    """Accept / Accept-Encoding -> {token: q}. Malformed q-values count as 0 (not acceptable)."""
+    values = {}
+    for item in (header or "").lower().split(","):
+        token, *params = [p.strip() for p in item.split(";")]
+        if not token:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        values[token] = q
+    return values
+
+
+def negotiate_media_type(accept: str) -> str:
+    """
+    Picks the response format from the Accept header's media ranges and q-values. The binary
+    formats are opt-in: served only when named explicitly with q > 0 (not for */*), and they
+    win a tie with JSON. JSON otherwise, also when nothing listed is acceptable.
+    """
+    ranges = _q_values(accept)
+    # JSON's q: its most specific matching range
+    best, best_q = "application/json", next(
+        (ranges[r] for r in ("application/json", "application/*", "*/*") if r in ranges), 1.0 if not ranges else 0.0)
+    binary = []
+    if MSGPACK_AVAILABLE:
+        binary.append((MSGPACK_MEDIA_TYPE, max(ranges.get(t, 0.0) for t in MSGPACK_ALIASES)))
+    if CBOR_AVAILABLE:
+        binary.append((CBOR_MEDIA_TYPE, ranges.get(CBOR_MEDIA_TYPE, 0.0)))
+    for media_type, q in binary:
+        if q > 0 and q >= best_q:
+            best, best_q = media_type, q
+    return best
+
+
+def _accepted_codings(accept_encoding: str) -> Dict[str, float]:
+    """Accept-Encoding -> {coding: q}."""
+    return {"gzip" if coding == "x-gzip" else coding: q for coding, q in _q_values(accept_encoding).items()}
+
+
+def negotiate_encoding(accept_encoding: str) -> str:
+    """
+    Content-coding for a compressible body per Accept-Encoding: the supported coding with the
+    highest q-value (br before gzip on a tie); q=0 refuses a coding, "*" covers unlisted ones.
+    Empty means uncompressed.
+    """
+    codings = _accepted_codings(accept_encoding)
+    wildcard = codings.get("*", 0.0)
+    best, best_q = "", 0.0
+    for coding in (("br", "gzip") if BROTLI_AVAILABLE else ("gzip",)):
+        q = codings.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def representation(request: Request) -> Tuple[str, str]:
+    """(media type, content-coding) negotiated_response picks for this request; part of the ETag of its body."""
+    return negotiate_media_type(request.headers.get("accept")), negotiate_encoding(request.headers.get("accept-encoding"))
+
+
+def compress(body: bytes, accept_encoding: str) -> Tuple[bytes, str]:
+    """Returns (body, content-encoding). Empty encoding means uncompressed."""
+    if len(body) < COMPRESSION_MIN_BYTES:
+        return body, ""
+    encoding = negotiate_encoding(accept_encoding)
+    if encoding == "br":
+        return brotli.compress(body, quality=5), "br"
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=6), "gzip"
+    return body, ""
+
+
+def negotiated_response(request: Request, result: Any, headers: Dict[str, str] = None) -> Response:
+    """Encodes an evaluation payload per Accept / Accept-Encoding."""
+    media_type = negotiate_media_type(request.headers.get("accept"))
+    body, encoding = compress(encode(result, media_type), request.headers.get("accept-encoding"))
+
+    headers = {**(headers or {}), "Vary": "Accept, Accept-Encoding"}
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type=media_type, headers=headers)
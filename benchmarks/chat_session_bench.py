@@ -0,0 +1,59 @@
+"""
+Prompt size and latency over long chat conversations.
+
+Compares the naive approach (resend full structured context + full history every turn)
+with the session store (relevant context slices + token-budgeted history).
+
+Run from the project root:
+    python -m benchmarks.chat_session_bench
+"""
+import json
+import time
+
+from ai_engine.llm_client import MockLLMClient
+from ai_engine.orchestrator import orchestrator
+from backend.services.chat_context_builder import build_chat_context
+from backend.services.chat_sessions import ChatSessionStore, estimate_tokens
+from backend.services.data_generator import DataGenerator
+
+QUERIES = [
+    "What is the ROI?", "Is this influencer safe?", "How is the audience?",
+    "What about completion rate?", "Are saves strong?", "Tell me about engagement",
+    "Any bot risk?", "What is the capital of France?",
+]
+TURNS = 200
+
+
+def main():
+    gen = DataGenerator()
+    evaluation = orchestrator.evaluate(gen.generate_influencer("bench-chat"), gen.generate_campaign_brief())
+    structured = build_chat_context(evaluation)
+    client = MockLLMClient()
+
+    store = ChatSessionStore()
+    session = store.get_or_create(None, "bench-chat")
+    session.structured_context = structured
+
+    naive_history = []
+    print(f"{'turn':>5} {'naive_tokens':>13} {'session_tokens':>15} {'session_ms':>11}")
+    for turn in range(1, TURNS + 1):
+        query = QUERIES[turn % len(QUERIES)]
+
+        naive_prompt = json.dumps({**structured, "history": naive_history})
+
+        t0 = time.perf_counter()
+        turn_context = store.build_turn_context(session, query)
+        answer = client.chat(query, turn_context)
+        elapsed_ms = (time.perf_counter() - t0) * 1000
+        session_prompt = json.dumps(turn_context, separators=(",", ":"))
+
+        session.add_turn("user", query)
+        session.add_turn("assistant", answer)
+        naive_history += [{"role": "user", "content": query}, {"role": "assistant", "content": answer}]
+
+        if turn in (1, 10, 50, 100, 200):
+            print(f"{turn:>5} {estimate_tokens(naive_prompt):>13} {estimate_tokens(session_prompt):>15} {elapsed_ms:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Time-to-first-token for streaming chat vs. the blocking /chat/ endpoint.
+
+The mock client simulates generation speed with MOCK_STREAM_TOKEN_DELAY_MS
+(default here: 20ms/token), so this runs fully offline.
+
+Run from the project root:
+    python -m benchmarks.chat_stream_bench
+"""
+import os
+os.environ.setdefault("MOCK_STREAM_TOKEN_DELAY_MS", "20")
+
+import statistics
+import time
+
+from fastapi.testclient import TestClient
+
+from backend.main import app
+
+QUERIES = ["What is the ROI?", "Is there bot risk?", "How is the audience?", "What about saves?"]
+INFLUENCER_ID = "bench-stream"
+
+
+def main():
+    client = TestClient(app)
+    client.post("/evaluate/demo", params={"influencer_id": INFLUENCER_ID})
+
+    # Blocking endpoint doesn't simulate generation time, so add it back for a fair comparison
+    token_delay_s = float(os.environ["MOCK_STREAM_TOKEN_DELAY_MS"]) / 1000
+    blocking, ttft, total = [], [], []
+
+    with client.websocket_connect("/chat/ws") as ws:
+        for query in QUERIES * 5:
+            t0 = time.perf_counter()
+            resp = client.post("/chat/", json={"influencer_id": INFLUENCER_ID, "query": query}).json()
+            n_tokens = len(resp["message"].split())
+            blocking.append((time.perf_counter() - t0 + n_tokens * token_delay_s) * 1000)
+
+            t0 = time.perf_counter()
+            ws.send_json({"influencer_id": INFLUENCER_ID, "query": query})
+            first = None
+            while True:
+                frame = ws.receive_json()
+                if frame["type"] == "token" and first is None:
+                    first = time.perf_counter()
+                if frame["type"] == "done":
+                    break
+            ttft.append((first - t0) * 1000)
+            total.append((time.perf_counter() - t0) * 1000)
+
+    print(f"blocking /chat/ (simulated generation) median: {statistics.median(blocking):7.1f} ms")
+    print(f"/chat/ws time-to-first-token median:          {statistics.median(ttft):7.1f} ms")
+    print(f"/chat/ws full answer median:                  {statistics.median(total):7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
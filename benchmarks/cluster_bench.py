@@ -0,0 +1,142 @@
+"""
+Sharded evaluations across several local uvicorn processes, behind a simulated round-robin load
+balancer (each request goes to the next node). Every influencer is evaluated (/evaluate/demo) on one
+node and chatted about (/chat/) on the next:
+  1. without CLUSTER_NODES: chats land on nodes without the evaluation
+  2. with CLUSTER_NODES (forward mode): every chat finds it; cost of the forwarding hop
+  3. a node joins, then one leaves: share of cached evaluations moved vs a modulo-N assignment,
+     and cache hits right after each change
+Needs httpx.
+
+Run from the project root:
+    python -m benchmarks.cluster_bench
+"""
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+from backend.services.sharding import HashRing, _hash
+
+NODES = 3
+INFLUENCERS = 120
+NO_CONTEXT = "I don't have analysis data"
+TOKEN = "cluster-bench"
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_nodes(urls, cluster_nodes, allowed_nodes=None):
+    procs = []
+    for url in urls:
+        env = {**os.environ, "SIMILAR_POPULATION": "1000"}
+        if cluster_nodes:
+            env.update(CLUSTER_NODES=",".join(cluster_nodes), CLUSTER_SELF=url, CLUSTER_TOKEN=TOKEN,
+                       CLUSTER_ALLOWED_NODES=",".join(allowed_nodes or cluster_nodes))
+        port = url.rsplit(":", 1)[1]
+        procs.append(subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", port, "--log-level", "warning"],
+            env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        ))
+    for url in urls:
+        for _ in range(200):
+            try:
+                if httpx.get(url + "/health").status_code == 200:
+                    break
+            except httpx.TransportError:
+                time.sleep(0.1)
+    return procs
+
+
+def stop_nodes(procs):
+    for p in procs:
+        p.terminate()
+    for p in procs:
+        p.wait()
+
+
+def round_robin(client, urls, ids):
+    """Evaluate on node i, chat on node i+1; (chats with context %, ms per evaluate, ms per chat)."""
+    answered, t_eval, t_chat = 0, [], []
+    for i, influencer_id in enumerate(ids):
+        t0 = time.perf_counter()
+        client.get(urls[i % len(urls)] + "/evaluate/demo", params={"influencer_id": influencer_id})
+        t_eval.append((time.perf_counter() - t0) * 1000)
+        t0 = time.perf_counter()
+        reply = client.post(urls[(i + 1) % len(urls)] + "/chat/",
+                            json={"influencer_id": influencer_id, "query": "How is the audience?"}).json()
+        t_chat.append((time.perf_counter() - t0) * 1000)
+        answered += not reply["message"].startswith(NO_CONTEXT)
+    return 100 * answered / len(ids), statistics.median(t_eval), statistics.median(t_chat)
+
+
+def hit_rate(client, urls, ids):
+    hits = sum(client.get(urls[i % len(urls)] + "/evaluate/demo", params={"influencer_id": influencer_id})
+               .headers.get("x-cache") == "fresh" for i, influencer_id in enumerate(ids))
+    return 100 * hits / len(ids)
+
+
+def modulo_moved(ids, before: int, after: int) -> float:
+    return 100 * sum(_hash(i) % before != _hash(i) % after for i in ids) / len(ids)
+
+
+def main():
+    urls = [f"http://127.0.0.1:{_free_port()}" for _ in range(NODES + 1)]
+    members, joiner = urls[:NODES], urls[NODES]
+    ids = [f"cluster-bench-{i}" for i in range(INFLUENCERS)]
+    client = httpx.Client(timeout=60)
+
+    procs = start_nodes(members, None)
+    try:
+        answered, t_eval, t_chat = round_robin(client, members, ids)
+        print(f"{NODES} independent nodes:  chats with context {answered:5.1f}% | evaluate {t_eval:.1f}ms, chat {t_chat:.1f}ms")
+    finally:
+        stop_nodes(procs)
+
+    procs = start_nodes(members, members, urls)
+    try:
+        answered, t_eval, t_chat = round_robin(client, members, ids)
+        local = sum(HashRing(members).node_for(i) == members[(n + 1) % NODES] for n, i in enumerate(ids))
+        print(f"{NODES} sharded nodes:      chats with context {answered:5.1f}% | evaluate {t_eval:.1f}ms, chat {t_chat:.1f}ms "
+              f"({100 * (1 - local / INFLUENCERS):.0f}% of chats forwarded)")
+
+        local_chat = [], []
+        for influencer_id in ids[:60]:
+            owner = HashRing(members).node_for(influencer_id)
+            other = next(u for u in members if u != owner)
+            for bucket, url in zip(local_chat, (owner, other)):
+                t0 = time.perf_counter()
+                client.post(url + "/chat/", json={"influencer_id": influencer_id, "query": "Is it risky?"})
+                bucket.append((time.perf_counter() - t0) * 1000)
+        print(f"chat served by the owner {statistics.median(local_chat[0]):.2f}ms | "
+              f"via a forwarding hop {statistics.median(local_chat[1]):.2f}ms")
+
+        procs += start_nodes([joiner], members + [joiner], urls)
+        client.put(members[0] + "/cluster/nodes", json={"nodes": members + [joiner]}, headers={"X-Cluster-Token": TOKEN})
+        moved = sum(client.get(u + "/cluster/ring").json()["handed_off"] for u in members)
+        print(f"join  {NODES}->{NODES + 1}: moved {100 * moved / INFLUENCERS:4.1f}% of evaluations "
+              f"(modulo-N would move {modulo_moved(ids, NODES, NODES + 1):4.1f}%) | hits after join "
+              f"{hit_rate(client, members + [joiner], ids):5.1f}%")
+
+        leaving = members[1]
+        remaining = [u for u in members + [joiner] if u != leaving]
+        before = client.get(leaving + "/cluster/ring").json()["cached_entries"]
+        client.put(remaining[0] + "/cluster/nodes", json={"nodes": remaining}, headers={"X-Cluster-Token": TOKEN})
+        after = client.get(leaving + "/cluster/ring").json()["cached_entries"]
+        print(f"leave {NODES + 1}->{NODES}: moved {100 * (before - after) / INFLUENCERS:4.1f}% of evaluations "
+              f"(modulo-N would move {modulo_moved(ids, NODES + 1, NODES):4.1f}%) | hits after leave "
+              f"{hit_rate(client, remaining, ids):5.1f}%")
+    finally:
+        stop_nodes(procs)
+
+
+if __name__ == "__main__":
+    main()
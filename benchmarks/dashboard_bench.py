@@ -0,0 +1,78 @@
+"""
+Opening an influencer view: the previous request sequence (GET /mock/influencer/{id},
+POST /evaluate/demo, first POST /chat/) vs GET /dashboard/{id} followed by the first chat turn.
+Counts HTTP round trips, profile generations and structured chat-context builds, and reports
+in-process time plus a simulated network round trip per request (RTT_MS).
+
+Run from the project root:
+    python -m benchmarks.dashboard_bench
+"""
+import os
+import statistics
+import time
+
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.services import chat_context_builder
+from backend.services.data_generator import DataGenerator
+
+VIEWS = 30
+RTT_MS = float(os.environ.get("DASHBOARD_BENCH_RTT_MS", 30))
+CHAT_QUERY = "How is the audience?"
+
+counts = {"generate": 0, "chat_context": 0}
+
+
+def _counting(fn, name):
+    def wrapper(*args, **kwargs):
+        counts[name] += 1
+        return fn(*args, **kwargs)
+    return wrapper
+
+
+def previous_flow(client, influencer_id):
+    client.get(f"/mock/influencer/{influencer_id}")
+    client.post("/evaluate/demo", params={"influencer_id": influencer_id})
+    client.post("/chat/", json={"influencer_id": influencer_id, "query": CHAT_QUERY})
+    return 3
+
+
+def dashboard_flow(client, influencer_id):
+    client.get(f"/dashboard/{influencer_id}")
+    client.post("/chat/", json={"influencer_id": influencer_id, "query": CHAT_QUERY})
+    return 2
+
+
+def run(client, flow, prefix):
+    """(median ms per view incl. simulated RTTs, round trips, generations, context builds) for cold then warm views."""
+    rows = []
+    for temperature in ("cold", "warm"):
+        counts.update(generate=0, chat_context=0)
+        times, trips = [], 0
+        for i in range(VIEWS):
+            t0 = time.perf_counter()
+            n = flow(client, f"{prefix}-{i}")
+            times.append((time.perf_counter() - t0) * 1000 + n * RTT_MS)
+            trips += n
+        rows.append((temperature, statistics.median(times), trips / VIEWS,
+                     counts["generate"] / VIEWS, counts["chat_context"] / VIEWS))
+    return rows
+
+
+def main():
+    DataGenerator.generate_influencer = _counting(DataGenerator.generate_influencer, "generate")
+    chat_context_builder.build_chat_context = _counting(chat_context_builder.build_chat_context, "chat_context")
+
+    with TestClient(app) as client:
+        client.get("/evaluate/demo", params={"influencer_id": "bench-dashboard-warmup"})  # baselines, imports
+        print(f"{VIEWS} influencer views, {RTT_MS:g}ms simulated RTT per request")
+        print(f"{'flow':<22} {'views':<5} {'ms/view':>8} {'round trips':>12} {'profiles':>9} {'context builds':>15}")
+        for label, flow, prefix in (("previous (3 requests)", previous_flow, "bench-prev"),
+                                    ("/dashboard + chat", dashboard_flow, "bench-dash")):
+            for temperature, ms, trips, generated, builds in run(client, flow, prefix):
+                print(f"{label:<22} {temperature:<5} {ms:>8.1f} {trips:>12.0f} {generated:>9.1f} {builds:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
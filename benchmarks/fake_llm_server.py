@@ -0,0 +1,111 @@
+"""
+Local stand-in for the OpenAI chat completions API, with fault injection.
+
+Answers POST /v1/chat/completions with the deterministic mock output, after an injected
+latency (base + occasional spike) and with an injected error rate. Point the real client at it:
+
+    python -m benchmarks.fake_llm_server --port 8765 --spike-prob 0.05 --spike-ms 3000 --error-rate 0.02
+    OPENAI_API_KEY=test OPENAI_BASE_URL=http://127.0.0.1:8765/v1 python3 -m uvicorn backend.main:app
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from ai_engine.llm_client import MockLLMClient
+
+DATA_PREFIX = "Here is the data context:\n"
+
+
+class FaultConfig:
+    def __init__(self, base_ms=150, jitter_ms=50, spike_prob=0.0, spike_ms=0, error_rate=0.0, seed=7):
+        self.base_ms = base_ms
+        self.jitter_ms = jitter_ms
+        self.spike_prob = spike_prob
+        self.spike_ms = spike_ms
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def draw(self):
+        """Returns (latency_s, fail) for one request."""
+        with self.lock:
+            latency = self.base_ms + self.rng.uniform(0, self.jitter_ms)
+            if self.rng.random() < self.spike_prob:
+                latency += self.spike_ms
+            fail = self.rng.random() < self.error_rate
+        return latency / 1000, fail
+
+
+def make_handler(config: FaultConfig):
+    mock = MockLLMClient()
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            latency, fail = config.draw()
+            time.sleep(latency)
+            if fail:
+                self.send_response(500)
+                self.send_header("Content-Type", "application/json")
+                self.end_headers()
+                self.wfile.write(b'{"error": {"message": "injected failure", "type": "server_error"}}')
+                return
+
+            messages = body.get("messages", [])
+            system_prompt = next((m["content"] for m in messages if m["role"] == "system"), "")
+            user = next((m["content"] for m in reversed(messages) if m["role"] == "user"), "")
+            if user.startswith(DATA_PREFIX):
+                content = json.dumps(mock.generate(system_prompt, json.loads(user[len(DATA_PREFIX):])))
+            else:
+                content = json.dumps({"type": "analysis_card", "title": "Stand-in", "verdict": "Neutral", "content": user, "metrics": []})
+
+            payload = json.dumps({
+                "id": "chatcmpl-local",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model", "gpt-4o-mini"),
+                "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+                "usage": {"prompt_tokens": len(json.dumps(messages)) // 4, "completion_tokens": len(content) // 4,
+                          "total_tokens": (len(json.dumps(messages)) + len(content)) // 4},
+            }).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+    return Handler
+
+
+def start_server(config: FaultConfig, port: int = 0) -> ThreadingHTTPServer:
+    """Starts the server on a background thread. port=0 picks a free port (see server.server_port)."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(config))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--base-ms", type=float, default=150)
+    parser.add_argument("--jitter-ms", type=float, default=50)
+    parser.add_argument("--spike-prob", type=float, default=0.0)
+    parser.add_argument("--spike-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    config = FaultConfig(args.base_ms, args.jitter_ms, args.spike_prob, args.spike_ms, args.error_rate)
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), make_handler(config))
+    print(f"Fake LLM server on http://127.0.0.1:{args.port}/v1")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
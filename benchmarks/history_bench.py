@@ -0,0 +1,75 @@
+"""
+Daily history: cost of folding one new day into the 30d/90d aggregates incrementally
+(InfluencerHistory.append_day, O(1)) vs recomputing them from the stored series each day,
+for histories of increasing length. Both include drawing the day; building the summary dict
+for the analysts' context is the same for both and timed separately.
+Also reports generation cost and memory per influencer.
+
+Run from the project root:
+    python -m benchmarks.history_bench
+"""
+import math
+import time
+
+from backend.services.data_generator import DataGenerator
+from backend.services.timeseries import InfluencerHistory, SERIES, WINDOWS
+
+LENGTHS = [180, 730, 3650]
+NEW_DAYS = 500
+GENERATED = 200
+
+
+def rescan(history: InfluencerHistory):
+    """Mean, std and slope of every series over every window, recomputed from the columns."""
+    for name in SERIES:
+        column = getattr(history, name)
+        for size in WINDOWS:
+            window = column[-size:]
+            n = len(window)
+            mean = math.fsum(window) / n
+            math.sqrt(math.fsum((y - mean) ** 2 for y in window) / (n - 1))
+            t_mean = (n - 1) / 2
+            sum(((t - t_mean) * (y - mean) for t, y in enumerate(window))) / (n * (n * n - 1) / 12)
+    # Sponsored ratio and ad decay over the last 30 days
+    flags = history.sponsored[-30:]
+    engagement = history.engagement_rate[-30:]
+    sum(flags), sum(e for e, f in zip(engagement, flags) if f)
+
+
+def main():
+    gen = DataGenerator()
+    profile = gen.generate_influencer("history-bench")
+    print(f"{NEW_DAYS} new days appended; times are per day")
+    for length in LENGTHS:
+        incremental = InfluencerHistory(profile, length)
+        t0 = time.perf_counter()
+        for _ in range(NEW_DAYS):
+            incremental.append_day()
+        t_incremental = (time.perf_counter() - t0) / NEW_DAYS
+        t0 = time.perf_counter()
+        for _ in range(NEW_DAYS):
+            incremental._summary = None
+            incremental.summary()
+        t_summary = (time.perf_counter() - t0) / NEW_DAYS
+
+        rescanned = InfluencerHistory(profile, length)
+        t0 = time.perf_counter()
+        for _ in range(NEW_DAYS):
+            rescanned._draw_day()
+            rescan(rescanned)
+        t_rescan = (time.perf_counter() - t0) / NEW_DAYS
+        print(f"history={length:<5} incremental {t_incremental * 1e6:7.1f}us | rescan windows {t_rescan * 1e6:7.1f}us "
+              f"(x{t_rescan / t_incremental:.1f}) | summary dict {t_summary * 1e6:5.1f}us")
+
+    profiles = [gen.generate_influencer(f"history-{i}") for i in range(GENERATED)]
+    t0 = time.perf_counter()
+    histories = [InfluencerHistory(p) for p in profiles]
+    t_generate = (time.perf_counter() - t0) / GENERATED
+    h = histories[0]
+    column_bytes = sum(getattr(h, name).itemsize * len(h) for name in (*SERIES, "sponsored"))
+    print(f"generate {len(h)} days: {t_generate * 1e3:.2f}ms per influencer, {column_bytes} bytes of columns "
+          f"({column_bytes / len(h):.0f} bytes/day)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Numeric KPIs for N influencers: the per-call mock analyst path (three MockLLMClient.generate
+calls per influencer) vs one KPIEngine.compute() pass over kpi_definitions.json, vectorized
+(numpy) and row by row. Profile generation is outside all timings.
+
+Run from the project root:
+    python -m benchmarks.kpi_bench
+"""
+import time
+
+from ai_engine.kpi_engine import KPIEngine, NUMPY_AVAILABLE
+from ai_engine.llm_client import MockLLMClient
+from ai_engine.orchestrator import orchestrator, ANALYST_ROLES
+from backend.services.baselines import baselines
+from backend.services.campaign_store import campaign_store, DEFAULT_CAMPAIGN_ID
+from backend.services.data_generator import DataGenerator
+
+SIZES = [1, 100, 2000]
+ROUNDS = 3  # best of
+
+
+def best_of(fn):
+    best = float("inf")
+    for _ in range(ROUNDS):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def mock_path(client, influencers, campaign):
+    for influencer in influencers:
+        context = orchestrator._build_context(influencer, campaign)
+        for role in ANALYST_ROLES:
+            client.generate(orchestrator.prompts[role], orchestrator._project(role, context))
+
+
+def main():
+    baselines.ensure_built()  # mock analysts score against these; keep the build out of the timings
+    campaign = campaign_store.get(DEFAULT_CAMPAIGN_ID)
+    gen = DataGenerator()
+    client = MockLLMClient()
+    engines = [("engine numpy", KPIEngine(vectorized=True))] if NUMPY_AVAILABLE else []
+    engines.append(("engine row-by-row", KPIEngine(vectorized=False)))
+    print(f"{len(engines[0][1].kpis)} compiled KPIs; times are per influencer (best of {ROUNDS})")
+
+    for n in SIZES:
+        influencers = [gen.generate_influencer(f"kpi-{i}") for i in range(n)]
+        mock = best_of(lambda: mock_path(client, influencers, campaign))
+        line = f"n={n:<5} mock analysts {mock / n * 1e6:8.1f}us"
+        for label, engine in engines:
+            numbers = best_of(lambda: engine.compute(influencers, campaign, explain=False))
+            explained = best_of(lambda: engine.compute(influencers, campaign))
+            line += f" | {label} {numbers / n * 1e6:6.1f}us (+explanations {explained / n * 1e6:6.1f}us, x{mock / explained:.0f})"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Record/replay fidelity: records RealLLMClient traffic against the local fault-injecting
+stand-in server, then replays the recording offline (no server) through the same orchestrator
+and compares per-evaluation latency. Requires the `openai` package for the recording step.
+
+Run from the project root:
+    python -m benchmarks.llm_replay_bench
+"""
+import os
+import tempfile
+import time
+
+os.environ.setdefault("LLM_HEDGE_MIN_DELAY_MS", "300")
+
+import ai_engine.orchestrator as orchestrator_module
+from ai_engine.llm_client import OPENAI_AVAILABLE, RealLLMClient
+from ai_engine.llm_replay import LLMRecorder, ReplayLLMClient
+from ai_engine.orchestrator import orchestrator
+from backend.services.baselines import baselines
+from backend.services.data_generator import DataGenerator
+from benchmarks.fake_llm_server import FaultConfig, start_server
+
+N = 60
+
+
+def run(label, client, influencers, campaign):
+    orchestrator_module.llm_client = client
+    latencies = []
+    for influencer in influencers:
+        t0 = time.perf_counter()
+        orchestrator.evaluate(influencer, campaign)
+        latencies.append((time.perf_counter() - t0) * 1000)
+    latencies.sort()
+    print(f"{label:<28} p50={latencies[N // 2]:7.1f}ms p90={latencies[int(N * 0.9)]:7.1f}ms "
+          f"max={latencies[-1]:7.1f}ms total={sum(latencies) / 1000:5.1f}s")
+
+
+def main():
+    if not OPENAI_AVAILABLE:
+        print("openai package not installed; skipping.")
+        return
+    baselines.ensure_built()
+    gen = DataGenerator()
+    influencers = [gen.generate_influencer(f"replay-{i}") for i in range(N)]
+    campaign = {**gen.generate_campaign_brief(), "id": "replay-campaign"}
+    path = os.path.join(tempfile.mkdtemp(), "llm_recording.jsonl.gz")
+
+    server = start_server(FaultConfig(base_ms=80, jitter_ms=60, spike_prob=0.05, spike_ms=600, error_rate=0.02))
+    live = RealLLMClient("test-key")
+    live.client = live.client.with_options(base_url=f"http://127.0.0.1:{server.server_port}/v1")
+    live.recorder = LLMRecorder(path)
+    run("live (recording)", live, influencers, campaign)
+    live.recorder.close()
+    server.shutdown()
+    print(f"recorded {live.recorder.recorded} attempts, {os.path.getsize(path) / 1024:.1f} KiB ({path})")
+
+    for label, kwargs in [("replay: role distribution", {}), ("replay: recorded latencies", {"latency": "recorded"}),
+                          ("replay: x0.1 time scale", {"time_scale": 0.1}), ("replay: no latency", {"latency": "none"})]:
+        client = ReplayLLMClient(path, **kwargs)
+        run(label, client, influencers, campaign)
+        stats = client.get_stats()
+        print(f"{'':<28} hits={stats['hits']} misses={stats['misses']} replayed_errors={stats['replayed_errors']} "
+              f"hedges={stats['resilience']['hedges']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Tail latency and degraded-mode behaviour of RealLLMClient against the local fault-injecting
+stand-in server (no network or API key needed; requires the `openai` package).
+
+Run from the project root:
+    python -m benchmarks.llm_tail_latency_bench
+"""
+import os
+import time
+
+os.environ.setdefault("LLM_HEDGE_MIN_DELAY_MS", "100")
+
+from ai_engine.llm_client import OPENAI_AVAILABLE, RealLLMClient
+from ai_engine.orchestrator import orchestrator
+from backend.services.data_generator import DataGenerator
+from benchmarks.fake_llm_server import FaultConfig, start_server
+
+N = 150
+PROMPT = orchestrator.prompts["risk_analyst"]
+
+
+def run(label, server, hedge: bool):
+    client = RealLLMClient("test-key")
+    client.client = client.client.with_options(base_url=f"http://127.0.0.1:{server.server_port}/v1")
+    if not hedge:
+        client.resilience.hedge_min_delay_s = 1e9
+
+    gen = DataGenerator()
+    latencies, degraded = [], 0
+    for i in range(N):
+        context = {"influencer": {"id": f"tail-{i}"}, "content_type": "all",
+                   "detailed_metrics": gen.generate_influencer(f"tail-{i}")["detailed_metrics"]}
+        t0 = time.perf_counter()
+        result = client.generate(PROMPT, context)
+        latencies.append((time.perf_counter() - t0) * 1000)
+        degraded += bool(result.get("degraded"))
+
+    latencies.sort()
+    stats = client.resilience.get_stats()
+    print(f"{label:<34} p50={latencies[N // 2]:7.1f}ms p99={latencies[int(N * 0.99)]:7.1f}ms "
+          f"hedges={stats['hedges']:3d} degraded={degraded:3d} breaker={stats['breaker_state']}")
+
+
+def main():
+    if not OPENAI_AVAILABLE:
+        print("openai package not installed; skipping.")
+        return
+
+    spiky = start_server(FaultConfig(base_ms=40, jitter_ms=10, spike_prob=0.03, spike_ms=1500))
+    run("latency spikes, no hedging", spiky, hedge=False)
+    run("latency spikes, hedged", spiky, hedge=True)
+
+    failing = start_server(FaultConfig(base_ms=20, jitter_ms=5, error_rate=1.0))
+    run("provider outage (breaker)", failing, hedge=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+N influencers x M campaigns: evaluate() per pair vs Orchestrator.evaluate_matrix().
+Runs against the deterministic mock, and (if `openai` is installed) against the local
+fake LLM server with 40ms per call, where call count and batching dominate.
+Only analysts whose CONTEXT_FIELDS read no campaign field run once per influencer. With the
+current prompts every analyst reads the brief, so the matrix makes as many LLM calls as the
+per-pair loop and gains only from sending each stage as one batch.
+
+Run from the project root:
+    python -m benchmarks.matrix_bench
+"""
+import time
+
+import ai_engine.orchestrator as orchestrator_module
+from ai_engine.llm_client import OPENAI_AVAILABLE, MockLLMClient, RealLLMClient
+from ai_engine.orchestrator import orchestrator
+from backend.services.baselines import baselines
+from backend.services.data_generator import DataGenerator
+from benchmarks.fake_llm_server import FaultConfig, start_server
+
+N, M = 10, 5
+ROUNDS = 3  # best of
+
+
+def run(label, client):
+    orchestrator_module.llm_client = client
+    gen = DataGenerator()
+    influencers = [gen.generate_influencer(f"matrix-{i}") for i in range(N)]
+    campaigns = [{**gen.generate_campaign_brief(), "id": f"campaign-{j}"} for j in range(M)]
+
+    per_pair = batched = float("inf")
+    for _ in range(ROUNDS):
+        t0 = time.perf_counter()
+        for influencer in influencers:
+            for campaign in campaigns:
+                orchestrator.evaluate(influencer, campaign)
+        per_pair = min(per_pair, time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        matrix = orchestrator.evaluate_matrix(influencers, campaigns)
+        batched = min(batched, time.perf_counter() - t0)
+
+    print(f"{label:<22} per-pair {per_pair * 1000:8.1f}ms ({matrix['unbatched_llm_calls']} LLM calls)   "
+          f"matrix {batched * 1000:8.1f}ms ({matrix['llm_calls']} LLM calls)   x{per_pair / batched:.1f}")
+
+
+def main():
+    baselines.ensure_built()  # mock analysts score against these; keep the build out of the timings
+    print(f"{N} influencers x {M} campaigns; roles run once per influencer: {orchestrator.shared_roles or 'none'}")
+    run("mock (CPU only)", MockLLMClient())
+
+    if not OPENAI_AVAILABLE:
+        print("openai package not installed; skipping the remote-client run.")
+        return
+    server = start_server(FaultConfig(base_ms=40, jitter_ms=5))
+    client = RealLLMClient("test-key")
+    client.client = client.client.with_options(base_url=f"http://127.0.0.1:{server.server_port}/v1")
+    run("remote (40ms / call)", client)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Cost of the opt-in request profiler: requests per second for a cached /evaluate/demo and a /chat/
+turn with profiling off, on with only tracking (sample rate 0: stage bookkeeping, slow-request
+watch) and on with every request sampled; plus Orchestrator.evaluate itself with and without an
+active (sampled) request profile.
+
+Run from the project root:
+    python -m benchmarks.profiling_bench
+"""
+import time
+
+from fastapi.testclient import TestClient
+
+from ai_engine.orchestrator import orchestrator
+from ai_engine.profiling import profiler
+from backend.main import app
+from backend.services.baselines import baselines
+from backend.services.data_generator import generator
+from backend.services.campaign_store import campaign_store, DEFAULT_CAMPAIGN_ID
+
+REQUESTS = 300
+ROUNDS = 5
+EVALUATIONS = 300
+MODES = [("off", False, 0.0), ("tracking only", True, 0.0), ("all sampled", True, 1.0)]
+
+
+def rate(fn, n: int) -> float:
+    """Requests per second over n sequential calls."""
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return n / (time.perf_counter() - t0)
+
+
+def main():
+    profiler.slow_ms = 1e9  # Nothing is slow enough to be kept: measures the per-request cost only
+    with TestClient(app) as client:
+        client.get("/evaluate/demo", params={"influencer_id": "profiling-bench"})
+        demo = lambda: client.get("/evaluate/demo", params={"influencer_id": "profiling-bench"})
+        chat = lambda: client.post("/chat/", json={"influencer_id": "profiling-bench", "query": "Is it risky?"})
+        rate(demo, 100)
+        # Modes interleaved over several rounds; best round per mode
+        best = {label: [0.0, 0.0] for label, _, _ in MODES}
+        for _ in range(ROUNDS):
+            for label, enabled, sample_rate in MODES:
+                profiler.enabled, profiler.sample_rate = enabled, sample_rate
+                best[label][0] = max(best[label][0], rate(demo, REQUESTS))
+                best[label][1] = max(best[label][1], rate(chat, REQUESTS))
+        profiler.enabled = False
+        print(f"interval {profiler.interval_ms:g}ms")
+        for label, (demo_rate, chat_rate) in best.items():
+            print(f"{label:<14} cached /evaluate/demo {demo_rate:7.0f} req/s | /chat/ {chat_rate:7.0f} req/s")
+
+    baselines.ensure_built()
+    campaign = campaign_store.get(DEFAULT_CAMPAIGN_ID)
+    for i in range(20):
+        orchestrator.evaluate(generator.generate_influencer(f"profiling-bench-warm-{i}"), campaign)
+    # Fresh influencers for every run (nothing memoized), alternating plain/profiled; best run each
+    t_plain = t_profiled = float("inf")
+    samples = stages = 0
+    for r in range(ROUNDS):
+        for profiled in (False, True):
+            influencers = [generator.generate_influencer(f"profiling-bench-{r}-{profiled}-{i}") for i in range(EVALUATIONS)]
+            if profiled:
+                profile = profiler.begin("BENCH", "evaluate", forced=True)
+                token = profiler.activate(profile)
+            t0 = time.perf_counter()
+            for influencer in influencers:
+                orchestrator.evaluate(influencer, campaign)
+            elapsed = (time.perf_counter() - t0) / EVALUATIONS
+            if profiled:
+                profiler.deactivate(token)
+                profiler.end(profile, 200)
+                samples, stages = sum(profile.samples.values()), len(profile.timeline)
+                t_profiled = min(t_profiled, elapsed)
+            else:
+                t_plain = min(t_plain, elapsed)
+    print(f"Orchestrator.evaluate (mock LLM) {t_plain * 1e3:.3f}ms | profiled {t_profiled * 1e3:.3f}ms "
+          f"({100 * (t_profiled / t_plain - 1):+.1f}%), {samples} samples, "
+          f"{stages} stage records per run")
+
+
+if __name__ == "__main__":
+    main()
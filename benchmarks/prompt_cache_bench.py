@@ -0,0 +1,70 @@
+"""
+Prompt edits and targeted invalidation vs clearing the evaluation cache. A working set of
+influencers x 2 campaigns is cached through /evaluate/demo, then one change is applied (an
+executive decider prompt edit, an analyst prompt edit, one influencer, one campaign) and the
+working set is requested again: entries kept, evaluations re-run and time to re-warm, compared
+with EvaluationCache.clear(). Prompt edits go to a copy of the prompt directory.
+
+Run from the project root:
+    python -m benchmarks.prompt_cache_bench
+"""
+import os
+import shutil
+import tempfile
+import time
+
+from fastapi.testclient import TestClient
+
+from ai_engine.orchestrator import orchestrator
+from backend.main import app
+from backend.services.cache import cache
+from backend.services.baselines import baselines
+
+INFLUENCERS = 200
+
+
+def rewarm(client, requests) -> (int, float):
+    """Requests the whole working set; (evaluations re-run, seconds)."""
+    t0 = time.perf_counter()
+    misses = sum(client.get("/evaluate/demo", params=params).headers["x-cache"] == "miss" for params in requests)
+    return misses, time.perf_counter() - t0
+
+
+def edit(prompt_dir: str, role: str):
+    with open(os.path.join(prompt_dir, f"{role}.txt"), "a") as f:
+        f.write("\nKeep the summary short.\n")
+
+
+def main():
+    prompt_dir = tempfile.mkdtemp()
+    for filename in os.listdir(orchestrator.prompt_dir):
+        shutil.copy(os.path.join(orchestrator.prompt_dir, filename), prompt_dir)
+    orchestrator.prompt_dir = prompt_dir
+    orchestrator.reload_prompts()
+    baselines.ensure_built()
+    try:
+        with TestClient(app) as client:
+            campaign_ids = ["demo", client.post("/campaigns/", json=client.get("/mock/campaign").json()).json()["id"]]
+            requests = [{"influencer_id": f"prompt-cache-bench-{i}", "campaign_id": c} for i in range(INFLUENCERS) for c in campaign_ids]
+            changes = [
+                ("executive decider prompt edit", lambda: (edit(prompt_dir, "executive_decider"), client.post("/evaluate/cache/reload_prompts", json={}))),
+                ("risk analyst prompt edit", lambda: (edit(prompt_dir, "risk_analyst"), client.post("/evaluate/cache/reload_prompts", json={}))),
+                ("one influencer", lambda: client.post("/evaluate/cache/invalidate", json={"influencer_id": requests[0]["influencer_id"]})),
+                ("one campaign", lambda: client.post("/evaluate/cache/invalidate", json={"campaign_id": campaign_ids[1]})),
+            ]
+            rewarm(client, requests)
+            print(f"working set: {len(requests)} evaluations")
+            for label, change in changes:
+                change()
+                kept = cache.get_stats()["entries"]
+                misses, elapsed = rewarm(client, requests)
+                cache.clear()
+                full_misses, full_elapsed = rewarm(client, requests)
+                print(f"{label:<30} targeted: kept {100 * kept / len(requests):5.1f}%, re-ran {misses:4d}, "
+                      f"re-warm {elapsed * 1e3:7.1f}ms | clear(): re-ran {full_misses:4d}, re-warm {full_elapsed * 1e3:7.1f}ms")
+    finally:
+        shutil.rmtree(prompt_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Prompt tokens and pipeline latency with per-role context projection vs. the old
+full-context, indent=2 payloads.
+
+Run from the project root:
+    python -m benchmarks.prompt_projection_bench
+"""
+import json
+import time
+
+from ai_engine.orchestrator import Orchestrator
+from ai_engine.prompt_context import count_tokens
+from backend.services.data_generator import DataGenerator
+
+N = 300
+ROLES = ["performance_analyst", "risk_analyst", "audience_strategist", "executive_decider"]
+
+
+def legacy_tokens(orch: Orchestrator, influencer, campaign, result):
+    """Tokens each role used to receive: full context serialized with indent=2."""
+    context = {
+        "influencer": influencer,
+        "campaign": campaign,
+        "detailed_metrics": influencer.get("detailed_metrics", {}),
+        "content_type": influencer.get("content_type_context", "all"),
+    }
+    reports = result["analyst_reports"]
+    exec_context = {"analyst_reports": {"performance": reports[0]["kpis"], "risk": reports[1]["kpis"], "audience": reports[2]["kpis"]}, **context}
+    out = {}
+    for role in ROLES:
+        data = exec_context if role == "executive_decider" else context
+        out[role] = orch.prompt_tokens[role] + count_tokens(json.dumps(data, indent=2))
+    return out
+
+
+def main():
+    gen = DataGenerator()
+    pairs = [(gen.generate_influencer(f"bench-prompt-{i}"), gen.generate_campaign_brief()) for i in range(N)]
+
+    projected = Orchestrator(project_context=True)
+    full = Orchestrator(project_context=False)
+
+    timings = {}
+    for name, orch in (("full context", full), ("projected", projected)):
+        t0 = time.perf_counter()
+        results = [orch.evaluate(inf, camp) for inf, camp in pairs]
+        timings[name] = (time.perf_counter() - t0) * 1000 / N
+
+    legacy = {role: 0 for role in ROLES}
+    for (inf, camp), result in zip(pairs, results):
+        for role, tokens in legacy_tokens(full, inf, camp, result).items():
+            legacy[role] += tokens / N
+
+    stats = projected.get_token_stats()
+    print(f"{'role':<22} {'before (indent=2)':>18} {'after (projected)':>18} {'reduction':>10}")
+    for role in ROLES:
+        after = stats[role]["avg_input_tokens"]
+        print(f"{role:<22} {legacy[role]:>18.0f} {after:>18.0f} {1 - after / legacy[role]:>9.0%}")
+    before_total, after_total = sum(legacy.values()), sum(stats[r]["avg_input_tokens"] for r in ROLES)
+    print(f"{'total / evaluation':<22} {before_total:>18.0f} {after_total:>18.0f} {1 - after_total / before_total:>9.0%}")
+    print(f"\nlocal pipeline time per evaluation (mock LLM): full={timings['full context']:.2f}ms projected={timings['projected']:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
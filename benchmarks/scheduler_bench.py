@@ -0,0 +1,59 @@
+"""
+Interactive latency under bulk load.
+
+Simulates evaluations with a fixed service time (a stand-in for 4 serial LLM calls)
+and measures interactive p50/p99 wait with and without a concurrent 500-creator bulk run.
+
+Run from the project root:
+    python -m benchmarks.scheduler_bench
+"""
+import asyncio
+import time
+
+from backend.services.scheduler import EvaluationScheduler
+
+SERVICE_TIME_S = 0.02
+
+
+def fake_evaluation(_influencer_id: str):
+    time.sleep(SERVICE_TIME_S)
+    return {"ok": True}
+
+
+async def run(with_bulk: bool):
+    sched = EvaluationScheduler({
+        "interactive": (8.0, 4, 64),
+        "bulk": (1.0, 2, 1000),
+    })
+    bulk_tasks = []
+    if with_bulk:
+        bulk_tasks = [asyncio.ensure_future(sched.submit("bulk", fake_evaluation, f"bulk-{i}")) for i in range(500)]
+        await asyncio.sleep(0.05)
+
+    latencies = []
+    for i in range(50):
+        t0 = time.perf_counter()
+        await sched.submit("interactive", fake_evaluation, f"user-{i}")
+        latencies.append((time.perf_counter() - t0) * 1000)
+        await asyncio.sleep(0.005)
+
+    stats = sched.stats()
+    for t in bulk_tasks:
+        t.cancel()
+    await asyncio.gather(*bulk_tasks, return_exceptions=True)
+    while any(c.in_flight for c in sched.classes.values()):
+        await asyncio.sleep(SERVICE_TIME_S)
+
+    latencies.sort()
+    return latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.99) - 1], stats
+
+
+def main():
+    for with_bulk in (False, True):
+        p50, p99, stats = asyncio.run(run(with_bulk))
+        label = "with bulk load   " if with_bulk else "interactive only "
+        print(f"{label} p50={p50:6.1f}ms p99={p99:6.1f}ms  bulk_queue_depth={stats['bulk']['queue_depth']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+What-if sweeps: re-running Orchestrator.evaluate for every (budget, goal, content_type) variation
+vs one local SensitivityAnalyzer sweep over the cached evaluation, for growing grids.
+Re-runs use the configured LLM client (the deterministic mock unless LLM_API_KEY is set) and are
+capped at RERUN_CAP evaluations, extrapolated to the full grid.
+
+Run from the project root:
+    python -m benchmarks.sensitivity_bench
+"""
+import time
+
+from ai_engine.orchestrator import orchestrator
+from backend.services.data_generator import generator
+from backend.services.campaign_store import campaign_store, DEFAULT_CAMPAIGN_ID
+from backend.services.sensitivity import SensitivityAnalyzer, NUMPY_AVAILABLE
+
+GOALS = ["Awareness", "Conversion"]
+CONTENT_TYPES = ["short", "long", "all"]
+BUDGET_STEPS = [1, 15, 150, 1500]
+RERUN_CAP = 30
+REPEATS = 20
+
+
+def main():
+    campaign = campaign_store.get(DEFAULT_CAMPAIGN_ID)
+    influencer = generator.generate_influencer("sensitivity-bench")
+    evaluation = orchestrator.evaluate(influencer, campaign)
+
+    # Per-evaluation cost of the re-run approach
+    t0 = time.perf_counter()
+    for i in range(RERUN_CAP):
+        variant = {**campaign, "budget": 1000 * (i + 1), "goal": GOALS[i % 2]}
+        orchestrator.evaluate(generator.generate_influencer("sensitivity-bench", CONTENT_TYPES[i % 3]), variant)
+    t_rerun = (time.perf_counter() - t0) / RERUN_CAP
+
+    analyzers = [("point by point", SensitivityAnalyzer(vectorized=False))]
+    if NUMPY_AVAILABLE:
+        analyzers.append(("vectorized", SensitivityAnalyzer()))
+    for steps in BUDGET_STEPS:
+        budgets = [1000 + 100000 * i / steps for i in range(steps)]
+        points = steps * len(GOALS) * len(CONTENT_TYPES)
+        line = f"grid={points:<5} re-run evaluate {t_rerun * points * 1e3:9.1f}ms"
+        for label, analyzer in analyzers:
+            t0 = time.perf_counter()
+            for _ in range(REPEATS):
+                analyzer.analyze(evaluation, influencer, campaign, "all", budgets, GOALS, CONTENT_TYPES)
+            t_sweep = (time.perf_counter() - t0) / REPEATS
+            line += f" | {label} {t_sweep * 1e3:6.2f}ms"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+k-NN query latency of the /mock/similar index over the full population (default 100k profiles,
+override with SIMILAR_POPULATION, e.g. 1000000), plus IVF recall against the exact scan. Building
+the index dominates the runtime.
+
+Run from the project root:
+    python -m benchmarks.similarity_bench
+"""
+import time
+
+from backend.services.data_generator import DataGenerator
+from backend.services.similarity import similarity_index, NUMPY_AVAILABLE
+
+QUERIES = 200
+
+
+def main():
+    t0 = time.perf_counter()
+    similarity_index.ensure_built()
+    print(f"indexed {similarity_index.indexed:,} profiles in {time.perf_counter() - t0:.1f}s (numpy={NUMPY_AVAILABLE})")
+
+    gen = DataGenerator()
+    queries = [gen.generate_influencer(f"query-{i}") for i in range(QUERIES)]
+    for label, filters in [("unfiltered", {}), ("niche", {"niche": "Tech"}), ("niche+platform", {"niche": "Tech", "platform": "TikTok"})]:
+        latencies = []
+        for profile in queries:
+            t = time.perf_counter()
+            similarity_index.query(profile, 10, **filters)
+            latencies.append((time.perf_counter() - t) * 1000)
+        latencies.sort()
+        print(f"{label:<16} p50={latencies[QUERIES // 2]:6.2f}ms  p99={latencies[int(QUERIES * 0.99)]:6.2f}ms")
+
+    # Unfiltered queries are approximate (IVF); measure recall@10 against the exact scan
+    if similarity_index.get_stats()["ivf"]:
+        latencies, hits = [], 0
+        for profile in queries:
+            t = time.perf_counter()
+            exact = similarity_index.query(profile, 10, exact=True)
+            latencies.append((time.perf_counter() - t) * 1000)
+            hits += len({i for i, _ in exact} & {i for i, _ in similarity_index.query(profile, 10)})
+        latencies.sort()
+        print(f"{'exact scan':<16} p50={latencies[QUERIES // 2]:6.2f}ms  p99={latencies[int(QUERIES * 0.99)]:6.2f}ms")
+        print(f"IVF recall@10 vs exact: {hits / (10 * QUERIES):.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Cost of schema-validating LLM outputs, per evaluation (3 analyst reports + 1 executive decision):
+one validator call per output vs the bulk path used by evaluate_matrix, next to the cost of a
+mock evaluate() itself.
+
+Run from the project root:
+    python -m benchmarks.validation_bench
+"""
+import time
+
+from ai_engine.llm_client import MockLLMClient
+from ai_engine.orchestrator import orchestrator, ANALYST_ROLES
+from ai_engine.output_validation import OutputValidator, VALIDATION_BUDGET_US
+from backend.services.baselines import baselines
+from backend.services.data_generator import DataGenerator
+
+N = 500
+ROUNDS = 5  # best of
+
+
+def best_of(fn):
+    best = float("inf")
+    for _ in range(ROUNDS):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    baselines.ensure_built()
+    gen = DataGenerator()
+    client = MockLLMClient()
+    campaign = {**gen.generate_campaign_brief(), "id": "validation-campaign"}
+    influencers = [gen.generate_influencer(f"validation-{i}") for i in range(N)]
+
+    # Realistic outputs: the mock's analyst reports plus an LLM-style executive decision per evaluation
+    roles, outputs = [], []
+    for influencer in influencers:
+        context = orchestrator._build_context(influencer, campaign)
+        for role in ANALYST_ROLES + ["executive_decider"]:
+            roles.append(role)
+            outputs.append(client.generate(orchestrator.prompts[role], orchestrator._project(role, context)))
+
+    validator = OutputValidator()
+    single = best_of(lambda: [validator.errors(r, o) for r, o in zip(roles, outputs)])
+    bulk = best_of(lambda: validator.errors_many(roles, outputs))
+    evaluate = best_of(lambda: [orchestrator.evaluate(i, campaign) for i in influencers[:100]]) / 100
+
+    print(f"{N} evaluations, {len(outputs)} outputs (budget {VALIDATION_BUDGET_US:.0f}us per evaluation)")
+    print(f"per-output validation  {single / N * 1e6:7.1f}us per evaluation")
+    print(f"bulk validation        {bulk / N * 1e6:7.1f}us per evaluation")
+    print(f"mock evaluate()        {evaluate * 1e6:7.1f}us per evaluation (validation included)")
+
+
+if __name__ == "__main__":
+    main()
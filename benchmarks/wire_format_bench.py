@@ -0,0 +1,61 @@
+"""
+Payload size and CPU time per wire format for /evaluate/demo responses: encode, encode + gzip
+(the server's work per compressed response) and decode (the client's). MessagePack's case is CPU,
+not bytes: after gzip the sizes are on par with JSON.
+
+Run from the project root:
+    python -m benchmarks.wire_format_bench
+"""
+import gc
+import gzip
+import json
+import time
+
+from ai_engine.orchestrator import orchestrator
+from backend.services import wire_format
+from backend.services.data_generator import DataGenerator
+
+N = 200
+
+
+def timed(fn, payloads):
+    # As timeit does: a full collection over the evaluation engine's heap would dwarf a decode
+    gc.disable()
+    try:
+        t0 = time.perf_counter()
+        out = [fn(p) for p in payloads]
+        return out, (time.perf_counter() - t0) * 1e6 / len(payloads)
+    finally:
+        gc.enable()
+
+
+def main():
+    gen = DataGenerator()
+    payloads = [
+        orchestrator.evaluate(gen.generate_influencer(f"bench-wire-{i}"), gen.generate_campaign_brief())
+        for i in range(N)
+    ]
+
+    # name, media type (decode side), encoder
+    formats = [("json (baseline)", "application/json", lambda p: json.dumps(p).encode("utf-8"))]
+    formats.append(("json compact", "application/json", lambda p: wire_format.encode(p, "application/json")))
+    if wire_format.MSGPACK_AVAILABLE:
+        formats.append(("msgpack + kpi dict", wire_format.MSGPACK_MEDIA_TYPE,
+                        lambda p: wire_format.encode(p, wire_format.MSGPACK_MEDIA_TYPE)))
+    if wire_format.CBOR_AVAILABLE:
+        formats.append(("cbor + kpi dict", wire_format.CBOR_MEDIA_TYPE,
+                        lambda p: wire_format.encode(p, wire_format.CBOR_MEDIA_TYPE)))
+
+    print(f"{'format':<22} {'bytes':>7} {'gzip':>7} {'brotli':>7} {'encode_us':>10} {'enc+gzip_us':>12} {'decode_us':>10}")
+    for name, media_type, fn in formats:
+        bodies, encode_us = timed(fn, payloads)
+        _, encode_gzip_us = timed(lambda p: gzip.compress(fn(p), 6), payloads)
+        _, decode_us = timed(lambda b: wire_format.decode(b, media_type), bodies)
+        raw = sum(len(b) for b in bodies) / N
+        gz = sum(len(gzip.compress(b, 6)) for b in bodies) / N
+        br = sum(len(wire_format.brotli.compress(b, quality=5)) for b in bodies) / N if wire_format.BROTLI_AVAILABLE else float("nan")
+        print(f"{name:<22} {raw:>7.0f} {gz:>7.0f} {br:>7.0f} {encode_us:>10.1f} {encode_gzip_us:>12.1f} {decode_us:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
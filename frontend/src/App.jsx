@@ -44,8 +44,8 @@ function App() {
     setResult(null);
 
     try {
-      const data = await api.evaluateDemo(influencerId, null, contentTypeFilter);
-      setResult(data);
+      const data = await api.getDashboard(influencerId, null, contentTypeFilter);
+      setResult(data.evaluation);
       setView('dashboard');
       setActiveTab('overview');
     } catch (err) {
@@ -62,8 +62,8 @@ function App() {
     // Ideally useEffect but let's just hack it for MVP
     // We'll just call api directly
     setLoading(true);
-    api.evaluateDemo(id, null, contentTypeFilter).then(data => {
-      setResult(data);
+    api.getDashboard(id, null, contentTypeFilter).then(data => {
+      setResult(data.evaluation);
       setView('dashboard');
       setActiveTab('overview');
     }).catch(() => setError("Failed")).finally(() => setLoading(false));
@@ -179,6 +179,8 @@ function App() {
                   <div className="h-full">
                     <ChatPanel
                       influencerId={result.influencer_id}
+                      contentType={contentTypeFilter}
+                      campaignId={result.campaign_id}
                       isOpen={true}
                       onClose={() => { }}
                       isEmbedded={true}
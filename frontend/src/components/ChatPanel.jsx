@@ -2,12 +2,13 @@ import React, { useState, useEffect, useRef } from 'react';
 import { Send, Bot, User, X } from 'lucide-react';
 import { api } from '../services/api';
 
-const ChatPanel = ({ influencerId, isOpen, onClose, isEmbedded = false }) => {
+const ChatPanel = ({ influencerId, contentType = 'all', campaignId = null, isOpen, onClose, isEmbedded = false }) => {
     const [messages, setMessages] = useState([
         { role: 'assistant', text: "Start chatting with me! I have analyzed this influencer's data. You can ask about Risk, ROI, or performance drivers." }
     ]);
     const [input, setInput] = useState('');
     const [loading, setLoading] = useState(false);
+    const [sessionId, setSessionId] = useState(null);
     const messagesEndRef = useRef(null);
 
     const scrollToBottom = () => {
@@ -27,7 +28,8 @@ const ChatPanel = ({ influencerId, isOpen, onClose, isEmbedded = false }) => {
         setLoading(true);
 
         try {
-            const response = await api.chatWithAI(influencerId, userMsg.text);
+            const response = await api.chatWithAI(influencerId, userMsg.text, sessionId, contentType, campaignId);
+            setSessionId(response.session_id);
             const botMsg = { role: 'assistant', text: response.message };
             setMessages(prev => [...prev, botMsg]);
         } catch (err) {
@@ -23,11 +23,58 @@ export const api = {
         }
     },
 
-    chatWithAI: async (influencerId, query) => {
+    /**
+     * Everything the influencer view needs in one round trip:
+     * profile, evaluation, chat category cards and a consultant card per KPI.
+     */
+    getDashboard: async (influencerId, campaignId = null, contentType = 'all') => {
+        try {
+            const response = await axios.get(`${API_BASE_URL}/dashboard/${encodeURIComponent(influencerId)}`, {
+                params: {
+                    campaign_id: campaignId,
+                    content_type: contentType
+                }
+            });
+            return response.data;
+        } catch (error) {
+            console.error("API Error:", error);
+            throw error;
+        }
+    },
+
+    /**
+     * What-if sweep over the cached evaluation (no LLM calls): decision and ROI for every
+     * combination of the given budgets, goals and content types.
+     */
+    getSensitivity: async (influencerId, { budgets = [], goals = [], contentTypes = [] } = {}, campaignId = null, contentType = 'all') => {
+        try {
+            const response = await axios.post(`${API_BASE_URL}/evaluate/sensitivity`, {
+                influencer_id: influencerId,
+                campaign_id: campaignId || undefined,
+                content_type: contentType,
+                budgets: budgets,
+                goals: goals,
+                content_types: contentTypes
+            });
+            return response.data;
+        } catch (error) {
+            console.error("API Error:", error);
+            throw error;
+        }
+    },
+
+    /**
+     * One chat turn about the evaluation shown on the dashboard: content type and campaign
+     * must match it, the backend looks the evaluation up per influencer x campaign x content type.
+     */
+    chatWithAI: async (influencerId, query, sessionId = null, contentType = 'all', campaignId = null) => {
         try {
             const response = await axios.post(`${API_BASE_URL}/chat/`, {
                 influencer_id: influencerId,
-                query: query
+                query: query,
+                session_id: sessionId,
+                content_type: contentType,
+                campaign_id: campaignId || undefined
             });
             return response.data;
         } catch (error) {
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Tests import the app packages from the project root, like `python -m benchmarks.<name>` does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Small similarity index: the app's startup hook builds it in every TestClient process
+os.environ.setdefault("SIMILAR_POPULATION", "1000")
@@ -0,0 +1,52 @@
+import random
+import statistics
+
+import pytest
+
+from backend.services.baselines import QuantileSketch
+
+
+def lognormal(n: int, seed: int):
+    rng = random.Random(seed)
+    return [rng.lognormvariate(10, 1.5) for _ in range(n)]
+
+
+@pytest.mark.parametrize("bulk", [True, False])
+def test_exact_below_capacity(bulk):
+    values = lognormal(1000, seed=1)
+    sketch = QuantileSketch(capacity=2048)
+    if bulk:
+        sketch.add_many(values)
+    else:
+        for value in values:
+            sketch.add(value)
+
+    cuts = statistics.quantiles(values, n=100)
+    for pct, cut in enumerate(cuts, start=1):
+        assert sketch.percentile(cut) == pytest.approx(pct, abs=0.2)
+        assert sketch.quantile(pct / 100) == pytest.approx(cut, rel=0.05)
+
+
+@pytest.mark.parametrize("bulk", [True, False])
+def test_reservoir_tracks_the_stream_above_capacity(bulk):
+    values = lognormal(50_000, seed=2)
+    sketch = QuantileSketch(capacity=2048, seed=3)
+    if bulk:
+        sketch.add_many(values)
+    else:
+        for value in values:
+            sketch.add(value)
+
+    assert len(sketch.samples) == 2048 and sketch.count == 50_000
+    cuts = statistics.quantiles(values, n=20)
+    for pct, cut in zip(range(5, 100, 5), cuts):
+        # Sampling error of a 2048-value uniform reservoir: ~1 point sd at the median
+        assert sketch.percentile(cut) == pytest.approx(pct, abs=3.5)
+
+
+def test_ties_count_half_and_bounds():
+    sketch = QuantileSketch(capacity=16)
+    sketch.add_many([1.0, 2.0, 2.0, 3.0])
+    assert sketch.percentile(2.0) == 50.0
+    assert sketch.percentile(0.0) == 0.0 and sketch.percentile(9.0) == 100.0
+    assert sketch.quantile(0.0) == 1.0 and sketch.quantile(1.0) == 3.0
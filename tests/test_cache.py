@@ -0,0 +1,80 @@
+import asyncio
+import itertools
+
+import pytest
+
+import backend.routers.evaluate as evaluate
+from backend.services.cache import cache
+
+_keys = itertools.count()
+
+
+@pytest.fixture
+def key(monkeypatch):
+    monkeypatch.setattr(cache, "fresh_ttl_s", 10.0)
+    monkeypatch.setattr(cache, "max_stale_s", 100.0)
+    key = f"test-swr-{next(_keys)}"
+    yield key
+    cache.pop(key)
+
+
+def age_by(key: str, seconds: float):
+    cache._stored_at[key] -= seconds
+
+
+def test_freshness_follows_ttl_and_max_stale_age(key):
+    cache.set(key, {"n": 1})
+    assert cache.get_with_freshness(key) == ({"n": 1}, "fresh")
+
+    age_by(key, 11)
+    assert cache.get_with_freshness(key) == ({"n": 1}, "stale")
+    assert cache.get(key) == {"n": 1}
+
+    age_by(key, 90)
+    assert cache.get(key) is None
+    assert cache.get_with_freshness(key) == (None, None)
+    assert key not in dict(cache.items())  # dropped, not just hidden
+
+
+def test_refresh_lock_is_taken_once_per_key(key):
+    assert cache.begin_refresh(key)
+    assert not cache.begin_refresh(key)
+    cache.end_refresh(key)
+    assert cache.begin_refresh(key)
+    cache.end_refresh(key)
+
+
+def test_stale_entry_is_served_while_one_refresh_runs(key, monkeypatch):
+    runs = []
+
+    def refresh(influencer_id, campaign, content_type, influencer=None):
+        runs.append(influencer_id)
+        cache.set(key, {"n": 2})
+
+    monkeypatch.setattr(evaluate, "_run_demo_evaluation", refresh)
+    cache.set(key, {"n": 1})
+    age_by(key, 11)
+    version = cache.version(key)
+
+    async def scenario():
+        reads = [evaluate.cached_evaluation(key, "inf-swr", {"id": "c"}, "all") for _ in range(5)]
+        await asyncio.gather(*evaluate._refresh_tasks)
+        return reads
+
+    reads = asyncio.run(scenario())
+    assert reads == [({"n": 1}, "stale")] * 5
+    assert runs == ["inf-swr"]
+    assert cache.get_with_freshness(key) == ({"n": 2}, "fresh") and cache.version(key) > version
+    assert cache.begin_refresh(key)  # released after the refresh
+    cache.end_refresh(key)
+
+
+def test_entry_past_max_stale_age_is_a_miss_without_refresh(key, monkeypatch):
+    monkeypatch.setattr(evaluate, "_run_demo_evaluation", lambda *a, **k: pytest.fail("refreshed an expired entry"))
+    cache.set(key, {"n": 1})
+    age_by(key, 101)
+
+    async def scenario():
+        return evaluate.cached_evaluation(key, "inf-swr", {"id": "c"}, "all")
+
+    assert asyncio.run(scenario()) == (None, None)
@@ -0,0 +1,50 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.services.cache import cache
+from backend.services.campaign_store import evaluation_key
+
+client = TestClient(app)
+
+# (influencer, campaign, roles whose prompt the evaluation read)
+ENTRIES = [
+    ("inv-a", "camp-1", ("risk_analyst", "executive_decider")),
+    ("inv-a", "camp-2", ("risk_analyst",)),
+    ("inv-b", "camp-1", ("risk_analyst",)),
+    ("inv-b", "camp-2", ("risk_analyst", "executive_decider")),
+]
+KEYS = [evaluation_key(i, c, "all") for i, c, _ in ENTRIES]
+
+
+@pytest.fixture(autouse=True)
+def entries():
+    for key, (_, _, roles) in zip(KEYS, ENTRIES):
+        cache.set(key, {"kpis": [], "prompt_versions": {role: "v1" for role in roles}})
+    yield
+    for key in KEYS:
+        cache.pop(key)
+
+
+def remaining():
+    return [key in dict(cache.items()) for key in KEYS]
+
+
+@pytest.mark.parametrize("filters, kept", [
+    ({"influencer_id": "inv-a"}, [False, False, True, True]),
+    ({"campaign_id": "camp-1"}, [False, True, False, True]),
+    ({"influencer_id": "inv-b", "campaign_id": "camp-2"}, [True, True, True, False]),
+    ({"role": "executive_decider"}, [False, True, True, False]),
+    ({"influencer_id": "inv-c"}, [True, True, True, True]),
+])
+def test_only_matching_entries_are_evicted(filters, kept):
+    response = client.post("/evaluate/cache/invalidate", json=filters)
+    assert response.status_code == 200
+    assert response.json()["evicted"] == kept.count(False)
+    assert remaining() == kept
+
+
+@pytest.mark.parametrize("filters", [{}, {"role": "nobody"}])
+def test_unscoped_or_unknown_filters_are_rejected(filters):
+    assert client.post("/evaluate/cache/invalidate", json=filters).status_code == 400
+    assert remaining() == [True] * 4
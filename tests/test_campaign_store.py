@@ -0,0 +1,29 @@
+from backend.services.campaign_store import CampaignStore, DEFAULT_CAMPAIGN_ID
+
+BRIEF = {"brand_name": "Acme", "category": "Tech", "budget": 9000, "goal": "Conversion",
+         "platform_preference": ["TikTok"]}
+
+
+def test_campaigns_survive_a_restart(tmp_path):
+    path = str(tmp_path / "campaigns.json")
+    store = CampaignStore(path)
+    created = store.create(BRIEF)
+    replicated = {**BRIEF, "category": "Beauty", "id": "from-another-node"}
+    store.add(replicated)
+    store.add({**replicated, "brand_name": "Changed"})  # known id: ignored
+
+    reloaded = CampaignStore(path)
+    assert reloaded.get(created["id"]) == created
+    assert reloaded.get("from-another-node") == replicated
+    assert reloaded.get(DEFAULT_CAMPAIGN_ID) == store.get(DEFAULT_CAMPAIGN_ID)
+    # Listing order and the category index are rebuilt too
+    assert [c["id"] for c in reloaded.list()] == [c["id"] for c in store.list()]
+    assert [c["id"] for c in reloaded.list(category="Tech")] == [created["id"]]
+    assert reloaded.count() == store.count() == 3
+    assert not (tmp_path / "campaigns.json.tmp").exists()
+
+
+def test_default_campaign_is_deterministic_without_persistence():
+    a, b = CampaignStore(None), CampaignStore(None)
+    assert a.get(DEFAULT_CAMPAIGN_ID) == b.get(DEFAULT_CAMPAIGN_ID)
+    assert a.create(BRIEF)["id"] not in (c["id"] for c in b.list())
@@ -0,0 +1,49 @@
+from backend.services.chat_sessions import ChatSessionStore, SUMMARY_MAX_TOKENS, estimate_tokens
+
+
+def test_least_recently_used_session_is_evicted():
+    store = ChatSessionStore(max_sessions=2)
+    a = store.get_or_create(None, "inf-a")
+    b = store.get_or_create(None, "inf-b")
+    assert store.get_or_create(a.session_id, "inf-a") is a  # a is now the most recently used
+
+    store.get_or_create(None, "inf-c")
+    assert store.stats()["active_sessions"] == 2
+    assert store.get_or_create(a.session_id, "inf-a") is a
+    assert store.get_or_create(b.session_id, "inf-b") is not b
+
+
+def test_idle_sessions_expire():
+    store = ChatSessionStore(idle_timeout_s=60)
+    idle = store.get_or_create(None, "inf-a")
+    live = store.get_or_create(None, "inf-b")
+    idle.last_active -= 61
+
+    store.get_or_create(None, "inf-c")
+    assert store.stats()["active_sessions"] == 2
+    assert store.get_or_create(live.session_id, "inf-b") is live
+    # An expired id starts a fresh conversation under the same id
+    fresh = store.get_or_create(idle.session_id, "inf-a")
+    assert fresh is not idle and fresh.session_id == idle.session_id and fresh.turns == []
+
+
+def test_session_id_of_another_influencer_is_not_reused():
+    store = ChatSessionStore()
+    session = store.get_or_create(None, "inf-a")
+    assert store.get_or_create(session.session_id, "inf-b").influencer_id == "inf-b"
+
+
+def test_history_is_compacted_to_the_token_budget():
+    store = ChatSessionStore(history_token_budget=50)
+    session = store.get_or_create(None, "inf-a")
+    for i in range(20):
+        session.add_turn("user", f"question {i} " + "x" * 60)
+        session.add_turn("assistant", '{"title": "Risk", "verdict": "Low"}')
+
+    context = store.build_turn_context(session, "what about risk?")
+    assert session.history_tokens() <= 50
+    assert sum(estimate_tokens(t["content"]) for t in context["history"]) <= 50
+    # The newest turns stay verbatim; older ones survive only in the capped summary
+    assert context["history"][-1]["content"] == '{"title": "Risk", "verdict": "Low"}'
+    assert "Assistant answered Risk (Low)" in context["history_summary"]
+    assert estimate_tokens(context["history_summary"]) <= SUMMARY_MAX_TOKENS
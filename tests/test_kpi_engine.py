@@ -0,0 +1,30 @@
+import pytest
+
+from ai_engine.kpi_engine import KPIEngine, INFLUENCER_FEATURES, NUMPY_AVAILABLE, VECTORIZE_MIN_BATCH
+from backend.services.data_generator import DataGenerator
+from backend.services.timeseries import history_store
+
+generator = DataGenerator()
+
+
+def test_history_features_read_the_history_summary():
+    profile = generator.generate_influencer("kpi-history")
+    summary = history_store.summary(profile)
+    with_history = {**profile, "history": summary}
+
+    assert INFLUENCER_FEATURES["sponsored_post_ratio_30d"](with_history) == summary["sponsored_ratio_30d"]
+    assert INFLUENCER_FEATURES["sentiment_volatility"](with_history) != INFLUENCER_FEATURES["sentiment_volatility"](profile)
+    # Without a history the profile proxies are used
+    assert INFLUENCER_FEATURES["sponsored_post_ratio_30d"](profile) == \
+        profile["detailed_metrics"]["brand_readiness"]["brand_collaboration_ratio"]
+
+
+@pytest.mark.skipif(not NUMPY_AVAILABLE, reason="numpy not installed")
+def test_vectorized_pass_matches_row_by_row():
+    profiles = [generator.generate_influencer(f"kpi-{i}") for i in range(VECTORIZE_MIN_BATCH)]
+    profiles = [{**p, "history": history_store.summary(p)} for p in profiles]
+    campaign = generator.generate_campaign_brief()
+
+    vectorized = KPIEngine(vectorized=True).compute(profiles, campaign, explain=False)
+    scalar = KPIEngine(vectorized=False).compute(profiles, campaign, explain=False)
+    assert vectorized == scalar
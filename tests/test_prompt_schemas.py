@@ -0,0 +1,34 @@
+import json
+import os
+import re
+
+import pytest
+
+from ai_engine.orchestrator import PROMPT_DIR
+from ai_engine.output_validation import output_validator
+
+ROLES = sorted(f[:-4] for f in os.listdir(PROMPT_DIR) if f.endswith(".txt"))
+
+# Placeholders of the OUTPUT SCHEMA blocks -> sample JSON values
+PLACEHOLDERS = [
+    (re.compile(r"^\s*\.\.\. \(.*\)\s*$", re.M), ""),   # "... (for all assigned KPIs)"
+    (re.compile(r"<integer>|<number>"), "1"),
+    (re.compile(r"<0-100>"), "50"),
+    (re.compile(r"<0\.0-1\.0>"), "0.5"),
+    (re.compile(r'"([A-Z-]+)"( \| "[A-Z-]+")+'), r'"\1"'),  # "GO" | "NO-GO" | "TEST" -> "GO"
+    (re.compile(r",(\s*[\]}])"), r"\1"),                 # trailing commas left by the removals
+]
+
+
+def schema_sample(role: str):
+    with open(os.path.join(PROMPT_DIR, f"{role}.txt")) as f:
+        text = f.read()
+    block = text.split("OUTPUT SCHEMA:", 1)[1].split("CONTEXT_FIELDS:", 1)[0]
+    for pattern, replacement in PLACEHOLDERS:
+        block = pattern.sub(replacement, block)
+    return json.loads(block)
+
+
+@pytest.mark.parametrize("role", ROLES)
+def test_schema_conformant_reply_validates(role):
+    assert output_validator.errors(role, schema_sample(role)) == []
@@ -0,0 +1,69 @@
+import time
+
+import pytest
+
+from ai_engine.llm_client import OPENAI_AVAILABLE
+from ai_engine.orchestrator import orchestrator
+from backend.services.data_generator import DataGenerator
+from benchmarks.fake_llm_server import FaultConfig, start_server
+
+pytestmark = pytest.mark.skipif(not OPENAI_AVAILABLE, reason="openai not installed")
+
+COOLDOWN_S = 0.2
+PROMPT = orchestrator.prompts["risk_analyst"]
+
+
+@pytest.fixture
+def outage():
+    """A stand-in provider failing every call, and a client whose breaker trips after 3 failures."""
+    from ai_engine.llm_client import RealLLMClient
+
+    config = FaultConfig(base_ms=5, jitter_ms=0, error_rate=1.0)
+    server = start_server(config)
+    client = RealLLMClient("test-key")
+    client.client = client.client.with_options(base_url=f"http://127.0.0.1:{server.server_port}/v1")
+    client.resilience.hedge_min_delay_s = 1e9  # one attempt per call: failures are counted exactly
+    client.resilience.breaker.failure_threshold = 3
+    client.resilience.breaker.cooldown_s = COOLDOWN_S
+    yield config, client
+    server.shutdown()
+
+
+def evaluate(client):
+    profile = DataGenerator().generate_influencer("breaker")
+    return client.generate(PROMPT, {"influencer": {"id": profile["id"]}, "content_type": "all",
+                                    "detailed_metrics": profile["detailed_metrics"]})
+
+
+def test_breaker_trips_and_short_circuits(outage):
+    _, client = outage
+    results = [evaluate(client) for _ in range(5)]
+
+    stats = client.resilience.get_stats()
+    assert all(r.get("degraded") for r in results)  # declared mock output, never an exception
+    assert stats["breaker_state"] == "open" and stats["breaker_trips"] == 1
+    assert stats["errors"] == 3 and stats["short_circuited"] == 2
+
+
+def test_recovery_probe_closes_the_breaker(outage):
+    config, client = outage
+    for _ in range(3):
+        evaluate(client)
+    config.error_rate = 0.0  # the provider recovers
+
+    assert evaluate(client).get("degraded")  # still cooling down: short-circuited
+    time.sleep(COOLDOWN_S)
+    assert not evaluate(client).get("degraded")  # the probe goes through
+    assert client.resilience.breaker.state == "closed"
+
+
+def test_failed_probe_reopens_the_breaker(outage):
+    _, client = outage
+    for _ in range(3):
+        evaluate(client)
+    time.sleep(COOLDOWN_S)
+
+    assert evaluate(client).get("degraded")
+    breaker = client.resilience.breaker
+    assert breaker.state == "open" and breaker.trips == 2
+    assert client.resilience.get_stats()["errors"] == 4
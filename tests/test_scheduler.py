@@ -0,0 +1,61 @@
+import asyncio
+import threading
+
+import pytest
+
+from backend.services.scheduler import EvaluationScheduler, SchedulerSaturated
+
+
+def make_scheduler():
+    # name: (weight, max_concurrency, max_queue)
+    return EvaluationScheduler({"interactive": (8.0, 1, 2), "bulk": (1.0, 1, 2)})
+
+
+def test_full_queue_is_shed_with_retry_after():
+    async def scenario():
+        scheduler = make_scheduler()
+        gate = threading.Event()
+        running = asyncio.ensure_future(scheduler.submit("bulk", gate.wait))
+        await asyncio.sleep(0)  # dispatched: the queue is empty again, one job in flight
+        queued = [asyncio.ensure_future(scheduler.submit("bulk", lambda: "done")) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        with pytest.raises(SchedulerSaturated) as saturated:
+            await scheduler.submit("bulk", lambda: "shed")
+        assert saturated.value.priority == "bulk" and saturated.value.retry_after >= 1
+        # Another class has its own queue
+        interactive = asyncio.ensure_future(scheduler.submit("interactive", lambda: "ok"))
+
+        gate.set()
+        assert await asyncio.gather(running, *queued, interactive) == [True, "done", "done", "ok"]
+        stats = scheduler.stats()
+        assert stats["bulk"]["rejected"] == 1 and stats["bulk"]["completed"] == 3
+        assert stats["interactive"]["rejected"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_admit_rejects_a_batch_that_does_not_fit():
+    scheduler = make_scheduler()
+    scheduler.admit("bulk", 2)
+    with pytest.raises(SchedulerSaturated):
+        scheduler.admit("bulk", 3)
+    assert scheduler.stats()["bulk"]["rejected"] == 1
+    with pytest.raises(ValueError):
+        scheduler.admit("realtime", 1)
+
+
+def test_busy_bulk_class_does_not_hold_up_interactive_jobs():
+    async def scenario():
+        scheduler = make_scheduler()
+        gate = threading.Event()
+        bulk = [asyncio.ensure_future(scheduler.submit("bulk", gate.wait)) for _ in range(3)]
+        await asyncio.sleep(0)
+
+        # Served while every bulk slot is taken and its queue is full
+        assert await asyncio.wait_for(scheduler.submit("interactive", lambda: "ok"), timeout=5) == "ok"
+        assert not any(job.done() for job in bulk)
+        gate.set()
+        await asyncio.gather(*bulk)
+
+    asyncio.run(scenario())
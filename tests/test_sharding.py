@@ -0,0 +1,42 @@
+from collections import Counter
+
+import pytest
+
+from backend.services.sharding import HashRing
+
+KEYS = [f"influencer-{i}" for i in range(20_000)]
+NODES = [f"http://node-{i}:8000" for i in range(4)]
+
+
+def owners(ring: HashRing):
+    return {key: ring.node_for(key) for key in KEYS}
+
+
+def moved(before, after) -> float:
+    return sum(before[k] != after[k] for k in KEYS) / len(KEYS)
+
+
+def test_join_moves_about_one_nth_of_the_keys_all_to_the_new_node():
+    before = owners(HashRing(NODES))
+    after = owners(HashRing(NODES + ["http://node-new:8000"]))
+
+    assert moved(before, after) == pytest.approx(1 / 5, abs=0.05)
+    assert {after[k] for k in KEYS if before[k] != after[k]} == {"http://node-new:8000"}
+
+
+def test_leave_moves_only_the_leaving_nodes_keys():
+    before = owners(HashRing(NODES))
+    after = owners(HashRing(NODES[1:]))
+
+    assert moved(before, after) == pytest.approx(1 / 4, abs=0.05)
+    assert {before[k] for k in KEYS if before[k] != after[k]} == {NODES[0]}
+
+
+def test_shares_are_balanced_and_placement_is_stable():
+    ring = HashRing(NODES)
+    shares = Counter(owners(ring).values())
+    assert set(shares) == set(NODES)
+    assert max(shares.values()) / min(shares.values()) < 1.35
+    # Same membership in another order (another node's configuration): same owners
+    assert owners(HashRing(reversed(NODES))) == owners(ring)
+    assert HashRing().node_for("anything") is None
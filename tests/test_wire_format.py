@@ -0,0 +1,36 @@
+import pytest
+
+from backend.services import wire_format
+from backend.services.wire_format import negotiate_media_type, negotiate_encoding, MSGPACK_MEDIA_TYPE, CBOR_MEDIA_TYPE
+
+JSON = "application/json"
+
+
+@pytest.mark.parametrize("accept, expected", [
+    ("", JSON),
+    ("*/*", JSON),
+    ("text/html", JSON),
+    ("application/x-msgpack;q=0, application/json", JSON),
+    ("application/x-msgpack;q=0.4, */*", JSON),
+    ("application/json;q=0.5, application/x-msgpack;q=0.4", JSON),
+    ("application/x-msgpack", MSGPACK_MEDIA_TYPE),
+    ("application/msgpack, application/json;q=0.9", MSGPACK_MEDIA_TYPE),
+    ("application/cbor, application/x-msgpack;q=0.8", CBOR_MEDIA_TYPE),
+])
+def test_negotiate_media_type(accept, expected):
+    if expected == MSGPACK_MEDIA_TYPE and not wire_format.MSGPACK_AVAILABLE:
+        pytest.skip("msgpack not installed")
+    if expected == CBOR_MEDIA_TYPE and not wire_format.CBOR_AVAILABLE:
+        pytest.skip("cbor2 not installed")
+    assert negotiate_media_type(accept) == expected
+
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    ("", ""),
+    ("gzip;q=0, identity", ""),
+    ("gzip", "gzip"),
+    ("x-gzip", "gzip"),
+    ("*;q=0.5, br;q=0", "gzip"),
+])
+def test_negotiate_encoding(accept_encoding, expected):
+    assert negotiate_encoding(accept_encoding) == expected